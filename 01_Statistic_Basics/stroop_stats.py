@@ -0,0 +1,380 @@
+# -- coding: utf-8 --
+#Stroop实验（stroopdata.csv）的配对样本统计，代替PDF中的手工计算。
+#
+#逐行读取CSV，只取有列名的列（忽略末尾的空列），遇到第一个空行就结束（下方是手工计算的统计结果）；
+#一次遍历用Welford算法累计样本数、均值和离差平方和，由它们得到均值、标准差、配对t检验、p值、置信区间、
+#Cohen's d和r²，不把文件读入内存，也可以分块计算后合并。
+#bootstrap置信区间和符号翻转置换检验按批生成重抽样（每批一个矩阵），每批只用一次矩阵运算，
+#10万次重抽样只需要几十毫秒。
+#
+#差值的方向与stroopdata.csv中的Di列相同：Di = Congruent - Incongruent。
+#有scipy时用scipy.stats.t计算p值和临界值，否则用不完全Beta函数的连分式计算。
+#
+#用法：
+#   python stroop_stats.py [CSV文件 ...]                 #默认为stroopdata.csv
+#   stats = read_stats('stroopdata.csv'); stats.t(), stats.p_value(), stats.confidence_interval(0.95)
+#   stats = PairedStats().update_many(zip(congruent, incongruent))
+#   low, high = bootstrap_interval(differences, n_resamples=100000)
+#   p = permutation_test(differences, n_resamples=100000)
+import csv
+import io
+import math
+import os
+import sys
+
+import numpy as np
+
+try:
+    from scipy import stats as scipy_stats
+except ImportError:
+    scipy_stats = None
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'stroopdata.csv')
+X_COLUMN = 'Congruent'
+Y_COLUMN = 'Incongruent'
+ENCODING = 'gbk'
+N_RESAMPLES = 100000
+#每批重抽样的个数，批越大越快，内存占用为batch_size × 样本数
+BATCH_SIZE = 10000
+#不完全Beta函数连分式的最大迭代次数和精度
+MAX_ITERATIONS = 300
+EPSILON = 1e-15
+
+TOO_FEW_SAMPLES_MSG = 'At least 2 pairs are required'
+ZERO_VARIANCE_MSG = 'The differences have zero variance'
+UNKNOWN_COLUMN_MSG = 'Unknown column: {}'
+INVALID_CONFIDENCE_MSG = 'confidence must be in (0, 1): {}'
+
+
+class PairedStats(object):
+
+    def __init__(self):
+        #样本数
+        self.n = 0
+        #x、y、差值d = x - y的均值
+        self.mean_x = 0.0
+        self.mean_y = 0.0
+        self.mean_d = 0.0
+        #Σ(x-mean_x)²、Σ(y-mean_y)²、Σ(d-mean_d)²
+        self.m2_x = 0.0
+        self.m2_y = 0.0
+        self.m2_d = 0.0
+
+    #功能：加入一对样本
+    def update(self, x, y):
+        x = float(x)
+        y = float(y)
+        d = x - y
+        self.n += 1
+        #离差平方和的增量为(更新前的离差) × (更新后的离差)
+        delta = x - self.mean_x
+        self.mean_x += delta / self.n
+        self.m2_x += delta * (x - self.mean_x)
+        delta = y - self.mean_y
+        self.mean_y += delta / self.n
+        self.m2_y += delta * (y - self.mean_y)
+        delta = d - self.mean_d
+        self.mean_d += delta / self.n
+        self.m2_d += delta * (d - self.mean_d)
+        return self
+
+    #功能：加入(x, y)可迭代对象中的所有样本（可以是生成器，只遍历一次）
+    def update_many(self, pairs):
+        for x, y in pairs:
+            self.update(x, y)
+        return self
+
+    #功能：合并另一份统计量（如另一个数据块），合并后相当于统计了两份数据
+    def merge(self, other):
+        if other.n == 0:
+            return self
+        n = self.n + other.n
+        weight = float(self.n) * other.n / n
+        for name in ('x', 'y', 'd'):
+            mean = getattr(self, 'mean_' + name)
+            delta = getattr(other, 'mean_' + name) - mean
+            setattr(self, 'm2_' + name, getattr(self, 'm2_' + name) + getattr(other, 'm2_' + name) +
+                    delta * delta * weight)
+            setattr(self, 'mean_' + name, mean + delta * other.n / n)
+        self.n = n
+        return self
+
+    #功能：样本标准差（分母为n-1）
+    #参数：
+    #   [in]name 'x'、'y'或'd'
+    def std(self, name='d'):
+        self._check()
+        return math.sqrt(getattr(self, 'm2_' + name) / (self.n - 1))
+
+    #功能：差值均值的标准误差
+    def standard_error(self):
+        return self.std('d') / math.sqrt(self.n)
+
+    #功能：自由度
+    def df(self):
+        return self.n - 1
+
+    #功能：配对t检验的t值（原假设为差值的均值等于0）
+    def t(self):
+        self._check()
+        if self.m2_d == 0:
+            raise ValueError(ZERO_VARIANCE_MSG)
+        return self.mean_d / self.standard_error()
+
+    #功能：t检验的p值
+    #参数：
+    #   [in]alternative 'two-sided'、'less'（差值均值小于0）或'greater'
+    def p_value(self, alternative='two-sided'):
+        t = self.t()
+        if alternative == 'less':
+            return t_sf(-t, self.df())
+        if alternative == 'greater':
+            return t_sf(t, self.df())
+        return min(1.0, 2 * t_sf(abs(t), self.df()))
+
+    #功能：t分布的临界值 × 标准误差，即置信区间的半宽（PDF中的“误差界限”）
+    def margin_of_error(self, confidence=0.95):
+        _check_confidence(confidence)
+        return t_ppf(0.5 + confidence / 2, self.df()) * self.standard_error()
+
+    #功能：差值均值的置信区间
+    #返回值：
+    #   (下限, 上限)
+    def confidence_interval(self, confidence=0.95):
+        margin = self.margin_of_error(confidence)
+        return self.mean_d - margin, self.mean_d + margin
+
+    #功能：效应量Cohen's d，差值均值 / 差值的标准差
+    def cohens_d(self):
+        return self.mean_d / self.std('d')
+
+    #功能：效应量r² = t² / (t² + df)
+    def r_squared(self):
+        t = self.t()
+        return t * t / (t * t + self.df())
+
+    #功能：所有统计量
+    #返回值：
+    #   dict，键为统计量的名字
+    def summary(self, confidence=0.95):
+        low, high = self.confidence_interval(confidence)
+        return {'n': self.n, 'mean_x': self.mean_x, 'mean_y': self.mean_y, 'mean_d': self.mean_d,
+                'std_x': self.std('x'), 'std_y': self.std('y'), 'std_d': self.std('d'),
+                'standard_error': self.standard_error(), 'df': self.df(), 't': self.t(),
+                'p_value': self.p_value(), 'margin_of_error': self.margin_of_error(confidence),
+                'ci_low': low, 'ci_high': high, 'cohens_d': self.cohens_d(), 'r_squared': self.r_squared()}
+
+    def _check(self):
+        if self.n < 2:
+            raise ValueError(TOO_FEW_SAMPLES_MSG)
+
+
+#功能：逐行读取CSV中的两列，只取有列名的列，遇到第一个空行（或所有列名对应的字段都为空的行）结束
+#参数：
+#   [in]path CSV文件路径，第一行为列名
+#   [in]x_column, y_column 列名
+#   [in]encoding 文件编码
+#返回值：
+#   产生(x, y)浮点数的生成器
+def read_pairs(path=DATA_PATH, x_column=X_COLUMN, y_column=Y_COLUMN, encoding=ENCODING):
+    rows = _read_rows(path, encoding)
+    header = next(rows, [])
+    #没有列名的列（末尾的空列）不参与任何计算
+    named = dict((name, i) for i, name in enumerate(header) if name)
+    for name in (x_column, y_column):
+        if name not in named:
+            raise ValueError(UNKNOWN_COLUMN_MSG.format(name))
+    x_index = named[x_column]
+    y_index = named[y_column]
+    for row in rows:
+        if not any(row[i] for i in named.values() if i < len(row)):
+            break
+        yield float(row[x_index]), float(row[y_index])
+
+
+#功能：一次遍历CSV得到PairedStats
+def read_stats(path=DATA_PATH, x_column=X_COLUMN, y_column=Y_COLUMN, encoding=ENCODING):
+    return PairedStats().update_many(read_pairs(path, x_column, y_column, encoding))
+
+
+#功能：读取CSV中的差值x - y
+#返回值：
+#   float64数组
+def read_differences(path=DATA_PATH, x_column=X_COLUMN, y_column=Y_COLUMN, encoding=ENCODING):
+    return np.array([x - y for x, y in read_pairs(path, x_column, y_column, encoding)], dtype=np.float64)
+
+
+#功能：差值均值的bootstrap百分位置信区间
+#参数：
+#   [in]differences 差值数组
+#   [in]n_resamples 重抽样次数
+#   [in]confidence 置信水平
+#   [in]random_state 随机种子，相同的种子和batch_size得到相同的结果
+#   [in]batch_size 每批的重抽样次数
+#返回值：
+#   (下限, 上限)
+def bootstrap_interval(differences, n_resamples=N_RESAMPLES, confidence=0.95, random_state=0,
+                       batch_size=BATCH_SIZE):
+    _check_confidence(confidence)
+    means = bootstrap_means(differences, n_resamples, random_state, batch_size)
+    alpha = (1 - confidence) / 2
+    low, high = np.percentile(means, [100 * alpha, 100 * (1 - alpha)])
+    return float(low), float(high)
+
+
+#功能：n_resamples次有放回重抽样的均值
+#返回值：
+#   长度为n_resamples的float64数组
+def bootstrap_means(differences, n_resamples=N_RESAMPLES, random_state=0, batch_size=BATCH_SIZE):
+    differences = _as_sample(differences)
+    n = len(differences)
+    rng = np.random.RandomState(random_state)
+    means = np.empty(n_resamples, dtype=np.float64)
+    for start in range(0, n_resamples, batch_size):
+        stop = min(start + batch_size, n_resamples)
+        #每行为一次重抽样的下标
+        indices = rng.randint(0, n, size=(stop - start, n))
+        means[start:stop] = differences[indices].mean(axis=1)
+    return means
+
+
+#功能：配对数据的符号翻转置换检验（原假设下每对的差值正负号等可能），统计量为差值均值
+#参数：
+#   [in]differences 差值数组
+#   [in]n_resamples 随机翻转的次数
+#   [in]alternative 'two-sided'、'less'或'greater'，同PairedStats.p_value
+#   [in]random_state, batch_size 同bootstrap_means
+#返回值：
+#   p值，(不小于观测值的次数 + 1) / (n_resamples + 1)
+def permutation_test(differences, n_resamples=N_RESAMPLES, alternative='two-sided', random_state=0,
+                     batch_size=BATCH_SIZE):
+    differences = _as_sample(differences)
+    n = len(differences)
+    total = differences.sum()
+    rng = np.random.RandomState(random_state)
+    #与观测值比较时留一点余量，避免与观测值相同的翻转因舍入误差而不被计入
+    tolerance = 1e-9 * np.abs(differences).sum()
+    extreme = 0
+    for start in range(0, n_resamples, batch_size):
+        stop = min(start + batch_size, n_resamples)
+        #翻转的差值之和为total - 2 × Σ被翻转的差值，每批只需要一次矩阵乘法
+        flips = rng.random_sample((stop - start, n)) < 0.5
+        sums = total - 2 * np.dot(flips, differences)
+        if alternative == 'less':
+            extreme += np.count_nonzero(sums <= total + tolerance)
+        elif alternative == 'greater':
+            extreme += np.count_nonzero(sums >= total - tolerance)
+        else:
+            extreme += np.count_nonzero(np.abs(sums) >= abs(total) - tolerance)
+    return (extreme + 1.0) / (n_resamples + 1)
+
+
+#功能：t分布的右尾概率P(T > t)
+def t_sf(t, df):
+    if scipy_stats is not None:
+        return float(scipy_stats.t.sf(t, df))
+    #P(|T| > |t|) = I_x(df/2, 1/2)，x = df / (df + t²)
+    #df、t可能是整数，Python 2中需要先转换为浮点数
+    tail = 0.5 * betainc(0.5 * df, 0.5, float(df) / (df + t * t))
+    return tail if t >= 0 else 1 - tail
+
+
+#功能：t分布的分位数，P(T <= t) = q
+def t_ppf(q, df):
+    if scipy_stats is not None:
+        return float(scipy_stats.t.ppf(q, df))
+    if q == 0.5:
+        return 0.0
+    if q < 0.5:
+        return -t_ppf(1 - q, df)
+    #右尾概率随t单调递减，先找到上界再二分
+    low, high = 0.0, 1.0
+    while t_sf(high, df) > 1 - q:
+        low, high = high, high * 2
+    for _ in range(200):
+        middle = (low + high) / 2
+        if t_sf(middle, df) > 1 - q:
+            low = middle
+        else:
+            high = middle
+        if high - low <= EPSILON * high:
+            break
+    return (low + high) / 2
+
+
+#功能：正则化不完全Beta函数I_x(a, b)（Numerical Recipes的Lentz连分式）
+def betainc(a, b, x):
+    a, b, x = float(a), float(b), float(x)
+    if x <= 0:
+        return 0.0
+    if x >= 1:
+        return 1.0
+    front = math.exp(math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) +
+                     a * math.log(x) + b * math.log(1 - x))
+    #连分式在x < (a+1)/(a+b+2)时收敛快，否则用I_x(a, b) = 1 - I_(1-x)(b, a)
+    if x < (a + 1) / (a + b + 2):
+        return front * _beta_fraction(a, b, x) / a
+    return 1 - front * _beta_fraction(b, a, 1 - x) / b
+
+
+def _beta_fraction(a, b, x):
+    tiny = 1e-300
+    c = 1.0
+    d = 1 - (a + b) * x / (a + 1)
+    d = 1 / (d if abs(d) > tiny else tiny)
+    result = d
+    for m in range(1, MAX_ITERATIONS + 1):
+        for numerator in (m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)),
+                          -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1))):
+            d = 1 + numerator * d
+            d = 1 / (d if abs(d) > tiny else tiny)
+            c = 1 + numerator / c
+            c = c if abs(c) > tiny else tiny
+            result *= c * d
+        if abs(c * d - 1) < EPSILON:
+            break
+    return result
+
+
+def _as_sample(differences):
+    differences = np.asarray(differences, dtype=np.float64)
+    if len(differences) < 2:
+        raise ValueError(TOO_FEW_SAMPLES_MSG)
+    return differences
+
+
+def _check_confidence(confidence):
+    if not 0 < confidence < 1:
+        raise ValueError(INVALID_CONFIDENCE_MSG.format(confidence))
+
+
+#逐行产生字段的列表；Python 2的csv模块只能读取字节，列名和数值都是ASCII，不需要解码
+def _read_rows(path, encoding):
+    if sys.version_info[0] >= 3:
+        with io.open(path, newline='', encoding=encoding) as f:
+            for row in csv.reader(f):
+                yield row
+    else:
+        with open(path, 'rb') as f:
+            for row in csv.reader(f):
+                yield row
+
+
+def main(paths):
+    print('{:<24}{:>4}{:>11}{:>9}{:>9}{:>11}{:>22}{:>22}{:>12}'.format(
+        'file', 'n', 'mean Di', 'sd Di', 't', 'p', '95% CI (t)', '95% CI (bootstrap)', 'perm p'))
+    for path in paths:
+        #只读一次文件
+        pairs = list(read_pairs(path))
+        stats = PairedStats().update_many(pairs)
+        differences = np.array([x - y for x, y in pairs], dtype=np.float64)
+        low, high = stats.confidence_interval()
+        boot_low, boot_high = bootstrap_interval(differences)
+        print('{:<24}{:>4}{:>11.4f}{:>9.4f}{:>9.4f}{:>11.3g}{:>22}{:>22}{:>12.3g}'.format(
+            os.path.basename(path), stats.n, stats.mean_d, stats.std(), stats.t(), stats.p_value(),
+            '({:.3f}, {:.3f})'.format(low, high), '({:.3f}, {:.3f})'.format(boot_low, boot_high),
+            permutation_test(differences)))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:] or [DATA_PATH])
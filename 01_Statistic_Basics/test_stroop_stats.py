@@ -0,0 +1,117 @@
+# -- coding: utf-8 --
+#stroop_stats的检查：与PDF中的手工计算、scipy.stats和numpy的结果比较
+#用法：python -m pytest test_stroop_stats.py 或 python test_stroop_stats.py
+import unittest
+
+import numpy as np
+
+import stroop_stats
+from stroop_stats import (PairedStats, betainc, bootstrap_means, permutation_test, read_differences, read_pairs,
+                          read_stats, t_ppf, t_sf)
+
+try:
+    from scipy import special, stats
+except ImportError:
+    stats = None
+
+
+class PairedStatsTestCase(unittest.TestCase):
+
+    def test_stroop_matches_pdf(self):
+        summary = read_stats().summary()
+        self.assertEqual(summary['n'], 24)
+        self.assertAlmostEqual(summary['mean_x'], 14.051125, places=6)
+        self.assertAlmostEqual(summary['mean_y'], 22.01591667, places=6)
+        self.assertAlmostEqual(summary['mean_d'], -7.964791667, places=6)
+        self.assertAlmostEqual(summary['std_d'], 4.86482691, places=6)
+        self.assertAlmostEqual(summary['standard_error'], 0.993028635, places=6)
+        self.assertAlmostEqual(summary['t'], -8.020706944, places=6)
+        self.assertAlmostEqual(summary['cohens_d'], -1.637219949, places=6)
+        self.assertAlmostEqual(summary['r_squared'], 0.736636416, places=6)
+        #PDF的误差界限用的是查表得到的临界值2.069，这里是精确值
+        self.assertAlmostEqual(summary['ci_low'], -10.019, places=2)
+        self.assertAlmostEqual(summary['ci_high'], -5.911, places=2)
+
+    def test_matches_numpy(self):
+        rng = np.random.RandomState(0)
+        x = rng.normal(1e6, 3, size=1000)
+        y = x + rng.normal(0.5, 2, size=1000)
+        s = PairedStats().update_many(zip(x, y))
+        self.assertAlmostEqual(s.mean_d, np.mean(x - y), places=9)
+        self.assertAlmostEqual(s.std('x'), np.std(x, ddof=1), places=9)
+        self.assertAlmostEqual(s.std('d'), np.std(x - y, ddof=1), places=9)
+
+    def test_merge(self):
+        pairs = list(read_pairs())
+        whole = PairedStats().update_many(pairs)
+        merged = PairedStats().update_many(pairs[:7]).merge(PairedStats().update_many(pairs[7:]))
+        merged.merge(PairedStats())
+        for name in ('mean_x', 'mean_y', 'mean_d', 'm2_x', 'm2_y', 'm2_d'):
+            self.assertAlmostEqual(getattr(merged, name), getattr(whole, name), places=9)
+        self.assertEqual(merged.n, whole.n)
+
+    def test_too_few_samples(self):
+        self.assertRaises(ValueError, PairedStats().update(1, 2).t)
+        self.assertRaises(ValueError, PairedStats().update(1, 2).update(2, 3).t)
+
+    @unittest.skipIf(stats is None, 'scipy is not installed')
+    def test_matches_scipy(self):
+        x, y = zip(*read_pairs())
+        s = read_stats()
+        result = stats.ttest_rel(x, y)
+        self.assertAlmostEqual(s.t(), result[0], places=9)
+        self.assertAlmostEqual(s.p_value() / result[1], 1, places=9)
+
+
+class TDistributionTestCase(unittest.TestCase):
+
+    def setUp(self):
+        #不使用scipy，检查不完全Beta函数的实现
+        self.scipy_stats = stroop_stats.scipy_stats
+        stroop_stats.scipy_stats = None
+
+    def tearDown(self):
+        stroop_stats.scipy_stats = self.scipy_stats
+
+    def test_known_values(self):
+        #df = 1时为柯西分布，P(T > t) = 1/2 - arctan(t)/π
+        for t in (-3, -1, 0, 1, 3, 40):
+            self.assertAlmostEqual(t_sf(t, 1), 0.5 - np.arctan(t) / np.pi, places=12)
+        self.assertAlmostEqual(t_ppf(0.975, 1), np.tan(0.475 * np.pi), places=9)
+
+    @unittest.skipIf(stats is None, 'scipy is not installed')
+    def test_matches_scipy(self):
+        #整数参数（Python 2中的整数除法）和浮点数参数
+        for df in (1, 2, 5, 23, 100, 2.5):
+            for t in (-40, -3, -1, 0, 0.5, 1, 3, 8.02, 40):
+                expected = stats.t.sf(t, df)
+                self.assertAlmostEqual(t_sf(t, df), expected, delta=1e-12 + 1e-9 * expected)
+            for q in (0.5, 0.6, 0.9, 0.975, 0.995, 0.025):
+                self.assertAlmostEqual(t_ppf(q, df), stats.t.ppf(q, df), places=8)
+        self.assertAlmostEqual(betainc(1, 2, 0.25), special.betainc(1, 2, 0.25), places=12)
+
+
+class ResamplingTestCase(unittest.TestCase):
+
+    def test_bootstrap_means(self):
+        differences = read_differences()
+        means = bootstrap_means(differences, n_resamples=20000, batch_size=3000)
+        self.assertEqual(len(means), 20000)
+        #均值的bootstrap分布：中心为样本均值，标准差接近标准误差
+        self.assertAlmostEqual(means.mean(), differences.mean(), places=1)
+        self.assertAlmostEqual(means.std() / (differences.std() / np.sqrt(len(differences))), 1, places=1)
+        #同样的种子和batch_size得到同样的结果
+        np.testing.assert_array_equal(means, bootstrap_means(differences, 20000, batch_size=3000))
+
+    def test_permutation_test(self):
+        #n = 3时共8种翻转，可以精确计算：只有全部不翻转和全部翻转的|均值|不小于观测值
+        differences = np.array([1.0, 2.0, 4.0])
+        p = permutation_test(differences, n_resamples=80000)
+        self.assertAlmostEqual(p, 2.0 / 8, places=2)
+        self.assertAlmostEqual(permutation_test(differences, 80000, alternative='greater'), 1.0 / 8, places=2)
+        self.assertAlmostEqual(permutation_test(differences, 80000, alternative='less'), 1.0, places=2)
+        self.assertLess(permutation_test(read_differences()), 1e-3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+# -- coding: utf-8 --
+#比较各选主元策略在病态方程组上的精度和耗时
+#用法：python benchmark_pivoting.py
+#精度：解与已知精确解之差的最大绝对值（解不唯一或无解记为失败）
+import os
+import sys
+from fractions import Fraction
+from timeit import default_timer
+
+from vector import Vector, BACKENDS
+from plane import Plane
+from linsys import LinearSystem, PIVOTING_STRATEGIES
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'P_linear_algebra'))
+try:
+    from helper import generateMatrix
+except ImportError:
+    #helper依赖NumPy
+    generateMatrix = None
+
+DIMENSION = 3
+REPEAT = 20
+
+
+#希尔伯特矩阵，典型的病态矩阵
+def hilbert_matrix(n):
+    return [[Fraction(1, i + j + 1) for j in range(n)] for i in range(n)]
+
+
+#第一列的第一个系数很小但不为0，按顺序取主元会除以这个很小的数
+def small_pivot_matrix(n, eps=Fraction(1, 10**9)):
+    A = [[Fraction(1 + (i * j) % 3) for j in range(n)] for i in range(n)]
+    A[0][0] = eps
+    A[1][0] = Fraction(1)
+    return A
+
+
+#各行数量级相差很大
+def badly_scaled_matrix(n):
+    A = [[Fraction((i + 2) ** j) for j in range(n)] for i in range(n)]
+    A[0] = [x * 10**8 for x in A[0]]
+    return A
+
+
+def test_cases():
+    cases = [('hilbert', hilbert_matrix(DIMENSION)),
+             ('small pivot', small_pivot_matrix(DIMENSION)),
+             ('badly scaled', badly_scaled_matrix(DIMENSION))]
+    if generateMatrix is not None:
+        for seed in range(3):
+            A = generateMatrix(DIMENSION, seed, singular=False)
+            cases.append(('generateMatrix seed={}'.format(seed), [[Fraction(int(x)) for x in row] for row in A]))
+    return cases
+
+
+#构造以全1向量为精确解的方程组
+def build_system(A, backend):
+    planes = []
+    for row in A:
+        b = sum(row)
+        planes.append(Plane(normal_vector=Vector([float(x) for x in row], backend=backend),
+                            constant_term=float(b)))
+    return LinearSystem(planes)
+
+
+def solution_error(solution):
+    if isinstance(solution, str) or solution.direction_vectors:
+        return None
+    return max([abs(float(x) - 1.0) for x in solution.basepoint])
+
+
+def main():
+    strategies = sorted(PIVOTING_STRATEGIES)
+    print('{:<26}{:<9}{:<15}{:>12}{:>12}'.format('system', 'backend', 'pivoting', 'max error', 'ms/solve'))
+    for name, A in test_cases():
+        for backend in BACKENDS:
+            for strategy in strategies:
+                system = build_system(A, backend)
+                start = default_timer()
+                for _ in range(REPEAT):
+                    solution = system.compute_solution(pivoting=strategy)
+                elapsed = (default_timer() - start) / REPEAT * 1000
+                error = solution_error(solution)
+                error = 'failed' if error is None else '{:.3e}'.format(error)
+                print('{:<26}{:<9}{:<15}{:>12}{:>12.3f}'.format(name, backend, strategy, error, elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+# -- coding: utf-8 --
+#可选的性能统计：记录方法调用次数和累计耗时，默认关闭。
+#
+#关闭时被登记的方法就是类里的原始函数，没有任何额外开销；
+#enable()才把它们替换成计时包装函数，disable()再换回原始函数。
+#
+#用法：
+#   import instrument
+#   instrument.enable()              #每次调用都计时
+#   instrument.enable(sample_every=100)  #调用次数全部统计，每100次计时一次
+#   s.compute_solution()
+#   print instrument.stats()['Vector.Is_Parallelism']['calls']
+#   instrument.disable()
+from timeit import default_timer
+
+#登记的方法：[(类, 方法名), ...]
+_registered = []
+#启用时保存的原始方法：{(类, 方法名): 原始属性}
+_originals = {}
+#统计结果：{'类名.方法名': [调用次数, 计时次数, 累计耗时]}
+_stats = {}
+#启用时的采样间隔
+_sample_every = 1
+
+
+#功能：登记一个类中需要统计的方法（在定义类的模块里调用）
+#参数：
+#   [in]cls 类
+#   [in]names 方法名
+def register(cls, *names):
+    for name in names:
+        _registered.append((cls, name))
+        if _originals:
+            _patch(cls, name, _sample_every)
+
+
+#功能：开始统计
+#参数：
+#   [in]sample_every 每多少次调用计时一次（调用次数总是精确统计），默认每次都计时
+def enable(sample_every=1):
+    global _sample_every
+    if sample_every < 1:
+        raise ValueError('sample_every must be a positive integer')
+    disable()
+    _sample_every = sample_every
+    for cls, name in _registered:
+        _patch(cls, name, sample_every)
+
+
+#功能：停止统计，恢复原始方法（已有的统计结果保留）
+def disable():
+    for (cls, name), original in _originals.items():
+        setattr(cls, name, original)
+    _originals.clear()
+
+
+#功能：是否正在统计
+def is_enabled():
+    return bool(_originals)
+
+
+#功能：清空统计结果
+def reset():
+    for record in _stats.values():
+        record[:] = [0, 0, 0.0]
+
+
+#功能：读取统计结果
+#返回值：
+#   {'类名.方法名': {'calls': 调用次数, 'sampled': 计时次数,
+#                    'time': 计时调用的累计秒数, 'estimated_time': 按采样比例估计的总秒数}}
+#   累计耗时包含被调用方法内部的其他调用（含递归）
+def stats():
+    result = {}
+    for key, (calls, sampled, elapsed) in _stats.items():
+        estimated = elapsed * calls / sampled if sampled else 0.0
+        result[key] = {'calls': calls, 'sampled': sampled,
+                       'time': elapsed, 'estimated_time': estimated}
+    return result
+
+
+def _patch(cls, name, sample_every):
+    original = cls.__dict__[name]
+    is_static = isinstance(original, staticmethod)
+    func = original.__func__ if is_static else original
+    key = '{}.{}'.format(cls.__name__, name)
+    record = _stats.setdefault(key, [0, 0, 0.0])
+
+    def wrapper(*args, **kwargs):
+        record[0] += 1
+        if record[0] % sample_every:
+            return func(*args, **kwargs)
+        start = default_timer()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            record[1] += 1
+            record[2] += default_timer() - start
+
+    wrapper.__name__ = func.__name__
+    wrapper.__doc__ = func.__doc__
+    _originals[(cls, name)] = original
+    setattr(cls, name, staticmethod(wrapper) if is_static else wrapper)
@@ -1,12 +1,18 @@
 # -- coding: utf-8 --
-from decimal import Decimal, getcontext
-from copy import deepcopy
-
-from vector import Vector
+from decimal import Decimal
+from copy import copy
+from array import array
+from fractions import Fraction
+try:
+    from math import gcd
+except ImportError:
+    #Python 2
+    from fractions import gcd
+
+import instrument
+from vector import Vector, FLOAT_BACKEND, is_near_zero, get_default_backend, with_decimal_precision
 from plane import Plane
 
-getcontext().prec = 30
-
 #参数化输出解集
 class Parametrization(object):
     BASEPT_AND_DIR_VECTORS_MUST_BE_IN_SAME_DIM_MSG = 'The basepoint and direction vectors should all live in the same dimention'
@@ -52,7 +58,8 @@ class Parametrization(object):
         for i in range(self.dimension):
             output += 'x_{} = '.format(i+1)
             if (not MyDecimal(self.basepoint[i]).is_near_zero()) or (first_nonzero_indexs[i] == -1):
-                output += '{} '.format(round(self.basepoint[i], num_decimal_places))
+                #加0把-0.0变成0.0，避免消元顺序不同时输出的符号不同
+                output += '{} '.format(round(self.basepoint[i], num_decimal_places) + 0)
 
             terms = [write_coefficient(direction_vector[i], is_initial_term=(j+1==first_nonzero_indexs[i])) + ' t_{}'.format(j+1)
                     for j, direction_vector in enumerate(self.direction_vectors) if round(direction_vector[i], num_decimal_places) != 0]
@@ -80,36 +87,224 @@ class Parametrization(object):
         return indices
 
 
+#选主元策略：在第i行及以下、候选列columns（升序）中选出主元，返回(行号, 列号)，找不到返回None
+#   FIRST_NONZERO_PIVOTING 按列顺序，取第一个非0系数（原有做法）
+#   PARTIAL_PIVOTING       按列顺序，取该列绝对值最大的系数
+#   SCALED_PIVOTING        按列顺序，取 |系数| / 该行最大|系数| 最大的行
+#   COMPLETE_PIVOTING      在剩余的所有行和列中取绝对值最大的系数（会打乱主元列的顺序）
+#也可以传入同样签名的函数 choose_pivot(system, i, columns) 作为自定义策略
+FIRST_NONZERO_PIVOTING = 'first_nonzero'
+PARTIAL_PIVOTING = 'partial'
+SCALED_PIVOTING = 'scaled'
+COMPLETE_PIVOTING = 'complete'
+
+
+def first_nonzero_pivot(system, i, columns):
+    for j in columns:
+        if not is_near_zero(system.rows[i][j]):
+            return i, j
+        r = system.nonezero_coeff_under_i(i, j)
+        if r:
+            return r, j
+    return None
+
+
+def partial_pivot(system, i, columns):
+    rows = system.rows
+    candidates = range(i, len(rows))
+    for j in columns:
+        r = max(candidates, key=lambda row: abs(rows[row][j]))
+        if not is_near_zero(rows[r][j]):
+            return r, j
+    return None
+
+
+def scaled_pivot(system, i, columns):
+    rows = system.rows
+    n = system.dimension
+    for j in columns:
+        best_row = None
+        best_ratio = 0
+        for r in range(i, len(rows)):
+            c = abs(rows[r][j])
+            if is_near_zero(c):
+                continue
+            ratio = c / max([abs(x) for x in rows[r][:n]])
+            if best_row is None or ratio > best_ratio:
+                best_row, best_ratio = r, ratio
+        if best_row is not None:
+            return best_row, j
+    return None
+
+
+def complete_pivot(system, i, columns):
+    rows = system.rows
+    best = None
+    best_value = 0
+    for r in range(i, len(rows)):
+        row = rows[r]
+        for j in columns:
+            c = abs(row[j])
+            if c > best_value:
+                best, best_value = (r, j), c
+    if best is None or is_near_zero(best_value):
+        return None
+    return best
+
+
+PIVOTING_STRATEGIES = {
+    FIRST_NONZERO_PIVOTING: first_nonzero_pivot,
+    PARTIAL_PIVOTING: partial_pivot,
+    SCALED_PIVOTING: scaled_pivot,
+    COMPLETE_PIVOTING: complete_pivot,
+}
+
+
+#功能：把数值精确地转换为分数
+#float按其最短的十进制表示转换（0.1 -> 1/10），Decimal和整数按原值转换
+def to_fraction(x):
+    if isinstance(x, float):
+        return Fraction(repr(x))
+    return Fraction(x)
+
+
+#功能：无分数的Gauss-Jordan消元（Bareiss），精确计算有理数矩阵的化简行阶梯形
+#先把每一行乘以分母的最小公倍数化为整数，消元全程只做整数运算，
+#每一步除以上一个主元都是整除，中间结果都是原矩阵的子式，系数不会膨胀。
+#判断是否为0是精确的，不需要is_near_zero的阈值。
+#参数：
+#   [in]matrix 二维列表，元素可以是int、Fraction、Decimal或float，不会被修改
+#返回值：
+#   (化简行阶梯形（Fraction的二维列表）, 主元列号列表)
+def fraction_free_rref(matrix):
+    M = []
+    for row in matrix:
+        row = [to_fraction(x) for x in row]
+        d = 1
+        for x in row:
+            d = d * x.denominator // gcd(d, x.denominator)
+        M.append([int(x * d) for x in row])
+
+    m = len(M)
+    n = len(M[0]) if M else 0
+    previous_pivot = 1
+    pivot_columns = []
+    r = 0
+    for j in range(n):
+        if r == m:
+            break
+        candidates = [i for i in range(r, m) if M[i][j] != 0]
+        if not candidates:
+            continue
+        M[r], M[candidates[0]] = M[candidates[0]], M[r]
+
+        pivot_row = M[r]
+        pivot = pivot_row[j]
+        for i in range(m):
+            if i == r:
+                continue
+            row = M[i]
+            c = row[j]
+            for k in range(n):
+                row[k] = (pivot * row[k] - c * pivot_row[k]) // previous_pivot
+        previous_pivot = pivot
+        pivot_columns.append(j)
+        r += 1
+
+    #消元结束后所有主元都等于最后一个主元，整体除以它即为化简行阶梯形
+    rref = [[Fraction(x, previous_pivot) for x in row] for row in M]
+    return rref, pivot_columns
+
+
 class LinearSystem(object):
 
     ALL_PLANES_MUST_BE_IN_SAME_DIM_MSG = 'All planes in the system should live in the same dimension'
     NO_SOLUTIONS_MSG = 'No solutions'
     INF_SOLUTIONS_MSG = 'Infinitely many solutions'
-
-    def __init__(self, planes):
+    UNKNOWN_PIVOTING_MSG = 'Unknown pivoting strategy: {}'
+
+    #内部用稠密矩阵保存方程组：rows[i]为第i个方程的系数加常数项（最后一列），
+    #初等行变换直接修改rows，只有在访问planes或self[i]时才生成Plane对象。
+    #参数：
+    #   [in]planes 平面列表
+    #   [in]pivoting 默认的选主元策略（见PIVOTING_STRATEGIES），各求解方法也可以单独指定
+    def __init__(self, planes, pivoting=FIRST_NONZERO_PIVOTING):
+        self.pivoting = pivoting
         try:
         	#判断每个平面是否是同一维度
             d = planes[0].dimension
             for p in planes:
                 assert p.dimension == d
 
-            self.planes = planes
             self.dimension = d
+            self.backend = planes[0].normal_vector.backend
+            self.rows = [self.row_from_plane(p) for p in planes]
+            #已生成的Plane缓存，None表示该行改动后尚未重新生成
+            self._planes = list(planes)
+            #每一行首个非0系数的列号，由初等行变换增量维护，None表示尚未计算
+            self._first_nonzero = [p.initial_index for p in planes]
 
         except AssertionError:
             raise Exception(self.ALL_PLANES_MUST_BE_IN_SAME_DIM_MSG)
 
-    def compute_solution(self):
+    #功能：把Plane转换为矩阵的一行（系数 + 常数项），数值类型与方程组后端一致
+    def row_from_plane(self, p):
+        n = p.normal_vector.to_backend(self.backend)
+        row = list(n.coordinates)
+        row.append(self.scalar(p.constant_term))
+        if self.backend == FLOAT_BACKEND:
+            return array('d', row)
+        return row
+
+    #功能：由矩阵的第i行生成Plane对象
+    def plane_from_row(self, i):
+        row = self.rows[i]
+        return Plane(normal_vector=Vector(row[:-1], backend=self.backend), constant_term=row[-1])
+
+    #功能：把数值转换为方程组后端的标量类型（Decimal或float）
+    def scalar(self, x):
+        if self.backend == FLOAT_BACKEND:
+            return float(x)
+        if isinstance(x, Fraction):
+            return Decimal(x.numerator) / Decimal(x.denominator)
+        return Decimal(x)
+
+    #功能：按需生成全部Plane对象
+    @property
+    def planes(self):
+        return [self[i] for i in range(len(self))]
+
+    #功能：取得选主元函数
+    #参数：
+    #   [in]pivoting 策略名或函数，None表示使用self.pivoting
+    def pivoting_strategy(self, pivoting=None):
+        if pivoting is None:
+            pivoting = self.pivoting
+        if callable(pivoting):
+            return pivoting
+        try:
+            return PIVOTING_STRATEGIES[pivoting]
+        except KeyError:
+            raise ValueError(self.UNKNOWN_PIVOTING_MSG.format(pivoting))
+
+    #参数：
+    #   [in]pivoting 选主元策略，None表示使用self.pivoting
+    #   [in]exact True 用分数精确消元（见compute_exact_rref），忽略pivoting
+    @with_decimal_precision
+    def compute_solution(self, pivoting=None, exact=False):
         try:
-            return self.do_gaussian_elimination_and_extract_solution()
+            return self.do_gaussian_elimination_and_extract_solution(pivoting, exact)
         except Exception as e:
             if (str(e) == self.NO_SOLUTIONS_MSG):
                 return str(e)
             else:
                 raise e
     
-    def do_gaussian_elimination_and_extract_solution(self):
-        rref = self.compute_rref()
+    def do_gaussian_elimination_and_extract_solution(self, pivoting=None, exact=False):
+        if exact:
+            rref = self.compute_exact_rref()
+        else:
+            rref = self.compute_rref(pivoting=pivoting)
 
         rref.raise_exception_if_contradictory_equation()
         #rref.raise_exception_if_too_few_pivots()
@@ -129,12 +324,12 @@ class LinearSystem(object):
         for free_variable in free_variable_indices:
             vector_coords = [0] * num_varaible
             vector_coords[free_variable] = 1
-            for i,p in enumerate(self.planes):
+            for i,row in enumerate(self.rows):
                 pivot_index = first_nonzero_indexs[i]
                 if pivot_index < 0:
                     break
-                vector_coords[pivot_index] = -p.normal_vector[free_variable]
-            direction_vectors.append(Vector(vector_coords))
+                vector_coords[pivot_index] = -row[free_variable]
+            direction_vectors.append(Vector(vector_coords, backend=self.backend))
         
         return direction_vectors
 
@@ -144,29 +339,24 @@ class LinearSystem(object):
         
         basepoint = [0] * num_varaible
 
-        for i,p in enumerate(self.planes):
+        for i,row in enumerate(self.rows):
             pivot_index = first_nonzero_indexs[i]
             if pivot_index < 0:
                 break
-            basepoint[pivot_index] = p.constant_term
+            basepoint[pivot_index] = row[-1]
 
-        return Vector(basepoint)
+        return Vector(basepoint, backend=self.backend)
 
 
     
     def raise_exception_if_contradictory_equation(self):
-        for p in self.planes:
-            try:
-                p.first_nonzero_index(p.normal_vector)
-            except Exception as e:
-                if str(e) == Plane.NO_NONZERO_ELTS_FOUND_MSG:
-                    if not MyDecimal(p.constant_term).is_near_zero():
-                        raise Exception(self.NO_SOLUTIONS_MSG)
-                    else:
-                        pass 
-                        "0=0"
+        for i,row in enumerate(self.rows):
+            if self.first_nonzero_index_in_row(i) < 0:
+                if not is_near_zero(row[-1]):
+                    raise Exception(self.NO_SOLUTIONS_MSG)
                 else:
-                    raise e
+                    pass 
+                    "0=0"
 
     def raise_exception_if_too_few_pivots(self):
         non_zero_indices = self.indices_of_first_nonzero_terms_in_each_row()
@@ -178,58 +368,105 @@ class LinearSystem(object):
 
 
 
-    def compute_rref(self):
-        tf = self.compute_triangular_form()
+    #功能：化简行阶梯形
+    #参数：
+    #   [in]inplace False（默认）在副本上计算并返回副本，self保持不变；
+    #               True 直接修改self并返回self，不做任何复制
+    #   [in]pivoting 选主元策略，None表示使用self.pivoting
+    @with_decimal_precision
+    def compute_rref(self, inplace=False, pivoting=None):
+        tf = self if inplace else self.copy()
+        pivot_columns = tf.eliminate_below_pivots(pivoting)
         m = len(tf)
-        none_zero_itme_in_each_row = tf.indices_of_first_nonzero_terms_in_each_row()
 
         for i in range(m)[::-1]:
-            none_zero_item = none_zero_itme_in_each_row[i]
+            none_zero_item = pivot_columns[i]
             if none_zero_item < 0:
                 continue
             #首个非0项系数化为1
-            c = tf[i].normal_vector[none_zero_item]
-            tf.multiply_coefficient_and_row(Decimal(1)/c, i)
+            c = tf.rows[i][none_zero_item]
+            tf.multiply_coefficient_and_row(1/c, i)
             #消去上方none_zero_item列的项
             tf.clear_allj_abovei(i, none_zero_item)
 
+        #全主元会打乱主元列的顺序：先按主元列排序各行
+        pivots = [j for j in pivot_columns if j >= 0]
+        if pivots != sorted(pivots):
+            order = sorted(range(len(pivots)), key=lambda row: pivots[row]) + list(range(len(pivots), m))
+            tf.rows = [tf.rows[row] for row in order]
+            tf._planes = [None] * m
+            tf._first_nonzero = [tf._first_nonzero[row] for row in order]
+            pivots.sort()
+        #有自由变量时选出的主元列不一定是最靠左的列，再按列顺序化简一次得到标准的化简行阶梯形
+        if tf.indices_of_first_nonzero_terms_in_each_row()[:len(pivots)] != pivots:
+            tf.compute_rref(inplace=True, pivoting=FIRST_NONZERO_PIVOTING)
+
         return tf
 
-    def clear_allj_abovei(self, i, j):
-        #这里是值拷贝的意思，因为python默认传引用，而这里为了保存原始值。
-        system = deepcopy(self)
+    #功能：用分数精确计算增广矩阵的化简行阶梯形，秩和是否有解的判断都是精确的
+    #返回值：
+    #   新的方程组（self保持不变），系数由分数转换回self.backend；
+    #   无解时其中有一个方程为 0 = 1
+    @with_decimal_precision
+    def compute_exact_rref(self):
+        rows, pivot_columns = fraction_free_rref(self.rows)
+        system = self.copy()
+        system.rows = []
+        for row in rows:
+            row = [self.scalar(x) for x in row]
+            system.rows.append(array('d', row) if self.backend == FLOAT_BACKEND else row)
+        system._planes = [None] * len(rows)
+        system._first_nonzero = [j if j < self.dimension else -1 for j in pivot_columns]
+        system._first_nonzero += [-1] * (len(rows) - len(pivot_columns))
+        return system
 
+    def clear_allj_abovei(self, i, j):
         for row in range(i)[::-1]:
-            c = self[row].normal_vector[j]
-            self.add_multiple_times_row_to_row(-c, i, row)
-
-    def compute_triangular_form(self):
-        #这里是值拷贝的意思，因为python默认传引用，而这里为了保存原始值。
-        system = deepcopy(self)
-
+            c = self.rows[row][j]
+            if not is_near_zero(c):
+                self.add_multiple_times_row_to_row(-c, i, row)
+
+    #功能：行阶梯形（三角形）
+    #参数：
+    #   [in]inplace, pivoting 同compute_rref
+    #全主元时返回的方程组按主元列重新排列后才是三角形
+    @with_decimal_precision
+    def compute_triangular_form(self, inplace=False, pivoting=None):
+        #不修改调用者的方程组时，只复制一次矩阵的行，之后在副本上原地变换
+        system = self if inplace else self.copy()
+        system.eliminate_below_pivots(pivoting)
+        return system
+
+    #功能：前向消元，逐行选主元并消去主元下方的项（原地修改）
+    #返回值：
+    #   每一行的主元列号，没有主元的行为-1
+    def eliminate_below_pivots(self, pivoting=None):
+        choose_pivot = self.pivoting_strategy(pivoting)
         m = len(self)
-        n = self.dimension
-        j = 0
-        i = 0
+        columns = list(range(self.dimension))
+        pivot_columns = [-1] * m
+
         for i in range(m):
-            while j<n:
-                c = self[i].normal_vector[j]
-                if MyDecimal(c).is_near_zero():
-                    r = self.nonezero_coeff_under_i(i, j)
-                    if r:
-                        self.swap_rows(i, r)
-                        break
-                    else:
-                        j += 1
-                        continue
-                else:
-                    break
+            pivot = choose_pivot(self, i, columns)
+            if pivot is None:
+                break
+            r, j = pivot
+            if r != i:
+                self.swap_rows(i, r)
+            self.clear_allj_bllowi(i, j)
+            pivot_columns[i] = j
+            columns.remove(j)
 
-            if j<n:
-                self.clear_allj_bllowi(i,j)
-                j += 1
+        return pivot_columns
 
-        return self
+    #功能：复制方程组
+    #只复制矩阵的行；Decimal数值和已生成的Plane对象不会被修改，可以共享
+    def copy(self):
+        system = copy(self)
+        system.rows = [row[:] for row in self.rows]
+        system._planes = list(self._planes)
+        system._first_nonzero = list(self._first_nonzero)
+        return system
 
 
     def nonezero_coeff_under_i(self, i, j):
@@ -237,7 +474,7 @@ class LinearSystem(object):
         row2 = j
         m = len(self)
         while row1<m:
-            if self[row1].normal_vector[row2] != 0:
+            if not is_near_zero(self.rows[row1][row2]):
                 return row1
             row1 += 1
         return 0
@@ -246,9 +483,9 @@ class LinearSystem(object):
         row1 = i + 1
         m = len(self)
         while row1<m:
-            c = self[row1].normal_vector[j]
-            if not MyDecimal(c).is_near_zero():
-                self.add_multiple_times_row_to_row(-c/self[i].normal_vector[j], i, row1)
+            c = self.rows[row1][j]
+            if not is_near_zero(c):
+                self.add_multiple_times_row_to_row(-c/self.rows[i][j], i, row1)
             row1 += 1
 
 
@@ -258,19 +495,22 @@ class LinearSystem(object):
         #self[row1] = self[row2]
         #self[row2] = tempplane
         #更好的写法：
-        self[row1], self[row2] = self[row2], self[row1]
+        self.rows[row1], self.rows[row2] = self.rows[row2], self.rows[row1]
+        self._planes[row1], self._planes[row2] = self._planes[row2], self._planes[row1]
+        first_nonzero = self._first_nonzero
+        first_nonzero[row1], first_nonzero[row2] = first_nonzero[row2], first_nonzero[row1]
 
 
     def multiply_coefficient_and_row(self, coefficient, row):
-        n = self[row].normal_vector
-        k = self[row].constant_term
-        
-        new_normal_vector = n.times_scalar(coefficient)
-        new_constant_term = k * coefficient
-
-        #注意：这里创建了新的plane对象，而不是直接修改当前plane的normal_vector和constant_term.
-        #如果修改了现有的plane，则还需要重置该plane的基准点属性。
-        self[row] = Plane(normal_vector=new_normal_vector, constant_term=new_constant_term)
+        #直接修改矩阵中的这一行，Plane对象等到需要时再生成
+        coefficient = self.scalar(coefficient)
+        r = self.rows[row]
+        for k in range(len(r)):
+            r[k] = coefficient * r[k]
+        self._planes[row] = None
+        #乘以非0数不改变首个非0系数的位置
+        if is_near_zero(coefficient):
+            self._first_nonzero[row] = None
 
 
     def add_multiple_times_row_to_row(self, coefficient, row_to_add, row_to_be_added_to):
@@ -279,54 +519,68 @@ class LinearSystem(object):
         #plus_constant_term = self[row_to_add].constant_term * coefficient
         #self[row_to_be_added_to].normal_vector += plus_normal_vector
         #self[row_to_be_added_to].constant_term += plus_constant_term
-        n1 = self[row_to_add].normal_vector
-        n2 = self[row_to_be_added_to].normal_vector
-        c1 = self[row_to_add].constant_term
-        c2 = self[row_to_be_added_to].constant_term
-
-        temp = n1.times_scalar(coefficient)
-        new_normal_vector = n2.plus(temp)
-        new_constant_term = c2 + c1*coefficient
-
-        self[row_to_be_added_to] = Plane(normal_vector=new_normal_vector, constant_term=new_constant_term)
+        coefficient = self.scalar(coefficient)
+        r1 = self.rows[row_to_add]
+        r2 = self.rows[row_to_be_added_to]
+        #两行首个非0系数之前的项都是0，相加后仍是0，只需从两者中较小的列号开始查找
+        indices = [self.first_nonzero_index_in_row(row_to_add), self.first_nonzero_index_in_row(row_to_be_added_to)]
+        start = min([k if k >= 0 else self.dimension for k in indices])
+        for k in range(len(r2)):
+            r2[k] = r2[k] + coefficient * r1[k]
+        self._planes[row_to_be_added_to] = None
+        self._first_nonzero[row_to_be_added_to] = self.scan_first_nonzero_index(row_to_be_added_to, start)
+
+
+    #功能：第i行首个非0系数的列号，全为0时返回-1
+    #由初等行变换增量维护，只有尚未计算时才扫描该行
+    def first_nonzero_index_in_row(self, i):
+        index = self._first_nonzero[i]
+        if index is None:
+            index = self.scan_first_nonzero_index(i)
+            self._first_nonzero[i] = index
+        return index
+
+    #功能：从start列开始查找第i行首个非0系数的列号，全为0时返回-1
+    def scan_first_nonzero_index(self, i, start=0):
+        row = self.rows[i]
+        for k in range(start, self.dimension):
+            if not is_near_zero(row[k]):
+                return k
+        return -1
 
 
     def indices_of_first_nonzero_terms_in_each_row(self):
-        num_equations = len(self)
-        num_variables = self.dimension
-
-        indices = [-1] * num_equations
-
-        for i,p in enumerate(self.planes):
-            try:
-                indices[i] = p.first_nonzero_index(p.normal_vector)
-            except Exception as e:
-                #这里保证即便出现异常也能继续执行
-                if str(e) == Plane.NO_NONZERO_ELTS_FOUND_MSG:
-                    continue
-                else:
-                    raise e
-
-        return indices
+        return [self.first_nonzero_index_in_row(i) for i in range(len(self))]
 
 
     def __len__(self):
-        return len(self.planes)
+        return len(self.rows)
 
 
     def __getitem__(self, i):
-        return self.planes[i]
+        p = self._planes[i]
+        if p is None:
+            p = self.plane_from_row(i)
+            self._planes[i] = p
+        return p
 
 
     def __setitem__(self, i, x):
         try:
             assert x.dimension == self.dimension
-            self.planes[i] = x
+            self.rows[i] = self.row_from_plane(x)
+            self._planes[i] = x
+            self._first_nonzero[i] = x.initial_index
 
         except AssertionError:
             raise Exception(self.ALL_PLANES_MUST_BE_IN_SAME_DIM_MSG)
 
 
+    #功能：对系数矩阵做LU分解，之后可以对不同的常数项反复求解
+    def lu_factorization(self):
+        return LUFactorization.from_linear_system(self)
+
+
     def __str__(self):
         ret = 'Linear System:\n'
         temp = ['Equation {}: {}'.format(i+1,p) for i,p in enumerate(self.planes)]
@@ -334,6 +588,121 @@ class LinearSystem(object):
         return ret
 
 
+#LU分解（部分选主元）：PA = LU
+#分解一次O(n^3)，之后每个常数项向量只需O(n^2)的前代和回代。
+#系数矩阵可以来自LinearSystem，也可以是gj_Solve使用的二维列表。
+class LUFactorization(object):
+
+    MUST_BE_SQUARE_MSG = 'The coefficient matrix must be square'
+    SINGULAR_MATRIX_MSG = 'The coefficient matrix is singular'
+    RHS_SHAPE_MSG = 'The right-hand side must have {} rows'
+
+    #参数：
+    #   [in]A 二维列表表示的n×n系数矩阵
+    #   [in]backend 数值后端，默认使用vector模块的默认后端
+    #   [in]epsilon 判断主元是否为0的阈值
+    @with_decimal_precision
+    def __init__(self, A, backend=None, epsilon=1e-10):
+        if backend is None:
+            backend = get_default_backend()
+        self.backend = backend
+        scalar = float if backend == FLOAT_BACKEND else Decimal
+
+        n = len(A)
+        if n == 0 or any([len(row) != n for row in A]):
+            raise Exception(self.MUST_BE_SQUARE_MSG)
+        self.dimension = n
+
+        #LU同时保存在一个矩阵中：对角线以下是L（对角线为1，不保存），对角线及以上是U
+        LU = [[scalar(x) for x in row] for row in A]
+        #permutation[i]为分解后第i行对应的原始行号
+        permutation = list(range(n))
+
+        for k in range(n):
+            p = max(range(k, n), key=lambda row: abs(LU[row][k]))
+            if is_near_zero(LU[p][k], epsilon):
+                raise Exception(self.SINGULAR_MATRIX_MSG)
+            if p != k:
+                LU[k], LU[p] = LU[p], LU[k]
+                permutation[k], permutation[p] = permutation[p], permutation[k]
+
+            pivot_row = LU[k]
+            pivot = pivot_row[k]
+            for i in range(k+1, n):
+                row = LU[i]
+                factor = row[k] / pivot
+                row[k] = factor
+                if factor != 0:
+                    for j in range(k+1, n):
+                        row[j] -= factor * pivot_row[j]
+
+        self.LU = LU
+        self.permutation = permutation
+        self.scalar = scalar
+
+    #功能：由LinearSystem的系数构造（方程个数必须等于未知数个数）
+    @classmethod
+    def from_linear_system(cls, system, epsilon=1e-10):
+        A = [row[:system.dimension] for row in system.rows]
+        return cls(A, backend=system.backend, epsilon=epsilon)
+
+    #功能：求解 AX = B
+    #参数：
+    #   [in]B n×k的二维列表，每一列是一个常数项向量（gj_Solve中的b是n×1）
+    #返回值：
+    #   n×k的二维列表X
+    @with_decimal_precision
+    def solve(self, B):
+        n = self.dimension
+        if len(B) != n:
+            raise ValueError(self.RHS_SHAPE_MSG.format(n))
+        LU = self.LU
+        scalar = self.scalar
+
+        #前代：LY = PB，按行处理整个块
+        Y = []
+        for i in range(n):
+            y = [scalar(x) for x in B[self.permutation[i]]]
+            row = LU[i]
+            for j in range(i):
+                factor = row[j]
+                if factor != 0:
+                    yj = Y[j]
+                    for c in range(len(y)):
+                        y[c] -= factor * yj[c]
+            Y.append(y)
+
+        #回代：UX = Y
+        X = [None] * n
+        for i in range(n)[::-1]:
+            x = Y[i]
+            row = LU[i]
+            for j in range(i+1, n):
+                factor = row[j]
+                if factor != 0:
+                    xj = X[j]
+                    for c in range(len(x)):
+                        x[c] -= factor * xj[c]
+            pivot = row[i]
+            X[i] = [value / pivot for value in x]
+
+        return X
+
+    #功能：对一个常数项向量求解
+    #参数：
+    #   [in]constant_terms 长度为n的常数项序列（如各平面的constant_term）
+    #返回值：
+    #   解向量Vector
+    def solve_vector(self, constant_terms):
+        X = self.solve([[c] for c in constant_terms])
+        return Vector([row[0] for row in X], backend=self.backend)
+
+
 class MyDecimal(Decimal):
     def is_near_zero(self, eps=1e-10):
         return abs(self) < eps
+
+
+instrument.register(LinearSystem, 'compute_solution', 'compute_triangular_form', 'compute_rref', 'compute_exact_rref',
+                    'swap_rows', 'multiply_coefficient_and_row', 'add_multiple_times_row_to_row',
+                    'indices_of_first_nonzero_terms_in_each_row')
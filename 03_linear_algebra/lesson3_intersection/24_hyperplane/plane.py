@@ -1,47 +1,85 @@
 # -- coding: utf-8 --
-from decimal import Decimal, getcontext
+from decimal import Decimal
 
-from vector import Vector
+import instrument
+from vector import Vector, with_decimal_precision
 
-getcontext().prec = 30
 
+#尚未计算的缓存值（basepoint本身可能是None，不能用None表示未计算）
+_NOT_COMPUTED = object()
 
+
+#n维超平面：normal_vector·x = constant_term，维数由法向量决定
+#Plane创建后不可修改，basepoint和首个非0系数的位置在第一次访问时计算并缓存
 class Plane(object):
- 
+
     NO_NONZERO_ELTS_FOUND_MSG = 'No nonzero elements found'
 
-    def __init__(self, normal_vector=None, constant_term=None):
-        self.dimension = 3
+    #消元时会创建大量Plane，用__slots__省掉每个对象的__dict__
+    __slots__ = ('_normal_vector', '_constant_term', '_basepoint', '_initial_index')
 
-        if not normal_vector:
-            all_zeros = ['0']*self.dimension
+    #参数：
+    #   [in]normal_vector 法向量，默认为dimension维的0向量
+    #   [in]constant_term 常数项，默认为0
+    #   [in]dimension 只在没有给出normal_vector时使用
+    def __init__(self, normal_vector=None, constant_term=None, dimension=3):
+        if normal_vector is None:
+            all_zeros = ['0']*dimension
             normal_vector = Vector(all_zeros)
-        self.normal_vector = normal_vector
+        self._normal_vector = normal_vector
 
         if not constant_term:
             constant_term = Decimal('0')
-        self.constant_term = Decimal(constant_term)
-
-        self.set_basepoint()
+        #常数项与法向量使用同一种数值类型（Decimal或float）
+        self._constant_term = normal_vector.scalar(constant_term)
+
+        self._basepoint = _NOT_COMPUTED
+        self._initial_index = None
+
+    @property
+    def dimension(self):
+        return self._normal_vector.dimension
+
+    @property
+    def normal_vector(self):
+        return self._normal_vector
+
+    @property
+    def constant_term(self):
+        return self._constant_term
+
+    @property
+    def basepoint(self):
+        if self._basepoint is _NOT_COMPUTED:
+            self.set_basepoint()
+        return self._basepoint
+
+    #功能：法向量首个非0系数的列号，全为0时返回-1
+    @property
+    def initial_index(self):
+        if self._initial_index is None:
+            try:
+                self._initial_index = Plane.first_nonzero_index(self._normal_vector)
+            except Exception as e:
+                if str(e) == Plane.NO_NONZERO_ELTS_FOUND_MSG:
+                    self._initial_index = -1
+                else:
+                    raise e
+        return self._initial_index
 
 
+    #功能：计算并缓存basepoint（访问basepoint时自动调用）
+    @with_decimal_precision
     def set_basepoint(self):
-        try:
-            n = self.normal_vector
-            c = self.constant_term
-            basepoint_coords = ['0']*self.dimension
-
-            initial_index = Plane.first_nonzero_index(n)
-            initial_coefficient = n[initial_index]
-
-            basepoint_coords[initial_index] = c/initial_coefficient
-            self.basepoint = Vector(basepoint_coords)
+        n = self.normal_vector
+        initial_index = self.initial_index
+        if initial_index < 0:
+            self._basepoint = None
+            return
 
-        except Exception as e:
-            if str(e) == Plane.NO_NONZERO_ELTS_FOUND_MSG:
-                self.basepoint = None
-            else:
-                raise e
+        basepoint_coords = ['0']*self.dimension
+        basepoint_coords[initial_index] = self.constant_term/n[initial_index]
+        self._basepoint = Vector(basepoint_coords, backend=n.backend)
 
 
     def __str__(self):
@@ -70,18 +108,14 @@ class Plane(object):
 
         n = self.normal_vector
 
-        try:
-            initial_index = Plane.first_nonzero_index(n)
+        initial_index = self.initial_index
+        if initial_index < 0:
+            output = '0'
+        else:
             terms = [write_coefficient(n[i], is_initial_term=(i==initial_index)) + 'x_{}'.format(i+1)
                      for i in range(self.dimension) if round(n[i], num_decimal_places) != 0]
             output = ' '.join(terms)
 
-        except Exception as e:
-            if str(e) == self.NO_NONZERO_ELTS_FOUND_MSG:
-                output = '0'
-            else:
-                raise e
-
         constant = round(self.constant_term, num_decimal_places)
         if constant % 1 == 0:
             constant = int(constant)
@@ -135,6 +169,9 @@ class MyDecimal(Decimal):
     def is_near_zero(self, eps=1e-10):
         return abs(self) < eps
 
+
+instrument.register(Plane, 'set_basepoint', 'is_parallel', 'is_sameplane', 'first_nonzero_index')
+
 """
 normal_vector1 = Vector(['-0.412', '3.806', '0.728'])
 constant_term1 = -3.46
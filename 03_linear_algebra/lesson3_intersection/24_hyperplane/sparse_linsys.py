@@ -0,0 +1,304 @@
+# -- coding: utf-8 --
+#稀疏线性方程组：每个方程只保存非0系数 {列号: 系数}，适合绝大部分系数为0的大规模方程组。
+#
+#前向消元时按最小度（列中非0元最少）选主元列，再在该列中选非0元最少的行（Markowitz准则，
+#并要求主元不小于该行最大系数的PIVOT_THRESHOLD倍以保证数值稳定），以减少填充（fill-in）。
+#消元得到的化简行阶梯形与LinearSystem相同，compute_solution的输出也与LinearSystem一致。
+from decimal import Decimal
+from copy import copy
+from heapq import heappush, heappop
+
+import instrument
+from vector import Vector, FLOAT_BACKEND, is_near_zero, get_default_backend, with_decimal_precision
+from linsys import LinearSystem, Parametrization
+
+#主元的相对阈值：|主元| >= PIVOT_THRESHOLD * 该行最大|系数|
+PIVOT_THRESHOLD = 0.1
+#绝对值小于该值的系数当作0删除（与is_near_zero的默认阈值相同）
+NEAR_ZERO = 1e-10
+
+
+class SparseLinearSystem(object):
+
+    NO_SOLUTIONS_MSG = LinearSystem.NO_SOLUTIONS_MSG
+    COLUMN_OUT_OF_RANGE_MSG = 'Column index {} is out of range for dimension {}'
+    ROWS_AND_CONSTANTS_MUST_MATCH_MSG = 'The number of rows and constant terms must be equal'
+
+    #参数：
+    #   [in]dimension 未知数个数
+    #   [in]rows 每个方程的非0系数，{列号: 系数} 或 [(列号, 系数), ...]
+    #   [in]constant_terms 每个方程的常数项
+    #   [in]backend 数值后端，默认使用vector模块的默认后端
+    def __init__(self, dimension, rows, constant_terms, backend=None):
+        if backend is None:
+            backend = get_default_backend()
+        self.backend = backend
+        self.dimension = dimension
+
+        if len(rows) != len(constant_terms):
+            raise Exception(self.ROWS_AND_CONSTANTS_MUST_MATCH_MSG)
+
+        scalar = self.scalar
+        self.rows = []
+        for row in rows:
+            items = row.items() if isinstance(row, dict) else row
+            sparse_row = {}
+            for j, value in items:
+                if not 0 <= j < dimension:
+                    raise IndexError(self.COLUMN_OUT_OF_RANGE_MSG.format(j, dimension))
+                value = scalar(value)
+                if not is_near_zero(value):
+                    sparse_row[j] = value
+            self.rows.append(sparse_row)
+        self.constant_terms = [scalar(c) for c in constant_terms]
+
+    #功能：由LinearSystem（稠密）转换
+    @classmethod
+    def from_linear_system(cls, system):
+        rows = [[(j, x) for j, x in enumerate(row[:system.dimension])] for row in system.rows]
+        constants = [row[-1] for row in system.rows]
+        return cls(system.dimension, rows, constants, backend=system.backend)
+
+    #功能：由Plane列表转换
+    @classmethod
+    def from_planes(cls, planes):
+        return cls.from_linear_system(LinearSystem(planes))
+
+    #功能：把数值转换为方程组后端的标量类型（Decimal或float）
+    def scalar(self, x):
+        if self.backend == FLOAT_BACKEND:
+            return float(x)
+        return Decimal(x)
+
+    #功能：复制方程组（只复制行字典，数值对象共享）
+    def copy(self):
+        system = copy(self)
+        system.rows = [dict(row) for row in self.rows]
+        system.constant_terms = list(self.constant_terms)
+        return system
+
+    def __len__(self):
+        return len(self.rows)
+
+    #功能：非0系数个数
+    def nonzero_count(self):
+        return sum([len(row) for row in self.rows])
+
+    @with_decimal_precision
+    def compute_solution(self):
+        try:
+            return self.do_gaussian_elimination_and_extract_solution()
+        except Exception as e:
+            if (str(e) == self.NO_SOLUTIONS_MSG):
+                return str(e)
+            else:
+                raise e
+
+    def do_gaussian_elimination_and_extract_solution(self):
+        rref = self.compute_rref()
+
+        rref.raise_exception_if_contradictory_equation()
+
+        direction_vectors = rref.extract_direction_vectors_for_parametrization()
+        basepoint = rref.extract_basepoint_for_parametrization()
+
+        return Parametrization(basepoint, direction_vectors)
+
+    #功能：化简行阶梯形，行按主元列排序，全0行在最后
+    #参数：
+    #   [in]inplace 同LinearSystem.compute_rref
+    @with_decimal_precision
+    def compute_rref(self, inplace=False):
+        system = self if inplace else self.copy()
+
+        pivots = system.eliminate_forward(minimum_degree=True)
+        system.reduce_backward(pivots)
+        #有自由变量时，按最小度选出的主元列不一定是最靠左的列，
+        #再按列顺序消元一次得到标准的化简行阶梯形（此时矩阵已经化简，代价很小）
+        if len(pivots) < system.dimension and not system.pivots_are_leading(pivots):
+            pivots = system.eliminate_forward(minimum_degree=False)
+            system.reduce_backward(pivots)
+
+        pivot_rows = [r for r, j in sorted(pivots, key=lambda pivot: pivot[1])]
+        is_pivot_row = set(pivot_rows)
+        order = pivot_rows + [r for r in range(len(system.rows)) if r not in is_pivot_row]
+        system.rows = [system.rows[r] for r in order]
+        system.constant_terms = [system.constant_terms[r] for r in order]
+        return system
+
+    #功能：各主元是否都是所在行的第一个非0项
+    def pivots_are_leading(self, pivots):
+        for r, j in pivots:
+            if min(self.rows[r]) != j:
+                return False
+        return True
+
+    #功能：前向消元（原地修改），只消去尚未选作主元的行中主元列的项
+    #参数：
+    #   [in]minimum_degree True 按最小度选主元列；False 按列顺序选主元列
+    #返回值：
+    #   按消元顺序排列的主元 [(行号, 列号), ...]
+    def eliminate_forward(self, minimum_degree=True):
+        rows = self.rows
+        #每一列的非0项所在的行（只统计还没有选作主元的行）
+        col_rows = {}
+        for r, row in enumerate(rows):
+            for j in row:
+                col_rows.setdefault(j, set()).add(r)
+
+        pivots = []
+        heap = [(len(col_rows[j]) if minimum_degree else j, j) for j in col_rows]
+        heap.sort()
+
+        while heap:
+            key, j = heappop(heap)
+            candidates = col_rows.get(j)
+            if not candidates:
+                continue
+            if minimum_degree and key != len(candidates):
+                #该列的非0元个数已变化，这是过期的堆元素
+                continue
+
+            r = self.choose_pivot_row(candidates, j)
+            pivots.append((r, j))
+            for k in rows[r]:
+                col_rows[k].discard(r)
+            changed = self.eliminate_column(r, j, col_rows[j], col_rows)
+            #主元行不再参与统计，它所在的各列的非0元个数也都变了
+            changed.update(rows[r])
+            changed.discard(j)
+            for k in changed:
+                heappush(heap, (len(col_rows[k]) if minimum_degree else k, k))
+
+        return pivots
+
+    #功能：回代（原地修改），把每个主元化为1并消去其他主元列，得到化简行阶梯形
+    #按消元的逆序处理，每一行只会在自由变量列上产生新的非0项
+    def reduce_backward(self, pivots):
+        rows = self.rows
+        constants = self.constant_terms
+        pivot_row_of_column = {}
+
+        for r, j in reversed(pivots):
+            row = rows[r]
+            factor = 1 / row[j]
+            for k in row:
+                row[k] = factor * row[k]
+            constants[r] = factor * constants[r]
+
+            for k in [k for k in row if k in pivot_row_of_column]:
+                r2 = pivot_row_of_column[k]
+                self.add_multiple_times_row_to_row(-row[k], r2, r)
+            pivot_row_of_column[j] = r
+
+    #功能：在主元列j的候选行中，选非0元最少且满足稳定性阈值的行
+    def choose_pivot_row(self, candidates, j):
+        rows = self.rows
+        threshold = self.scalar(PIVOT_THRESHOLD)
+        best = None
+        for r in candidates:
+            row = rows[r]
+            value = abs(row[j])
+            if value < threshold * max([abs(x) for x in row.values()]):
+                continue
+            if best is None or len(row) < len(rows[best]) or (len(row) == len(rows[best]) and r < best):
+                best = r
+        if best is None:
+            best = max(candidates, key=lambda r: abs(rows[r][j]))
+        return best
+
+    #功能：用第r行消去targets中各行第j列的项
+    #返回值：
+    #   非0元个数发生变化的列
+    def eliminate_column(self, r, j, targets, col_rows):
+        pivot = self.rows[r][j]
+        changed = set()
+        for r2 in list(targets):
+            changed.update(self.add_multiple_times_row_to_row(-self.rows[r2][j] / pivot, r, r2, col_rows))
+        changed.discard(j)
+        return changed
+
+    #功能：第row_to_be_added_to行加上第row_to_add行的coefficient倍，接近0的项直接删除
+    #参数：
+    #   [in]col_rows 需要同步更新的列索引，可以为None
+    #返回值：
+    #   非0元个数发生变化的列
+    def add_multiple_times_row_to_row(self, coefficient, row_to_add, row_to_be_added_to, col_rows=None):
+        r1 = self.rows[row_to_add]
+        r2 = self.rows[row_to_be_added_to]
+        get = r2.get
+        changed = []
+        for k, value in r1.items():
+            new_value = get(k, 0) + coefficient * value
+            #即is_near_zero(new_value)，内层循环里直接比较以减少函数调用
+            if -NEAR_ZERO < new_value < NEAR_ZERO:
+                if k in r2:
+                    del r2[k]
+                    changed.append(k)
+            else:
+                if k not in r2:
+                    changed.append(k)
+                r2[k] = new_value
+        if col_rows is not None:
+            for k in changed:
+                if k in r2:
+                    col_rows[k].add(row_to_be_added_to)
+                else:
+                    col_rows[k].discard(row_to_be_added_to)
+        constants = self.constant_terms
+        constants[row_to_be_added_to] = constants[row_to_be_added_to] + coefficient * constants[row_to_add]
+        return changed
+
+    #以下方法要求已经是化简行阶梯形（compute_rref的返回值），与LinearSystem中的同名方法对应
+
+    def indices_of_first_nonzero_terms_in_each_row(self):
+        return [min(row) if row else -1 for row in self.rows]
+
+    def raise_exception_if_contradictory_equation(self):
+        for row, constant in zip(self.rows, self.constant_terms):
+            if not row and not is_near_zero(constant):
+                raise Exception(self.NO_SOLUTIONS_MSG)
+
+    def extract_direction_vectors_for_parametrization(self):
+        num_varaible = self.dimension
+        first_nonzero_indexs = self.indices_of_first_nonzero_terms_in_each_row()
+        free_variable_indices = set(range(num_varaible)) - set(first_nonzero_indexs)
+
+        direction_vectors = []
+
+        for free_variable in free_variable_indices:
+            vector_coords = [0] * num_varaible
+            vector_coords[free_variable] = 1
+            for i,row in enumerate(self.rows):
+                pivot_index = first_nonzero_indexs[i]
+                if pivot_index < 0:
+                    break
+                vector_coords[pivot_index] = -row.get(free_variable, 0)
+            direction_vectors.append(Vector(vector_coords, backend=self.backend))
+
+        return direction_vectors
+
+    def extract_basepoint_for_parametrization(self):
+        num_varaible = self.dimension
+        first_nonzero_indexs = self.indices_of_first_nonzero_terms_in_each_row()
+
+        basepoint = [0] * num_varaible
+
+        for i,constant in enumerate(self.constant_terms):
+            pivot_index = first_nonzero_indexs[i]
+            if pivot_index < 0:
+                break
+            basepoint[pivot_index] = constant
+
+        return Vector(basepoint, backend=self.backend)
+
+    def __str__(self):
+        ret = 'Sparse Linear System: {} equations, {} variables, {} nonzeros\n'.format(
+            len(self), self.dimension, self.nonzero_count())
+        temp = ['Equation {}: {} = {}'.format(i+1, ' + '.join(['{}*x_{}'.format(v, j+1) for j, v in sorted(row.items())]) or '0', c)
+                for i, (row, c) in enumerate(zip(self.rows, self.constant_terms))]
+        ret += '\n'.join(temp)
+        return ret
+
+
+instrument.register(SparseLinearSystem, 'compute_solution', 'compute_rref', 'eliminate_forward', 'reduce_backward')
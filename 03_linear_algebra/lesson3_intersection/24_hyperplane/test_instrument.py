@@ -0,0 +1,68 @@
+# -- coding: utf-8 --
+#instrument的检查：关闭时方法就是原始函数，开启后统计调用次数且不改变计算结果
+#用法：python -m pytest test_instrument.py 或 python test_instrument.py
+import unittest
+
+import numpy as np
+
+import instrument
+from linsys import LinearSystem
+from plane import Plane
+from vector import Vector
+
+
+def make_system():
+    A = [[2, 1, -1], [-3, -1, 2], [-2, 1, 2]]
+    b = [8, -11, -3]
+    return LinearSystem([Plane(Vector(row), c) for row, c in zip(A, b)]), A, b
+
+
+class InstrumentTestCase(unittest.TestCase):
+
+    def tearDown(self):
+        instrument.disable()
+        instrument.reset()
+
+    def test_disabled_is_original(self):
+        original = Vector.__dict__['plus']
+        instrument.enable()
+        self.assertTrue(instrument.is_enabled())
+        self.assertFalse(Vector.__dict__['plus'] is original)
+        instrument.disable()
+        self.assertFalse(instrument.is_enabled())
+        self.assertTrue(Vector.__dict__['plus'] is original)
+        #staticmethod恢复后仍是staticmethod
+        self.assertTrue(isinstance(Plane.__dict__['first_nonzero_index'], staticmethod))
+
+    def test_counts_calls(self):
+        system, A, b = make_system()
+        expected = np.linalg.solve(A, b)
+        instrument.reset()
+        instrument.enable()
+        solution = system.compute_solution()
+        instrument.disable()
+        np.testing.assert_allclose(np.array(solution.basepoint.coordinates, dtype=float), expected, rtol=1e-12)
+        stats = instrument.stats()
+        self.assertEqual(stats['LinearSystem.compute_solution']['calls'], 1)
+        self.assertEqual(stats['LinearSystem.compute_rref']['calls'], 1)
+        #消元时每消去一个系数做一次行相加：下方3个、上方3个
+        self.assertEqual(stats['LinearSystem.add_multiple_times_row_to_row']['calls'], 6)
+        self.assertTrue(stats['LinearSystem.compute_solution']['time'] > 0)
+        #关闭后不再统计
+        system.compute_solution()
+        self.assertEqual(instrument.stats()['LinearSystem.compute_solution']['calls'], 1)
+
+    def test_sampling(self):
+        instrument.reset()
+        instrument.enable(sample_every=4)
+        v = Vector([1, 2, 3])
+        for _ in range(10):
+            v.dotproduct(v)
+        record = instrument.stats()['Vector.dotproduct']
+        self.assertEqual((record['calls'], record['sampled']), (10, 2))
+        self.assertAlmostEqual(record['estimated_time'], record['time'] * 5)
+        self.assertRaises(ValueError, instrument.enable, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
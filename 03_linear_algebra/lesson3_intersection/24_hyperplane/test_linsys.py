@@ -0,0 +1,246 @@
+# -- coding: utf-8 --
+#linsys的检查：消元（含分数精确消元）和LU分解的结果与numpy.linalg、scipy.linalg相同
+#用法：python -m pytest test_linsys.py 或 python test_linsys.py
+import unittest
+from decimal import getcontext, localcontext
+from fractions import Fraction
+
+import numpy as np
+
+from linsys import (COMPLETE_PIVOTING, FIRST_NONZERO_PIVOTING, PARTIAL_PIVOTING, PIVOTING_STRATEGIES, LinearSystem,
+                    LUFactorization, fraction_free_rref, partial_pivot)
+from plane import Plane
+from vector import BACKENDS, DECIMAL_BACKEND, DECIMAL_PRECISION, FLOAT_BACKEND, Vector
+
+try:
+    import scipy.linalg
+except ImportError:
+    scipy = None
+
+
+#功能：由系数矩阵A和常数项b构造方程组
+def make_system(A, b, backend=DECIMAL_BACKEND, **kwargs):
+    planes = [Plane(Vector(row, backend=backend), c) for row, c in zip(np.asarray(A).tolist(), np.asarray(b).tolist())]
+    return LinearSystem(planes, **kwargs)
+
+
+def random_problem(n, random_state=0):
+    rng = np.random.RandomState(random_state)
+    A = rng.uniform(-10, 10, size=(n, n))
+    b = rng.uniform(-10, 10, size=n)
+    return A, b
+
+
+def as_array(rows):
+    return np.array([[float(x) for x in row] for row in rows])
+
+
+class LinearSystemTestCase(unittest.TestCase):
+
+    def test_solution_matches_numpy(self):
+        for backend in BACKENDS:
+            for n in (1, 3, 6):
+                A, b = random_problem(n, n)
+                system = make_system(A, b, backend)
+                solution = system.compute_solution()
+                self.assertEqual(solution.direction_vectors, [])
+                np.testing.assert_allclose(np.array(solution.basepoint.coordinates, dtype=float),
+                                           np.linalg.solve(A, b), rtol=1e-9)
+
+    def test_decimal_precision_is_local(self):
+        #导入和求解都不修改调用者的Decimal上下文；调用者的精度很低时，求解仍使用DECIMAL_PRECISION
+        self.assertNotEqual(getcontext().prec, DECIMAL_PRECISION)
+        A, b = random_problem(4, 4)
+        with localcontext() as context:
+            context.prec = 5
+            solution = make_system(A, b).compute_solution()
+            lu_solution = LUFactorization(A.tolist()).solve_vector(b.tolist())
+            self.assertEqual(getcontext().prec, 5)
+        for x in (solution.basepoint, lu_solution):
+            np.testing.assert_allclose(np.array(x.coordinates, dtype=float), np.linalg.solve(A, b), rtol=1e-12)
+
+    def test_rank_matches_numpy(self):
+        #第三个方程是前两个之和：有一个自由变量；常数项不一致时无解
+        A = np.array([[1.0, 2.0, 3.0], [0.5, -1.0, 2.0], [1.5, 1.0, 5.0]])
+        b = np.array([1.0, 2.0, 3.0])
+        for backend in BACKENDS:
+            solution = make_system(A, b, backend).compute_solution()
+            self.assertEqual(len(solution.direction_vectors), 3 - np.linalg.matrix_rank(A))
+            x = np.array(solution.basepoint.coordinates, dtype=float)
+            d = np.array(solution.direction_vectors[0].coordinates, dtype=float)
+            np.testing.assert_allclose(A.dot(x + 2.5 * d), b, atol=1e-10)
+            self.assertEqual(make_system(A, [1.0, 2.0, 4.0], backend).compute_solution(), LinearSystem.NO_SOLUTIONS_MSG)
+
+    def test_row_operations_in_place(self):
+        A, b = random_problem(3)
+        system = make_system(A, b)
+        row = system.rows[1]
+        system.add_multiple_times_row_to_row(2, 0, 1)
+        system.multiply_coefficient_and_row(-1, 2)
+        system.swap_rows(0, 2)
+        #直接修改矩阵中的行，不重新创建
+        self.assertTrue(system.rows[1] is row)
+        expected = np.column_stack([A, b])
+        expected[1] += 2 * expected[0]
+        expected[2] *= -1
+        expected[[0, 2]] = expected[[2, 0]]
+        np.testing.assert_allclose(as_array(system.rows), expected, rtol=1e-12)
+        #按需生成的Plane与矩阵的行一致
+        for i, p in enumerate(system.planes):
+            np.testing.assert_allclose(np.array(p.normal_vector.coordinates, dtype=float), expected[i, :3], rtol=1e-12)
+            self.assertAlmostEqual(float(p.constant_term), expected[i, 3])
+        system[0] = Plane(Vector([1, 0, 0]), 5)
+        self.assertEqual(as_array(system.rows)[0].tolist(), [1, 0, 0, 5])
+        self.assertRaises(Exception, system.__setitem__, 0, Plane(Vector([1, 0]), 5))
+
+    def test_triangular_form(self):
+        A, b = random_problem(4, 1)
+        t = make_system(A, b).compute_triangular_form()
+        M = as_array(t.rows)
+        self.assertTrue(np.allclose(np.tril(M[:, :4], -1), 0))
+        #消元不改变解
+        np.testing.assert_allclose(np.linalg.solve(M[:, :4], M[:, 4]), np.linalg.solve(A, b), rtol=1e-9)
+
+    def test_inplace_flag(self):
+        A, b = random_problem(4, 2)
+        expected = np.column_stack([np.eye(4), np.linalg.solve(A, b)])
+        for method in ('compute_rref', 'compute_triangular_form'):
+            system = make_system(A, b)
+            before = as_array(system.rows)
+            result = getattr(system, method)()
+            #默认不修改原方程组
+            self.assertFalse(result is system)
+            np.testing.assert_array_equal(as_array(system.rows), before)
+            self.assertTrue(getattr(system, method)(inplace=True) is system)
+            np.testing.assert_allclose(as_array(system.rows), as_array(result.rows), rtol=1e-12)
+        rref = make_system(A, b).compute_rref()
+        np.testing.assert_allclose(as_array(rref.rows), expected, rtol=1e-9, atol=1e-12)
+
+    def test_pivoting_strategies_match_numpy(self):
+        A, b = random_problem(5, 3)
+        #有自由变量的方程组：第2列为第1列的2倍
+        B = A.copy()
+        B[:, 1] = 2 * B[:, 0]
+        c = B.dot(b)
+        expected = make_system(B, c, pivoting=FIRST_NONZERO_PIVOTING).compute_rref()
+        for backend in BACKENDS:
+            for strategy in list(PIVOTING_STRATEGIES) + [partial_pivot]:
+                solution = make_system(A, b, backend, pivoting=strategy).compute_solution()
+                np.testing.assert_allclose(np.array(solution.basepoint.coordinates, dtype=float),
+                                           np.linalg.solve(A, b), rtol=1e-9)
+                #全主元会打乱主元列，化简行阶梯形仍与按顺序选主元的结果相同
+                rref = make_system(B, c, backend).compute_rref(pivoting=strategy)
+                np.testing.assert_allclose(as_array(rref.rows), as_array(expected.rows), rtol=1e-9, atol=1e-9)
+        self.assertRaises(ValueError, make_system(A, b).compute_solution, 'largest')
+
+    def test_partial_pivoting_accuracy(self):
+        #第一个主元很小：按顺序取主元时float的误差很大，部分选主元和全主元与NumPy（LAPACK部分选主元）相同
+        A = np.array([[1e-9, 1.0, 2.0], [1.0, 3.0, 1.0], [2.0, 1.0, 3.0]])
+        b = A.sum(axis=1)
+        errors = {}
+        for strategy in (FIRST_NONZERO_PIVOTING, PARTIAL_PIVOTING, COMPLETE_PIVOTING):
+            solution = make_system(A, b, FLOAT_BACKEND).compute_solution(pivoting=strategy)
+            errors[strategy] = np.abs(np.array(solution.basepoint.coordinates) - 1).max()
+        numpy_error = np.abs(np.linalg.solve(A, b) - 1).max()
+        self.assertTrue(errors[FIRST_NONZERO_PIVOTING] > 1e-9)
+        self.assertTrue(errors[PARTIAL_PIVOTING] <= 10 * numpy_error + 1e-15)
+        self.assertTrue(errors[COMPLETE_PIVOTING] < 1e-14)
+
+    def test_first_nonzero_tracking(self):
+        #增量维护的首个非0系数列号与对矩阵直接扫描的结果相同
+        rng = np.random.RandomState(6)
+        A = rng.randint(-2, 3, size=(6, 5)).astype(float)
+        A[:, 0] = 0
+        for backend in BACKENDS:
+            system = make_system(A, np.ones(6), backend)
+            for _ in range(40):
+                i, j = rng.choice(6, size=2, replace=False)
+                operation = rng.randint(3)
+                if operation == 0:
+                    system.swap_rows(i, j)
+                elif operation == 1:
+                    system.multiply_coefficient_and_row(rng.randint(-1, 2), i)
+                else:
+                    system.add_multiple_times_row_to_row(rng.randint(-2, 3), i, j)
+                M = as_array(system.rows)[:, :5]
+                expected = [int(np.flatnonzero(np.abs(row) >= 1e-10)[0]) if (np.abs(row) >= 1e-10).any() else -1
+                            for row in M]
+                self.assertEqual(system.indices_of_first_nonzero_terms_in_each_row(), expected)
+                self.assertEqual([p.initial_index for p in system.planes], expected)
+
+
+class ExactRrefTestCase(unittest.TestCase):
+
+    def test_fraction_free_rref(self):
+        #希尔伯特矩阵的逆矩阵是整数矩阵：[H | I]化简后右半部分就是H的逆
+        n = 6
+        H = [[Fraction(1, i + j + 1) for j in range(n)] for i in range(n)]
+        augmented = [row + [int(i == j) for j in range(n)] for i, row in enumerate(H)]
+        rref, pivot_columns = fraction_free_rref(augmented)
+        self.assertEqual(pivot_columns, list(range(n)))
+        inverse = np.array([[float(x) for x in row[n:]] for row in rref])
+        self.assertTrue(all([x.denominator == 1 for row in rref for x in row]))
+        np.testing.assert_allclose(inverse, np.linalg.inv(np.array(H, dtype=float)), rtol=1e-6)
+        #原矩阵不被修改
+        self.assertEqual(augmented[0][0], 1)
+
+    def test_rank_matches_numpy(self):
+        rng = np.random.RandomState(7)
+        for rank in (1, 2, 4):
+            A = rng.randint(-5, 6, size=(5, rank)).dot(rng.randint(-5, 6, size=(rank, 6)))
+            rref, pivot_columns = fraction_free_rref(A.tolist())
+            self.assertEqual(len(pivot_columns), np.linalg.matrix_rank(A))
+            #化简行阶梯形的行空间与A相同
+            R = np.array(rref, dtype=float)
+            self.assertEqual(np.linalg.matrix_rank(np.vstack([A, R])), len(pivot_columns))
+
+    def test_exact_solution(self):
+        A = [[0.1, 0.2, 0.3], [0.4, 0.5, 0.6], [0.7, 0.8, 1.0]]
+        b = [0.6, 1.5, 2.5]
+        for backend in BACKENDS:
+            solution = make_system(A, b, backend).compute_solution(exact=True)
+            np.testing.assert_allclose(np.array(solution.basepoint.coordinates, dtype=float), np.linalg.solve(A, b),
+                                       rtol=1e-12)
+        #系数用字符串给出时Decimal是精确的十进制数，奇异与否的判断不需要阈值，秩与NumPy相同
+        S = [['0.1', '0.2'], ['0.3', '0.6']]
+        singular = LinearSystem([Plane(Vector(S[0]), '0.3'), Plane(Vector(S[1]), '0.9')])
+        self.assertEqual(len(singular.compute_solution(exact=True).direction_vectors),
+                         2 - np.linalg.matrix_rank(np.array(S, dtype=float)))
+        contradictory = LinearSystem([Plane(Vector(S[0]), '0.3'), Plane(Vector(S[1]), '0.9000000001')])
+        self.assertEqual(contradictory.compute_solution(exact=True), LinearSystem.NO_SOLUTIONS_MSG)
+
+
+class LUFactorizationTestCase(unittest.TestCase):
+
+    def test_solve_matches_numpy(self):
+        A, b = random_problem(6, 4)
+        B = np.column_stack([b, np.arange(6), -b])
+        for backend in BACKENDS:
+            lu = LUFactorization(A.tolist(), backend=backend)
+            np.testing.assert_allclose(as_array(lu.solve(B.tolist())), np.linalg.solve(A, B), rtol=1e-9)
+            x = lu.solve_vector(b.tolist())
+            self.assertEqual(x.backend, backend)
+            np.testing.assert_allclose(np.array(x.coordinates, dtype=float), np.linalg.solve(A, b), rtol=1e-9)
+        system = make_system(A, b, FLOAT_BACKEND)
+        x = system.lu_factorization().solve_vector([p.constant_term for p in system.planes])
+        np.testing.assert_allclose(np.array(x.coordinates), np.linalg.solve(A, b), rtol=1e-12)
+
+    @unittest.skipIf(scipy is None, 'scipy is not installed')
+    def test_factors_match_scipy(self):
+        #都是部分选主元，主元的选择相同，因此L、U和置换都相同
+        A, _ = random_problem(5, 5)
+        lu = LUFactorization(A.tolist(), backend=FLOAT_BACKEND)
+        P, L, U = scipy.linalg.lu(A)
+        M = np.array(lu.LU)
+        np.testing.assert_allclose(np.tril(M, -1) + np.eye(5), L, rtol=1e-12)
+        np.testing.assert_allclose(np.triu(M), U, rtol=1e-12)
+        np.testing.assert_array_equal(A[lu.permutation], P.T.dot(A))
+
+    def test_errors(self):
+        self.assertRaises(Exception, LUFactorization, [[1, 2], [2, 4]])
+        self.assertRaises(Exception, LUFactorization, [[1, 2, 3], [4, 5, 6]])
+        self.assertRaises(ValueError, LUFactorization([[1, 2], [3, 4]]).solve, [[1]])
+
+
+if __name__ == '__main__':
+    unittest.main()
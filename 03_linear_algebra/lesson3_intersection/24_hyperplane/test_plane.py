@@ -0,0 +1,72 @@
+# -- coding: utf-8 --
+#plane的检查：n维超平面的basepoint在平面上，平行、重合的判断与NumPy计算的结果一致
+#用法：python -m pytest test_plane.py 或 python test_plane.py
+import unittest
+
+import numpy as np
+
+import instrument
+from plane import Plane
+from vector import BACKENDS, Vector
+
+
+class PlaneTestCase(unittest.TestCase):
+
+    def test_basepoint_on_plane(self):
+        rng = np.random.RandomState(0)
+        for backend in BACKENDS:
+            for dimension in (2, 3, 7):
+                n = rng.uniform(-10, 10, size=dimension)
+                n[0] = 0
+                p = Plane(Vector(n, backend=backend), 3.5)
+                self.assertEqual(p.dimension, dimension)
+                self.assertEqual(p.initial_index, 1)
+                x = np.array(p.basepoint.coordinates, dtype=float)
+                self.assertAlmostEqual(n.dot(x), 3.5, places=10)
+                self.assertEqual(np.count_nonzero(x), 1)
+
+    def test_zero_normal_vector(self):
+        p = Plane(dimension=5)
+        self.assertEqual(p.dimension, 5)
+        self.assertEqual(p.initial_index, -1)
+        self.assertIsNone(p.basepoint)
+        self.assertEqual(str(p), '0 = 0')
+
+    def test_parallel_and_same_plane(self):
+        rng = np.random.RandomState(1)
+        n = rng.uniform(-10, 10, size=4)
+        p = Plane(Vector(n), 2)
+        same = Plane(Vector(-3 * n), -6)
+        parallel = Plane(Vector(-3 * n), 1)
+        other = Plane(Vector(n + [0, 0, 0, 1]), 2)
+        self.assertTrue(p.is_parallel(same) and p.is_sameplane(same))
+        self.assertTrue(p.is_parallel(parallel) and not p.is_sameplane(parallel))
+        #法向量矩阵的秩为1时平行
+        for q in (same, parallel, other):
+            rank = np.linalg.matrix_rank(np.array([p.normal_vector.coordinates, q.normal_vector.coordinates], dtype=float))
+            self.assertEqual(p.is_parallel(q), rank == 1)
+        self.assertTrue(p == Plane(Vector(n), 2))
+
+    def test_immutable(self):
+        p = Plane(Vector([1, 2, 3]), 4)
+        self.assertRaises(AttributeError, setattr, p, 'constant_term', 5)
+        self.assertRaises(AttributeError, setattr, p, 'extra', 5)
+
+    def test_initial_index_is_memoized(self):
+        instrument.reset()
+        instrument.enable()
+        try:
+            p = Plane(Vector([0, 0, 2, 1]), 4)
+            self.assertEqual([p.initial_index, p.initial_index], [2, 2])
+            p.basepoint
+            p.basepoint
+        finally:
+            instrument.disable()
+        stats = instrument.stats()
+        self.assertEqual(stats['Plane.first_nonzero_index']['calls'], 1)
+        self.assertEqual(stats['Plane.set_basepoint']['calls'], 1)
+        instrument.reset()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+# -- coding: utf-8 --
+#sparse_linsys的检查：解与numpy.linalg、scipy.sparse相同，化简行阶梯形与LinearSystem相同，Markowitz选主元避免填充
+#用法：python -m pytest test_sparse_linsys.py 或 python test_sparse_linsys.py
+import unittest
+
+import numpy as np
+
+from linsys import LinearSystem
+from plane import Plane
+from sparse_linsys import SparseLinearSystem
+from vector import BACKENDS, FLOAT_BACKEND, Vector
+
+try:
+    import scipy.sparse
+    import scipy.sparse.linalg
+except ImportError:
+    scipy = None
+
+
+#功能：稠密矩阵转换为SparseLinearSystem
+def make_sparse(A, b, backend=FLOAT_BACKEND):
+    rows = [[(j, x) for j, x in enumerate(row) if x != 0] for row in np.asarray(A).tolist()]
+    return SparseLinearSystem(len(A[0]), rows, np.asarray(b).tolist(), backend=backend)
+
+
+#箭头矩阵：对角线加上稠密的第一行和第一列。先用第一列消元会填满整个矩阵
+def arrow_matrix(n, random_state=0):
+    rng = np.random.RandomState(random_state)
+    A = np.diag(rng.uniform(1, 2, size=n))
+    A[0, :] = rng.uniform(-1, 1, size=n)
+    A[:, 0] = rng.uniform(-1, 1, size=n)
+    A[0, 0] = n
+    return A, rng.uniform(-10, 10, size=n)
+
+
+def random_sparse(n, density=0.05, random_state=0):
+    rng = np.random.RandomState(random_state)
+    A = np.where(rng.uniform(size=(n, n)) < density, rng.uniform(-10, 10, size=(n, n)), 0.0)
+    A[np.arange(n), np.arange(n)] += 20.0
+    return A, rng.uniform(-10, 10, size=n)
+
+
+class SparseLinearSystemTestCase(unittest.TestCase):
+
+    def test_solution_matches_numpy(self):
+        for backend in BACKENDS:
+            for A, b in (arrow_matrix(30), random_sparse(40)):
+                solution = make_sparse(A, b, backend).compute_solution()
+                self.assertEqual(solution.direction_vectors, [])
+                np.testing.assert_allclose(np.array(solution.basepoint.coordinates, dtype=float),
+                                           np.linalg.solve(A, b), rtol=1e-9)
+
+    @unittest.skipIf(scipy is None, 'scipy is not installed')
+    def test_solution_matches_scipy_sparse(self):
+        A, b = random_sparse(200, density=0.01)
+        solution = make_sparse(A, b).compute_solution()
+        expected = scipy.sparse.linalg.spsolve(scipy.sparse.csc_matrix(A), b)
+        np.testing.assert_allclose(np.array(solution.basepoint.coordinates), expected, rtol=1e-9)
+
+    def test_markowitz_avoids_fill_in(self):
+        n = 50
+        A, b = arrow_matrix(n)
+        system = make_sparse(A, b)
+        nonzeros = system.nonzero_count()
+        self.assertEqual(nonzeros, 3 * n - 2)
+        #用A[0, 0]（部分选主元会选它）消去第一列，剩下的(n-1)×(n-1)块全部填满
+        schur = A[1:, 1:] - np.outer(A[1:, 0], A[0, 1:]) / A[0, 0]
+        self.assertEqual(np.count_nonzero(schur), (n - 1) ** 2)
+        #Markowitz先消去只有两个非0元的列，没有填充
+        copy = system.copy()
+        copy.eliminate_forward()
+        self.assertTrue(copy.nonzero_count() <= nonzeros)
+        #默认不修改原方程组
+        system.compute_rref()
+        self.assertEqual(system.nonzero_count(), nonzeros)
+
+    def test_rref_matches_linear_system(self):
+        #秩为3的5×5方程组：有两个自由变量
+        rng = np.random.RandomState(3)
+        A = rng.randint(-3, 4, size=(5, 3)).dot(rng.randint(-3, 4, size=(3, 5))).astype(float)
+        A[:, 2] = 0
+        b = A.dot(rng.uniform(size=5))
+        planes = [Plane(Vector(row, backend=FLOAT_BACKEND), c) for row, c in zip(A.tolist(), b.tolist())]
+        dense = LinearSystem(planes)
+        sparse = SparseLinearSystem.from_planes(planes)
+        rref = sparse.compute_rref()
+        expected = dense.compute_rref()
+        M = np.zeros((5, 6))
+        for i, (row, c) in enumerate(zip(rref.rows, rref.constant_terms)):
+            for j, x in row.items():
+                M[i, j] = x
+            M[i, 5] = c
+        np.testing.assert_allclose(M, np.array([list(row) for row in expected.rows]), atol=1e-9)
+        self.assertEqual(len(rref.rows) - sum([1 for row in rref.rows if row]), 5 - np.linalg.matrix_rank(A))
+        self.assertEqual(str(sparse.compute_solution()), str(dense.compute_solution()))
+        b[0] += 1
+        self.assertEqual(make_sparse(A, b).compute_solution(), SparseLinearSystem.NO_SOLUTIONS_MSG)
+
+    def test_errors(self):
+        self.assertRaises(IndexError, SparseLinearSystem, 2, [{2: 1.0}], [1.0])
+        self.assertRaises(Exception, SparseLinearSystem, 2, [{0: 1.0}], [1.0, 2.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
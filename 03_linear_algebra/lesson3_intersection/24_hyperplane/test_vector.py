@@ -0,0 +1,122 @@
+# -- coding: utf-8 --
+#vector的检查：两种数值后端的结果与NumPy相同，VectorBatch与逐个Vector计算的结果相同
+#用法：python -m pytest test_vector.py 或 python test_vector.py
+import unittest
+from decimal import Decimal
+
+import numpy as np
+
+from vector import (BACKENDS, DECIMAL_BACKEND, FLOAT_BACKEND, Vector, VectorBatch, get_default_backend,
+                    set_default_backend)
+
+
+def random_vectors(dimension, random_state=0):
+    rng = np.random.RandomState(random_state)
+    return rng.uniform(-10, 10, size=dimension), rng.uniform(-10, 10, size=dimension)
+
+
+class VectorTestCase(unittest.TestCase):
+
+    def test_backends_match_numpy(self):
+        for backend in BACKENDS:
+            for dimension in (2, 3, 5):
+                a, b = random_vectors(dimension, dimension)
+                u = Vector(a.tolist(), backend=backend)
+                v = Vector(b.tolist(), backend=backend)
+                np.testing.assert_allclose(np.array(u.plus(v).coordinates, dtype=float), a + b, rtol=1e-12)
+                np.testing.assert_allclose(np.array(u.minus(v).coordinates, dtype=float), a - b, rtol=1e-12)
+                np.testing.assert_allclose(np.array(u.times_scalar(2.5).coordinates, dtype=float), 2.5 * a,
+                                           rtol=1e-12)
+                self.assertAlmostEqual(float(u.magnitude()), np.linalg.norm(a), places=10)
+                self.assertAlmostEqual(float(u.dotproduct(v)), a.dot(b), places=10)
+                cosine = a.dot(b) / np.linalg.norm(a) / np.linalg.norm(b)
+                self.assertAlmostEqual(u.angle(v), np.arccos(cosine), places=10)
+                projection = a.dot(b) / b.dot(b) * b
+                np.testing.assert_allclose(np.array(u.component_parallel_to(v).coordinates, dtype=float),
+                                           projection, rtol=1e-10)
+                np.testing.assert_allclose(np.array(u.component_orthogonal_to(v).coordinates, dtype=float),
+                                           a - projection, rtol=1e-10, atol=1e-12)
+                if dimension <= 3:
+                    cross = np.cross(np.append(a, [0] * (3 - dimension)), np.append(b, [0] * (3 - dimension)))
+                    np.testing.assert_allclose(np.array(u.cross(v).coordinates, dtype=float), cross, rtol=1e-10)
+                    self.assertAlmostEqual(float(u.area_of_triangle_with(v)), np.linalg.norm(cross) / 2, places=10)
+
+    def test_cross_dimensions(self):
+        for backend in BACKENDS:
+            for a, b in (([1], [2]), ([1, 2, 3, 4], [4, 3, 2, 1]), ([1, 2], [1, 2, 3])):
+                u = Vector(a, backend=backend)
+                v = Vector(b, backend=backend)
+                with self.assertRaises(Exception) as context:
+                    u.cross(v)
+                self.assertEqual(str(context.exception), Vector.ONLY_DEFINED_IN_TWO_THREE_DIMS_MSG)
+
+    def test_coordinate_types(self):
+        self.assertTrue(isinstance(Vector([1, 2]).coordinates[0], Decimal))
+        self.assertTrue(isinstance(Vector([1, 2], backend=FLOAT_BACKEND).coordinates[0], float))
+        #后端不同时按前一个操作数的后端计算
+        u = Vector(['1.5', '2'], backend=FLOAT_BACKEND)
+        v = Vector(['0.5', '1'])
+        self.assertEqual(u.plus(v).backend, FLOAT_BACKEND)
+        self.assertEqual(v.plus(u).backend, DECIMAL_BACKEND)
+        self.assertTrue(u == v.plus(Vector([1, 1])))
+        self.assertTrue(u.to_backend(FLOAT_BACKEND) is u)
+        self.assertRaises(ValueError, Vector, [1], 'int')
+
+    def test_default_backend(self):
+        self.assertEqual(get_default_backend(), DECIMAL_BACKEND)
+        set_default_backend(FLOAT_BACKEND)
+        try:
+            self.assertEqual(Vector([1, 2]).backend, FLOAT_BACKEND)
+        finally:
+            set_default_backend(DECIMAL_BACKEND)
+        self.assertRaises(ValueError, set_default_backend, 'int')
+
+    def test_parallel_and_orthogonal(self):
+        for backend in BACKENDS:
+            u = Vector([-7.579, -7.88], backend=backend)
+            self.assertTrue(u.Is_Parallelism(Vector([22.737, 23.64], backend=backend), tolerance=1e-3))
+            self.assertTrue(u.Is_Parallelism(Vector([0, 0], backend=backend)))
+            self.assertTrue(Vector([1, 2, 0], backend=backend).Is_Orthogonal(Vector([-2, 1, 5], backend=backend)))
+            self.assertRaises(Exception, Vector([0, 0], backend=backend).normalized)
+
+
+class VectorBatchTestCase(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.RandomState(1)
+        self.a = rng.uniform(-10, 10, size=(20, 3))
+        self.b = rng.uniform(-10, 10, size=(20, 3))
+        #加入平行、垂直的行
+        self.b[0] = -2 * self.a[0]
+        self.b[1] = np.cross(self.a[1], [1, 0, 0])
+        self.u = VectorBatch(self.a)
+        self.v = VectorBatch(self.b)
+
+    def test_matches_vector(self):
+        vectors = [(Vector(x, backend=FLOAT_BACKEND), Vector(y, backend=FLOAT_BACKEND)) for x, y in zip(self.a, self.b)]
+        np.testing.assert_allclose(self.u.magnitude(), [x.magnitude() for x, _ in vectors], rtol=1e-12)
+        for name in ('dotproduct', 'angle'):
+            np.testing.assert_allclose(getattr(self.u, name)(self.v), [getattr(x, name)(y) for x, y in vectors],
+                                       rtol=1e-10)
+        for name in ('Is_Parallelism', 'Is_Orthogonal'):
+            np.testing.assert_array_equal(getattr(self.u, name)(self.v), [getattr(x, name)(y) for x, y in vectors])
+        for name in ('plus', 'minus', 'component_parallel_to', 'component_orthogonal_to', 'cross'):
+            expected = [list(getattr(x, name)(y).coordinates) for x, y in vectors]
+            np.testing.assert_allclose(getattr(self.u, name)(self.v).data, expected, rtol=1e-10, atol=1e-12)
+        np.testing.assert_allclose(self.u.area_of_triangle_with(self.v),
+                                   np.linalg.norm(np.cross(self.a, self.b), axis=1) / 2, rtol=1e-12)
+
+    def test_broadcast_single_vector(self):
+        w = Vector([1, -2, 0.5])
+        np.testing.assert_allclose(self.u.dotproduct(w), self.a.dot([1, -2, 0.5]), rtol=1e-12)
+        np.testing.assert_allclose(self.u.minus(w).data, self.a - [1, -2, 0.5])
+        np.testing.assert_allclose(self.u.times_scalar(np.arange(20)).data, self.a * np.arange(20).reshape(-1, 1))
+        self.assertTrue(self.u.equals(self.u.to_vectors()[3]).sum() == 1)
+        self.assertEqual(len(VectorBatch.from_vectors(self.u.to_vectors())), 20)
+        self.assertRaises(ValueError, self.u.plus, Vector([1, 2]))
+        self.assertRaises(ValueError, self.u.plus, VectorBatch(self.a[:5]))
+        self.assertRaises(Exception, VectorBatch([[1, 2, 3, 4]]).cross, Vector([1, 2, 3, 4]))
+
+
+if __name__ == '__main__':
+    unittest.main()
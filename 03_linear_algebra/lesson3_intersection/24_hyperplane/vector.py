@@ -1,9 +1,70 @@
 # -- coding: utf-8 --
 from math import sqrt, acos, pi
+from array import array
 #确保是Vector对象外面的数字被处理成小数，而不是浮点数或者整数
-from decimal import Decimal, getcontext
+from decimal import Decimal, localcontext
+from functools import wraps
+
+import instrument
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+#Decimal后端消元求解时的精度（有效数字位数）
+#只在with_decimal_precision装饰的方法内部生效，导入本模块不会修改调用者的全局Decimal上下文；
+#Vector、Plane自身的运算使用调用者当前的上下文
+DECIMAL_PRECISION = 30
+
+#数值后端：
+#   DECIMAL_BACKEND 精确小数模式（默认），坐标保存为Decimal元组
+#   FLOAT_BACKEND   float64快速模式，坐标保存为array('d')连续缓冲区
+#选择方式：
+#   单个对象：Vector(coordinates, backend=FLOAT_BACKEND)
+#   整个进程：set_default_backend(FLOAT_BACKEND)
+#   已有对象转换：v.to_backend(FLOAT_BACKEND)
+DECIMAL_BACKEND = 'decimal'
+FLOAT_BACKEND = 'float'
+BACKENDS = (DECIMAL_BACKEND, FLOAT_BACKEND)
+
+_SCALAR_TYPES = {DECIMAL_BACKEND: Decimal, FLOAT_BACKEND: float}
+_default_backend = DECIMAL_BACKEND
+
+
+#功能：设置进程内新建Vector对象的默认数值后端
+#参数：
+#   [in]backend DECIMAL_BACKEND 或 FLOAT_BACKEND
+def set_default_backend(backend):
+    global _default_backend
+    if backend not in BACKENDS:
+        raise ValueError(Vector.UNKNOWN_BACKEND_MSG.format(backend))
+    _default_backend = backend
+
+
+#功能：返回进程内新建Vector对象的默认数值后端
+def get_default_backend():
+    return _default_backend
+
+
+#功能：装饰器，被装饰的方法在精度为DECIMAL_PRECISION的局部Decimal上下文中执行
+#参数：
+#   [in]method 方法或函数
+#返回值：
+#   包装后的方法，退出时恢复调用者原来的Decimal上下文
+def with_decimal_precision(method):
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        with localcontext() as context:
+            context.prec = DECIMAL_PRECISION
+            return method(*args, **kwargs)
+    return wrapper
+
+
+#功能：判断数值是否近似为0（Decimal和float均适用）
+def is_near_zero(value, eps=1e-10):
+    return abs(value) < eps
 
-getcontext().prec = 25
 
 class Vector(object):
 
@@ -11,12 +72,22 @@ class Vector(object):
     NO_UNIQUE_PARALLEL_COMPONENT_MSG = '零向量没有唯一的平行向量'
     NO_UNIQUE_ORTHOGONAL_COMPONENT_MSG = '零向量没有唯一的垂直向量'
     ONLY_DEFINED_IN_TWO_THREE_DIMS_MSG = '仅定义了二维和三维空间中的叉积'
+    UNKNOWN_BACKEND_MSG = 'Unknown numeric backend: {}'
+
+    def __init__(self, coordinates, backend=None):
+        if backend is None:
+            backend = _default_backend
+        if backend not in BACKENDS:
+            raise ValueError(self.UNKNOWN_BACKEND_MSG.format(backend))
+        self.backend = backend
 
-    def __init__(self, coordinates):
         try:
-            if not coordinates:
+            if backend == FLOAT_BACKEND:
+                self.coordinates = array('d', [float(x) for x in coordinates])
+            else:
+                self.coordinates = tuple([Decimal(x) for x in coordinates])
+            if not self.coordinates:
                 raise ValueError
-            self.coordinates = tuple([Decimal(x) for x in coordinates])
             self.dimension = len(self.coordinates)
  #           self.CANNOT_NORMALIZE_ZERO_VECTOR_MSG = "ZeroDivisionError"
 
@@ -28,14 +99,15 @@ class Vector(object):
 
 
     def __str__(self):
-        return 'Vector: {}'.format(self.coordinates)
+        return 'Vector: {}'.format(tuple(self.coordinates))
 
 
     def __eq__(self, v):
         if(self.dimension == v.dimension):
+            coordinates = self.coordinates_of(v)
             for i in range(self.dimension):
-                c = self.coordinates[i] - v.coordinates[i]
-                if not MyDecimal(c).is_near_zero():
+                c = self.coordinates[i] - coordinates[i]
+                if not is_near_zero(c):
                     return False
             return True
         return False
@@ -43,6 +115,32 @@ class Vector(object):
     def __getitem__(self, item):
         return self.coordinates[item]
 
+    #功能：转换为指定数值后端的向量
+    #参数：
+    #   [in]self 向量
+    #   [in]backend DECIMAL_BACKEND 或 FLOAT_BACKEND
+    #返回值：
+    #   后端相同时返回self本身，否则返回新向量
+    def to_backend(self, backend):
+        if backend == self.backend:
+            return self
+        return Vector(self.coordinates, backend=backend)
+
+    #功能：按self的数值后端取出另一向量的坐标（两者后端不同时才做转换）
+    #参数：
+    #   [in]self 向量
+    #   [in]v 另一向量
+    #返回值：
+    #   与self坐标类型一致的坐标序列
+    def coordinates_of(self, v):
+        if v.backend == self.backend:
+            return v.coordinates
+        return v.to_backend(self.backend).coordinates
+
+    #功能：把数值转换为self数值后端的标量类型（Decimal或float）
+    def scalar(self, x):
+        return _SCALAR_TYPES[self.backend](x)
+
     #功能：加法
     #参数：
     #   [in]self 前操作数
@@ -54,9 +152,10 @@ class Vector(object):
         #new_coordinates = [x+y for x,y in zip(self.coordinates, v.coordinates)]
         new_coordinates = []
         n = len(self.coordinates)
+        coordinates = self.coordinates_of(v)
         for i in range(n):
-            new_coordinates.append(self.coordinates[i] + v.coordinates[i])
-        return Vector(new_coordinates)
+            new_coordinates.append(self.coordinates[i] + coordinates[i])
+        return Vector(new_coordinates, backend=self.backend)
 
     #功能：魔法方法加法+=
     #参数：
@@ -76,8 +175,8 @@ class Vector(object):
     #   self减v的结果
     def minus(self, v):
         #列表推导式
-        new_coordinates = [x-y for x,y in zip(self.coordinates, v.coordinates)]
-        return Vector(new_coordinates)
+        new_coordinates = [x-y for x,y in zip(self.coordinates, self.coordinates_of(v))]
+        return Vector(new_coordinates, backend=self.backend)
 
     #功能：乘法
     #参数：
@@ -87,8 +186,9 @@ class Vector(object):
     #   self和c相乘的结果
     def times_scalar(self, c):
         #列表推导式
-        new_coordinates = [Decimal(c)*x for x in self.coordinates]
-        return Vector(new_coordinates)
+        c = self.scalar(c)
+        new_coordinates = [c*x for x in self.coordinates]
+        return Vector(new_coordinates, backend=self.backend)
 
     #功能：求向量大小
     #参数：
@@ -103,6 +203,8 @@ class Vector(object):
             magn += self.coordinates[i]**2
         return math.sqrt(magn)
         """
+        if self.backend == FLOAT_BACKEND:
+            return sqrt(sum([x*x for x in self.coordinates]))
         coordinates_squared = [x**Decimal(2) for x in self.coordinates]
         return sum(coordinates_squared).sqrt()
         """
@@ -126,7 +228,7 @@ class Vector(object):
         """
         try:
             magnitude = self.magnitude()
-            return self.times_scalar(Decimal(1.0)/magnitude)
+            return self.times_scalar(self.scalar(1)/magnitude)
         except Exception as e:
             if str(e) == self.CANNOT_NORMALIZE_ZERO_VECTOR_MSG:
                 raise Exception(self.CANNOT_NORMALIZE_ZERO_VECTOR_MSG)
@@ -140,7 +242,7 @@ class Vector(object):
     #返回值：
     #   点积结果值
     def dotproduct(self, c):
-        return sum([x*y for x,y in zip(self.coordinates, c.coordinates)])
+        return sum([x*y for x,y in zip(self.coordinates, self.coordinates_of(c))])
 
 
     #功能：向量之间的夹角
@@ -183,13 +285,11 @@ class Vector(object):
     #返回值：
     #   True 平行; False 不平行
     def Is_Parallelism(self, c, tolerance=1e-10):
-        print "[Is_Parallelism] begin"
         bool1 = self.magnitude() < tolerance
         bool2 = c.magnitude() < tolerance
         
         #两向量中有且只有一个向量是0向量(python的异或操作符没有找到)
         if ( (bool1 or bool2) and not(bool1 and bool2) ):
-            print "[Is_Parallelism] end"
             return True
 
         #优达学城方法：
@@ -198,11 +298,9 @@ class Vector(object):
         #   return True
 
         #我的方法：两向量的单位向量的点积的绝对值是否等于1(点积的绝对值减1的绝对值是否小于一个很小的常量)
-        if ( abs( abs(self.normalized().dotproduct( c.normalized() ) ) - Decimal(1) ) < tolerance ):
-            print "[Is_Parallelism]dotproduct end"
+        if ( abs( abs(self.normalized().dotproduct( c.normalized() ) ) - self.scalar(1) ) < tolerance ):
             return True
         else:
-            print "[Is_Parallelism] end"
             return False
         
     #功能：判断两向量是否互相垂直
@@ -212,14 +310,11 @@ class Vector(object):
     #返回值：
     #   True 垂直; False 不互相垂直
     def Is_Orthogonal(self, c, tolerance=1e-10):
-        print "[Is_Orthogonal] begin"
         
         #两向量的点积等于0(绝对值小于一个很小的常量)
         if ( abs(self.dotproduct(c)) < tolerance ):
-            print "[Is_Orthogonal] end"
             return True
         else:
-            print "[Is_Orthogonal] end"
             return False
 
 
@@ -264,26 +359,20 @@ class Vector(object):
     #返回值：
     #   向量积（叉积）结果
     def cross(self, basic):
-        try:
-            print "[cross] begin"
-            x_1, y_1, z_1 = self.coordinates
-            x_2, y_2, z_2 = basic.coordinates
-            new_coordinates = [y_1*z_2 - y_2*z_1,
-                                z_1*x_2 - z_2*x_1,
-                                x_1*y_2 - x_2*y_1]
-            print "[cross] end"
-            return Vector(new_coordinates)
-        except Exception as e:
-            if str(e) == "need more than 2 values to unpack":
-                self_embeded_inR3 = Vector(self.coordinates + ('0',))
-                basic_embeded_inR3 = Vector(basic.coordinates + ('0',))
-                return self_embeded_inR3.cross(basic_embeded_inR3)
-            elif(str(e) == "need more than 1 value to unpack" or
-                str(e) == "too many values to unpack"
-                ):
-                raise Exception(self.ONLY_DEFINED_IN_TWO_THREE_DIMS_MSG)
-            else:
-                raise e
+        if self.dimension != basic.dimension or self.dimension not in (2, 3):
+            raise Exception(self.ONLY_DEFINED_IN_TWO_THREE_DIMS_MSG)
+        if self.dimension == 2:
+            #二维向量嵌入三维空间（第三个坐标补0）后再求叉积
+            zero = [self.scalar(0)]
+            self_embeded_inR3 = Vector(list(self.coordinates) + zero, backend=self.backend)
+            basic_embeded_inR3 = Vector(list(self.coordinates_of(basic)) + zero, backend=self.backend)
+            return self_embeded_inR3.cross(basic_embeded_inR3)
+        x_1, y_1, z_1 = self.coordinates
+        x_2, y_2, z_2 = self.coordinates_of(basic)
+        new_coordinates = [y_1*z_2 - y_2*z_1,
+                            z_1*x_2 - z_2*x_1,
+                            x_1*y_2 - x_2*y_1]
+        return Vector(new_coordinates, backend=self.backend)
 
 
     #功能：计算两个三维向量所构成的平行四边形的面积
@@ -304,13 +393,167 @@ class Vector(object):
     #返回值：
     #   三角形面积
     def area_of_triangle_with(self, basic):
-        return self.area_of_parallelogram_with(basic) / Decimal(2.0)
+        return self.area_of_parallelogram_with(basic) / self.scalar(2)
+
+#批量向量：N个d维向量保存在一个N×d的连续float64矩阵中（需要NumPy）
+#每个方法都是Vector同名方法的向量化版本，第i行的结果对应第i对向量。
+#另一操作数可以是同样行数的VectorBatch，也可以是单个Vector（广播到每一行）。
+class VectorBatch(object):
+
+    NUMPY_REQUIRED_MSG = 'VectorBatch requires NumPy'
+    MUST_BE_TWO_DIMENSIONAL_MSG = 'The data must be an N x d matrix'
+    BATCHES_MUST_MATCH_MSG = 'Both operands must have the same shape'
+
+    def __init__(self, data):
+        if np is None:
+            raise ImportError(self.NUMPY_REQUIRED_MSG)
+        data = np.ascontiguousarray(data, dtype=np.float64)
+        if data.ndim != 2 or data.shape[1] == 0:
+            raise ValueError(self.MUST_BE_TWO_DIMENSIONAL_MSG)
+        self.data = data
+        self.dimension = data.shape[1]
+
+    #功能：由Vector对象列表构造批量向量
+    @classmethod
+    def from_vectors(cls, vectors):
+        return cls([[float(x) for x in v.coordinates] for v in vectors])
+
+    #功能：转换回Vector对象列表
+    #参数：
+    #   [in]backend 生成的Vector的数值后端，默认FLOAT_BACKEND
+    def to_vectors(self, backend=FLOAT_BACKEND):
+        return [Vector(row, backend=backend) for row in self.data.tolist()]
+
+    def __len__(self):
+        return self.data.shape[0]
+
+    def __getitem__(self, item):
+        return Vector(self.data[item].tolist(), backend=FLOAT_BACKEND)
+
+    def __str__(self):
+        return 'VectorBatch: {} x {}'.format(len(self), self.dimension)
+
+    #功能：取出另一操作数的矩阵，单个Vector变成1×d以便广播
+    def matrix_of(self, v):
+        if isinstance(v, VectorBatch):
+            other = v.data
+        else:
+            other = np.asarray([float(x) for x in v.coordinates]).reshape(1, -1)
+        if other.shape[1] != self.dimension or other.shape[0] not in (1, len(self)):
+            raise ValueError(self.BATCHES_MUST_MATCH_MSG)
+        return other
+
+    #功能：逐行判断两批向量是否相等（与Vector.__eq__使用相同的阈值）
+    #返回值：
+    #   长度为N的布尔数组
+    def equals(self, v, tolerance=1e-10):
+        return (np.abs(self.data - self.matrix_of(v)) < tolerance).all(axis=1)
+
+    def plus(self, v):
+        return VectorBatch(self.data + self.matrix_of(v))
+
+    def minus(self, v):
+        return VectorBatch(self.data - self.matrix_of(v))
+
+    #参数：
+    #   [in]c 标量，或长度为N的数组（每行一个系数）
+    def times_scalar(self, c):
+        c = np.asarray(c, dtype=np.float64)
+        if c.ndim == 1:
+            c = c.reshape(-1, 1)
+        return VectorBatch(self.data * c)
+
+    #返回值：
+    #   长度为N的数组
+    def magnitude(self):
+        return np.sqrt(np.einsum('ij,ij->i', self.data, self.data))
+
+    def normalized(self):
+        magnitude = self.magnitude()
+        if (magnitude == 0).any():
+            raise Exception(Vector.CANNOT_NORMALIZE_ZERO_VECTOR_MSG)
+        return VectorBatch(self.data / magnitude.reshape(-1, 1))
+
+    #返回值：
+    #   长度为N的数组
+    def dotproduct(self, c):
+        other = self.matrix_of(c)
+        if other.shape[0] == 1:
+            return self.data.dot(other[0])
+        return np.einsum('ij,ij->i', self.data, other)
+
+    def angle(self, c, in_degrees=False):
+        if not isinstance(c, VectorBatch):
+            c = VectorBatch(self.matrix_of(c))
+        cosine = self.normalized().dotproduct(c.normalized())
+        angle_in_radian = np.arccos(np.clip(cosine, -1.0, 1.0))
+
+        if in_degrees:
+            return angle_in_radian / pi * 180.0
+        else:
+            return angle_in_radian
+
+    #返回值：
+    #   布尔数组，与Vector.Is_Parallelism一致：恰有一个零向量时为True；
+    #   两个都是零向量时Vector会抛出异常，这里按零向量与任意向量平行记为True
+    def Is_Parallelism(self, c, tolerance=1e-10):
+        other = self.matrix_of(c)
+        m1 = self.magnitude()
+        m2 = np.sqrt(np.einsum('ij,ij->i', other, other))
+        zero1 = m1 < tolerance
+        zero2 = m2 < tolerance
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cosine = self.dotproduct(c) / (m1 * m2)
+            return zero1 | zero2 | (np.abs(np.abs(cosine) - 1.0) < tolerance)
+
+    #返回值：
+    #   布尔数组
+    def Is_Orthogonal(self, c, tolerance=1e-10):
+        return np.abs(self.dotproduct(c)) < tolerance
+
+    def component_parallel_to(self, basic):
+        if not isinstance(basic, VectorBatch):
+            basic = VectorBatch(self.matrix_of(basic))
+        try:
+            u = basic.normalized()
+        except Exception as e:
+            if str(e) == Vector.CANNOT_NORMALIZE_ZERO_VECTOR_MSG:
+                raise Exception(Vector.NO_UNIQUE_PARALLEL_COMPONENT_MSG)
+            else:
+                raise e
+        return u.times_scalar(self.dotproduct(u))
+
+    def component_orthogonal_to(self, basic):
+        return self.minus(self.component_parallel_to(basic))
+
+    #二维向量先嵌入三维空间（补0）再计算，与Vector.cross一致
+    def cross(self, basic):
+        a = self.data
+        b = self.matrix_of(basic)
+        if self.dimension == 2:
+            a = np.hstack([a, np.zeros((a.shape[0], 1))])
+            b = np.hstack([b, np.zeros((b.shape[0], 1))])
+        elif self.dimension != 3:
+            raise Exception(Vector.ONLY_DEFINED_IN_TWO_THREE_DIMS_MSG)
+        return VectorBatch(np.cross(a, b))
+
+    def area_of_parallelogram_with(self, basic):
+        return self.cross(basic).magnitude()
+
+    def area_of_triangle_with(self, basic):
+        return self.area_of_parallelogram_with(basic) / 2.0
 
 
 class MyDecimal(Decimal):
     def is_near_zero(self, eps=1e-10):
         return abs(self) < eps
 
+
+instrument.register(Vector, 'plus', 'minus', 'times_scalar', 'magnitude', 'normalized',
+                    'dotproduct', 'angle', 'Is_Parallelism', 'Is_Orthogonal',
+                    'component_parallel_to', 'component_orthogonal_to', 'cross')
+
 """
 print "加plus:"
 my_voctors1 = Vector([8.218,-9.341])
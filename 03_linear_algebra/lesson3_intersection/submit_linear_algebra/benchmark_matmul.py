@@ -0,0 +1,57 @@
+# -- coding: utf-8 --
+#比较不依赖NumPy的矩阵乘法在不同进程数下的耗时
+#用法：python benchmark_matmul.py [矩阵大小 ...]
+#python：纯Python实现（linear_regression_project中原来的matxMultiply）
+#array：array('d')分块实现，workers为进程数
+#matxMultiply：没有NumPy时linear_regression_project和matrix_backend的matxMultiply（自动选择进程数）
+import random
+import sys
+from timeit import default_timer
+
+import matrix_backend
+from matrix_backend import python_multiply, array_multiply
+
+SIZES = [100, 200, 300]
+WORKERS = [1, 2, 4, 8]
+
+
+def random_matrix(rows, columns, seed):
+    rng = random.Random(seed)
+    return [[rng.random() for _ in range(columns)] for _ in range(rows)]
+
+
+def timed(f, *args, **kwargs):
+    start = default_timer()
+    result = f(*args, **kwargs)
+    return result, default_timer() - start
+
+
+#功能：模拟没有NumPy的环境调用matxMultiply
+def matxMultiply_without_numpy(A, B):
+    np = matrix_backend.np
+    matrix_backend.np = None
+    try:
+        return matrix_backend.matxMultiply(A, B)
+    finally:
+        matrix_backend.np = np
+
+
+def main(sizes):
+    print('{:<8}{:<16}{:>12}{:>10}'.format('size', 'method', 'seconds', 'speedup'))
+    for n in sizes:
+        A = random_matrix(n, n, 1)
+        B = random_matrix(n, n, 2)
+        expected, baseline = timed(python_multiply, A, B)
+        print('{:<8}{:<16}{:>12.3f}{:>10.2f}'.format(n, 'python', baseline, 1.0))
+        for workers in WORKERS:
+            C, elapsed = timed(array_multiply, A, B, workers=workers)
+            assert C == expected
+            method = 'array x{}'.format(workers)
+            print('{:<8}{:<16}{:>12.3f}{:>10.2f}'.format(n, method, elapsed, baseline / elapsed))
+        C, elapsed = timed(matxMultiply_without_numpy, A, B)
+        assert C == expected
+        print('{:<8}{:<16}{:>12.3f}{:>10.2f}'.format(n, 'matxMultiply', elapsed, baseline / elapsed))
+
+
+if __name__ == '__main__':
+    main([int(x) for x in sys.argv[1:]] or SIZES)
@@ -0,0 +1,69 @@
+# -- coding: utf-8 --
+#在项目自带的房价数据上比较多元线性回归各求解器的耗时和精度
+#用法：python benchmark_regression.py
+#rmse：训练集上的均方根误差；max diff：系数与numpy.linalg.lstsq结果之差的最大绝对值
+import csv
+import os
+from timeit import default_timer
+
+from multivariate_regression import MultivariateLinearRegression, SOLVERS
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', '05_modle_assess_verify')
+#(文件名, 特征列, 目标列)
+DATASETS = [('housing.csv', ['RM', 'LSTAT', 'PTRATIO'], 'MEDV'),
+            ('bj_housing.csv', ['Area', 'Room', 'Living', 'School', 'Year', 'Floor'], 'Value')]
+REPEAT = 5
+
+
+def load(filename, features, target):
+    with open(os.path.join(DATA_DIR, filename)) as f:
+        rows = list(csv.DictReader(f))
+    X = [[float(row[name]) for name in features] for row in rows]
+    y = [float(row[target]) for row in rows]
+    return X, y
+
+
+def rmse(y, predictions):
+    return (sum([(a - b) ** 2 for a, b in zip(y, predictions)]) / len(y)) ** 0.5
+
+
+def reference_weights(X, y):
+    if np is None:
+        return None
+    A = np.hstack([np.array(X), np.ones((len(X), 1))])
+    return np.linalg.lstsq(A, np.array(y), rcond=None)[0].tolist()
+
+
+def main():
+    print('{:<16}{:<16}{:>10}{:>12}{:>14}{:>12}'.format('data', 'solver', 'fit ms', 'predict ms', 'rmse', 'max diff'))
+    for filename, features, target in DATASETS:
+        X, y = load(filename, features, target)
+        reference = reference_weights(X, y)
+        for solver in SOLVERS:
+            start = default_timer()
+            for _ in range(REPEAT):
+                model = MultivariateLinearRegression(solver=solver).fit(X, y)
+            fit_time = (default_timer() - start) / REPEAT * 1000
+
+            start = default_timer()
+            for _ in range(REPEAT):
+                predictions = model.predict(X)
+            predict_time = (default_timer() - start) / REPEAT * 1000
+
+            if reference is None:
+                diff = 'n/a'
+            else:
+                weights = model.coefficients + [model.intercept]
+                diff = '{:.2e}'.format(max([abs(a - b) for a, b in zip(weights, reference)]))
+            print('{:<16}{:<16}{:>10.2f}{:>12.2f}{:>14.4f}{:>12}'.format(
+                filename, solver if solver == model.solver_used else '{}->{}'.format(solver, model.solver_used),
+                fit_time, predict_time, rmse(y, predictions), diff))
+
+
+if __name__ == '__main__':
+    main()
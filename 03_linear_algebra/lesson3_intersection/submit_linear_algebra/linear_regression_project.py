@@ -6,7 +6,7 @@
 
 # 任意选一个你喜欢的整数，这能帮你得到稳定的结果
 seed = 9999
-print seed
+print(seed)
 
 
 # # 欢迎来到线性回归项目
@@ -49,7 +49,7 @@ I = [[1,0,0,0],
      [0,0,1,0],
      [0,0,0,1]
     ]
-print I
+print(I)
 
 
 # ## 1.2 返回矩阵的行数和列数
@@ -117,26 +117,13 @@ get_ipython().magic(u'run -i -e test.py LinearRegressionTestCase.test_transpose'
 # In[9]:
 
 
+import matrix_backend
+
 # TODO 计算矩阵乘法 AB，如果无法相乘则raise ValueError
+#由matrix_backend计算：元素都是int/float时用NumPy（BLAS）或array('d')分块计算，
+#其他类型（如Decimal）用纯Python计算，返回值都是二维列表
 def matxMultiply(A, B):
-    #try:
-        rowA, colA = shape(A)
-        rowB, colB = shape(B)
-        if colA != rowB:
-            print "无法相乘"
-            raise ValueError
-            
-        C = [[0 for n in range(colB)]for m in range(rowA)]
-        tB = transpose(B)
-        
-        for i in range(rowA):
-            for j in range(colB):
-                C[i][j] = sum([a*b for a,b in zip(A[i],tB[j])])
-        return C
-    
-    #except:
-    #    print "except"
-    #    raise Exception
+    return matrix_backend.matxMultiply(A, B)
 
 
 # In[10]:
@@ -462,25 +449,42 @@ def simplify_matrix(Ab, epsilon):
                 if (i != j) and (not is_near_zero(Ab[i][j], epsilon)):
                     addScaledRow(Ab, i, j, -Ab[i][j])
 
+
+import os
+import sys
+
+#精确求解与24_hyperplane/linsys.LinearSystem共用同一个无分数消元（Bareiss）的实现
+#按本文件所在目录查找24_hyperplane，与当前工作目录无关（notebook中没有__file__，其工作目录就是notebook所在目录）
+PROJECT_DIR = os.path.dirname(os.path.abspath(globals().get('__file__', 'linear_regression_project.ipynb')))
+sys.path.append(os.path.join(PROJECT_DIR, '..', '24_hyperplane'))
+from linsys import fraction_free_rref
+
 """ Gaussian Jordan 方法求解 Ax = b.
     参数
         A: 方阵 
         b: 列向量
         decPts: 四舍五入位数，默认为4
         epsilon: 判读是否为0的阈值，默认 1.0e-16
+        exact: True 用分数精确求解（忽略epsilon），默认 False
         
     返回列向量 x 使得 Ax = b 
     返回None，如果 A，b 高度不同
     返回None，如果 A 为奇异矩阵
 """
-def gj_Solve(A, b, decPts=4, epsilon = 1.0e-16):
+def gj_Solve(A, b, decPts=4, epsilon = 1.0e-16, exact=False):
     try:
         rowA, colA = shape(A)
         rowb, colb = shape(b)
         if rowA != rowb:
-            print "A，b 高度不同"
+            print("A，b 高度不同")
             return None
         Ab = augmentMatrix(A, b)
+        if exact:
+            #精确计算的化简行阶梯形，主元不足A的列数即为奇异矩阵
+            rref, pivot_columns = fraction_free_rref(Ab)
+            if pivot_columns != list(range(colA)):
+                raise Exception(SINGULAR_MATRIX_MSG)
+            return [[round(float(rref[i][colA]), decPts)] for i in range(rowA)]
         simplify_matrix(Ab, epsilon)
         #步骤4 返回Ab的最后一列
         C = [[0] for m in range(rowA)]
@@ -489,7 +493,7 @@ def gj_Solve(A, b, decPts=4, epsilon = 1.0e-16):
         return C
     except Exception as e:
         if str(e) == SINGULAR_MATRIX_MSG:
-            print "A 为奇异矩阵"
+            print("A 为奇异矩阵")
             return None
 
 
@@ -751,20 +755,23 @@ print(calculateMSE(X,Y,m1,b1))
 返回：m，b 浮点数
 '''
 def linearRegression(X,Y):
-    X1 = [[Decimal(1),Decimal(1)] for i in range(len(X))]
-    for i in range(len(X)):
-        X1[i][0] = Decimal(X[i])
-    Y = [[Decimal(Y[i])]for i in range(len(Y))]
+    #用float构造矩阵，matxMultiply才能使用matrix_backend的快速实现（Decimal只能逐个元素用Python计算）
+    X1 = [[float(x), 1.0] for x in X]
+    Y = [[float(y)] for y in Y]
 
     Xt = transpose(X1)
     
     XtX = matxMultiply(Xt, X1)
     XtY = matxMultiply(Xt, Y)
+    #gj_Solve用Decimal缩放行，需要Decimal的矩阵（由float转换是精确的）
+    XtX = [[Decimal(x) for x in row] for row in XtX]
+    XtY = [[Decimal(x) for x in row] for row in XtY]
     
     C = gj_Solve(XtX, XtY)
     m = C[0][0]
     b = C[1][0]
-    return m,b
+    #gj_Solve的结果在Python 3中是Decimal，转换为float
+    return float(m), float(b)
 
 m2,b2 = linearRegression(X,Y)
 assert isinstance(m2,float),"m is not a float"
@@ -0,0 +1,187 @@
+# -- coding: utf-8 --
+#二维列表矩阵运算的快速实现：函数名、参数和返回值（二维列表）与linear_regression_project中的同名函数相同，
+#可以直接替换：from matrix_backend import shape, matxRound, transpose, matxMultiply, augmentMatrix
+#
+#matxMultiply在元素都是int/float时：
+#   矩阵足够大且安装了NumPy，转换为连续的float64数组用NumPy（BLAS）相乘；
+#   否则用array('d')行缓冲区分块计算，没有NumPy的大矩阵再按行块分给多个进程。
+#Decimal等其他类型使用纯Python实现。
+#transpose/augmentMatrix/matxRound只是逐元素复制，转换为NumPy数组本身就要逐个读取元素，
+#不会更快，因此用zip和列表切片等内置操作实现。
+import multiprocessing
+from array import array
+from operator import mul
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    INTEGER_TYPES = (int, long)
+except NameError:
+    #Python 3
+    INTEGER_TYPES = (int,)
+
+#乘加次数（rowA*colA*colB）达到该值才使用NumPy，更小的矩阵转换数组的开销比计算本身还大
+NUMPY_MIN_OPERATIONS = 20000
+#float64能精确表示的最大整数
+MAX_EXACT_FLOAT_INTEGER = 2**53
+#array('d')实现中每次计算的列块大小，一个行块内反复使用同一块B的列
+BLOCK_SIZE = 64
+#没有NumPy时，乘加次数达到该值才使用多进程（启动进程和传输矩阵约需几十毫秒）
+PROCESS_MIN_OPERATIONS = 2000000
+#没有NumPy时matxMultiply使用的进程数
+WORKERS = multiprocessing.cpu_count()
+
+CANNOT_MULTIPLY_MSG = "Matrix A's column number doesn't equal to Matrix B's row number"
+
+
+#功能：返回矩阵的行数和列数
+def shape(M):
+    return len(M), len(M[0])
+
+
+#功能：每个元素四舍五入到特定小数数位，直接修改参数矩阵，无返回值
+#与NumPy的round（四舍六入五成双）结果不同，这里保持Python内置round的结果
+def matxRound(M, decPts=4):
+    for row in M:
+        row[:] = [round(x, decPts) for x in row]
+
+
+#功能：计算矩阵的转置
+def transpose(M):
+    return [list(column) for column in zip(*M)]
+
+
+#功能：构造增广矩阵，假设A，b行数相同，不修改A
+def augmentMatrix(A, b):
+    return [list(row) + [bi[0]] for row, bi in zip(A, b)]
+
+
+#功能：计算矩阵乘法AB，如果无法相乘则raise ValueError
+def matxMultiply(A, B):
+    rowA, colA = shape(A)
+    rowB, colB = shape(B)
+    if colA != rowB:
+        raise ValueError(CANNOT_MULTIPLY_MSG)
+
+    kind = multiply_kind(A, B)
+    if kind is None:
+        return python_multiply(A, B)
+
+    operations = rowA * colA * colB
+    if np is not None and operations >= NUMPY_MIN_OPERATIONS:
+        return numpy_multiply(A, B, kind)
+    if np is None and operations >= PROCESS_MIN_OPERATIONS:
+        return array_multiply(A, B, kind, workers=WORKERS)
+    return array_multiply(A, B, kind)
+
+
+#功能：纯Python矩阵乘法，适用于任意数值类型（int、float、Decimal、Fraction）
+def python_multiply(A, B):
+    tB = transpose(B)
+    return [[sum([a*b for a, b in zip(row, column)]) for column in tB] for row in A]
+
+
+#功能：用float64数组和BLAS计算矩阵乘法
+#参数：
+#   [in]kind multiply_kind的返回值，'int'时结果转换回int
+def numpy_multiply(A, B, kind):
+    a = np.array(A, dtype=np.float64, order='C')
+    b = np.array(B, dtype=np.float64, order='C')
+    C = np.dot(a, b)
+    if kind == 'int':
+        return C.astype(np.int64).tolist()
+    return C.tolist()
+
+
+#功能：不依赖NumPy的float64矩阵乘法
+#A的行和B的列转换为array('d')缓冲区，按BLOCK_SIZE列分块计算；
+#workers大于1时把A按行块分给多个进程，每个进程只接收一次B。
+#每一项的求和顺序与python_multiply相同，float结果完全一致。
+#参数：
+#   [in]kind multiply_kind的返回值，'int'时结果转换回int
+#   [in]workers 进程数
+#   [in]block_size 列块大小
+def array_multiply(A, B, kind='float', workers=1, block_size=BLOCK_SIZE):
+    rows = [array('d', row) for row in A]
+    columns = [array('d', column) for column in zip(*B)]
+
+    workers = min(workers, len(rows))
+    if workers <= 1:
+        C = multiply_rows(rows, columns, block_size)
+    else:
+        size = (len(rows) + workers - 1) // workers
+        blocks = [rows[i:i+size] for i in range(0, len(rows), size)]
+        pool = multiprocessing.Pool(len(blocks), initializer=_init_worker, initargs=(columns, block_size))
+        try:
+            C = [row for block in pool.map(_multiply_block, blocks) for row in block]
+        finally:
+            pool.close()
+            pool.join()
+
+    if kind == 'int':
+        return [[int(x) for x in row] for row in C]
+    return C
+
+
+#功能：计算rows（A的若干行）与columns（B的各列）的乘积
+def multiply_rows(rows, columns, block_size=BLOCK_SIZE):
+    C = [[0.0] * len(columns) for _ in rows]
+    for start in range(0, len(columns), block_size):
+        tile = columns[start:start+block_size]
+        end = start + len(tile)
+        for row, out in zip(rows, C):
+            out[start:end] = [sum(map(mul, row, column)) for column in tile]
+    return C
+
+
+#子进程中保存的B的各列
+_worker_columns = None
+_worker_block_size = BLOCK_SIZE
+
+
+def _init_worker(columns, block_size):
+    global _worker_columns, _worker_block_size
+    _worker_columns = columns
+    _worker_block_size = block_size
+
+
+def _multiply_block(rows):
+    return multiply_rows(rows, _worker_columns, _worker_block_size)
+
+
+#功能：判断能否用float64计算AB
+#返回值：
+#   'int' 全是整数，且每一项都不超过float64能精确表示的范围；
+#   'float' 只有float和整数；None 含有其他类型（如Decimal），或整数太大
+def multiply_kind(A, B):
+    kindA = element_kind(A)
+    kindB = element_kind(B)
+    if kindA is None or kindB is None:
+        return None
+    if kindA == 'int' and kindB == 'int':
+        #结果的每一项都不超过 colA * max|a| * max|b|
+        bound = max_abs(A) * max_abs(B) * len(B)
+        if bound >= MAX_EXACT_FLOAT_INTEGER:
+            return None
+        return 'int'
+    return 'float'
+
+
+def max_abs(M):
+    return max([max([abs(x) for x in row]) for row in M])
+
+
+#功能：判断矩阵元素的类型
+#返回值：
+#   'int' 全是整数；'float' 只有float和整数；None 含有其他类型（如Decimal）
+def element_kind(M):
+    types = set()
+    for row in M:
+        types.update(map(type, row))
+    if all([issubclass(t, INTEGER_TYPES) for t in types]):
+        return 'int'
+    if all([issubclass(t, INTEGER_TYPES + (float,)) for t in types]):
+        return 'float'
+    return None
@@ -0,0 +1,213 @@
+# -- coding: utf-8 --
+#回归误差指标：MSE、RMSE、MAE、R²，一次遍历同时计算。
+#
+#输入可以是NumPy数组、array('d')缓冲区或列表；有NumPy时每个数据块向量化计算，否则逐个累加。
+#也可以分块输入（score_chunks），只保存O(1)的统计量，不需要把全部Y放在内存中。
+#exact=True时用Decimal在高精度上下文中计算，作为核对浮点结果的参考值。
+#
+#用法：
+#   mean_squared_error(y_true, y_pred)
+#   r2_score(y_true, y_pred, exact=True)
+#   metrics = score_chunks((chunk_true, chunk_pred) for ...); metrics.rmse()
+from decimal import Decimal, localcontext
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+#exact模式的Decimal精度：float转换为Decimal是精确的（约50位有效数字），
+#平方和求和所需的位数远小于该值，因此结果不会被舍入
+EXACT_PRECISION = 400
+
+EMPTY_INPUT_MSG = 'No samples to score'
+LENGTH_MISMATCH_MSG = 'y_true and y_pred must have the same length'
+
+
+class RegressionMetrics(object):
+
+    #参数：
+    #   [in]exact True 用Decimal精确计算
+    def __init__(self, exact=False):
+        self.exact = exact
+        zero = Decimal(0) if exact else 0.0
+        #样本数
+        self.n = 0
+        #残差平方和、残差绝对值之和
+        self.sse = zero
+        self.sae = zero
+        #y_true的均值和离差平方和（R²的分母），分块合并时不会损失精度
+        self.mean = zero
+        self.sst = zero
+
+    #功能：加入一个数据块
+    #参数：
+    #   [in]y_true, y_pred 等长的序列
+    #返回值：
+    #   self
+    def update(self, y_true, y_pred):
+        if self.exact:
+            chunk = self._exact_chunk(y_true, y_pred)
+        elif np is not None:
+            chunk = self._numpy_chunk(y_true, y_pred)
+        else:
+            chunk = self._python_chunk(y_true, y_pred)
+        return self.merge(chunk)
+
+    #功能：合并另一份统计量
+    def merge(self, other):
+        if other.n == 0:
+            return self
+        n = self.n + other.n
+        with localcontext() as context:
+            context.prec = EXACT_PRECISION
+            delta = other.mean - self.mean
+            self.sst += other.sst + delta * delta * self.n * other.n / n
+            self.mean += delta * other.n / n
+            self.sse += other.sse
+            self.sae += other.sae
+        self.n = n
+        return self
+
+    #exact模式在高精度上下文中计算，返回前按调用者的Decimal上下文舍入一次（一元+）
+    def mse(self):
+        self._check_not_empty()
+        with localcontext() as context:
+            context.prec = EXACT_PRECISION
+            mse = self.sse / self.n
+        return +mse
+
+    def rmse(self):
+        self._check_not_empty()
+        with localcontext() as context:
+            context.prec = EXACT_PRECISION
+            mse = self.sse / self.n
+            rmse = mse.sqrt() if self.exact else mse ** 0.5
+        return +rmse
+
+    def mae(self):
+        self._check_not_empty()
+        with localcontext() as context:
+            context.prec = EXACT_PRECISION
+            mae = self.sae / self.n
+        return +mae
+
+    #y_true全部相同时R²没有定义，与sklearn的r2_score一样：完全预测正确返回1，否则返回0
+    def r2(self):
+        self._check_not_empty()
+        one = Decimal(1) if self.exact else 1.0
+        if self.sst == 0:
+            return one if self.sse == 0 else 0 * one
+        with localcontext() as context:
+            context.prec = EXACT_PRECISION
+            r2 = one - self.sse / self.sst
+        return +r2
+
+    #功能：全部指标
+    def as_dict(self):
+        return {'mse': self.mse(), 'rmse': self.rmse(), 'mae': self.mae(), 'r2': self.r2()}
+
+    def _check_not_empty(self):
+        if self.n == 0:
+            raise ValueError(EMPTY_INPUT_MSG)
+
+    def _chunk(self, n, sse, sae, mean, sst):
+        chunk = RegressionMetrics(self.exact)
+        chunk.n, chunk.sse, chunk.sae, chunk.mean, chunk.sst = n, sse, sae, mean, sst
+        return chunk
+
+    def _numpy_chunk(self, y_true, y_pred):
+        y_true = np.asarray(y_true, dtype=np.float64).ravel()
+        y_pred = np.asarray(y_pred, dtype=np.float64).ravel()
+        if y_true.shape != y_pred.shape:
+            raise ValueError(LENGTH_MISMATCH_MSG)
+        n = len(y_true)
+        if n == 0:
+            return self._chunk(0, 0.0, 0.0, 0.0, 0.0)
+        residual = y_true - y_pred
+        mean = y_true.mean()
+        centered = y_true - mean
+        return self._chunk(n, float(residual.dot(residual)), float(np.abs(residual).sum()),
+                           float(mean), float(centered.dot(centered)))
+
+    def _python_chunk(self, y_true, y_pred):
+        y_true = [float(y) for y in y_true]
+        y_pred = [float(y) for y in y_pred]
+        if len(y_true) != len(y_pred):
+            raise ValueError(LENGTH_MISMATCH_MSG)
+        n = len(y_true)
+        if n == 0:
+            return self._chunk(0, 0.0, 0.0, 0.0, 0.0)
+        residuals = [a - b for a, b in zip(y_true, y_pred)]
+        mean = sum(y_true) / n
+        return self._chunk(n, sum([r * r for r in residuals]), sum([abs(r) for r in residuals]),
+                           mean, sum([(y - mean) ** 2 for y in y_true]))
+
+    def _exact_chunk(self, y_true, y_pred):
+        y_true = [to_decimal(y) for y in y_true]
+        y_pred = [to_decimal(y) for y in y_pred]
+        if len(y_true) != len(y_pred):
+            raise ValueError(LENGTH_MISMATCH_MSG)
+        n = len(y_true)
+        if n == 0:
+            return self._chunk(0, Decimal(0), Decimal(0), Decimal(0), Decimal(0))
+        with localcontext() as context:
+            context.prec = EXACT_PRECISION
+            residuals = [a - b for a, b in zip(y_true, y_pred)]
+            mean = sum(y_true) / n
+            return self._chunk(n, sum([r * r for r in residuals]), sum([abs(r) for r in residuals]),
+                               mean, sum([(y - mean) ** 2 for y in y_true]))
+
+
+#功能：精确地转换为Decimal，Decimal保持不变，其他数值先转换为float（Decimal(float)是精确转换）
+def to_decimal(x):
+    if isinstance(x, Decimal):
+        return x
+    return Decimal(float(x))
+
+
+#功能：对分块输入计算误差指标
+#参数：
+#   [in]chunks (y_true块, y_pred块)的可迭代对象，可以是生成器
+#   [in]exact True 用Decimal精确计算
+#返回值：
+#   RegressionMetrics
+def score_chunks(chunks, exact=False):
+    metrics = RegressionMetrics(exact)
+    for y_true, y_pred in chunks:
+        metrics.update(y_true, y_pred)
+    return metrics
+
+
+def mean_squared_error(y_true, y_pred, exact=False):
+    return RegressionMetrics(exact).update(y_true, y_pred).mse()
+
+
+def root_mean_squared_error(y_true, y_pred, exact=False):
+    return RegressionMetrics(exact).update(y_true, y_pred).rmse()
+
+
+def mean_absolute_error(y_true, y_pred, exact=False):
+    return RegressionMetrics(exact).update(y_true, y_pred).mae()
+
+
+def r2_score(y_true, y_pred, exact=False):
+    return RegressionMetrics(exact).update(y_true, y_pred).r2()
+
+
+#功能：直线y = mx + b在数据(X, Y)上的平均平方误差，与linear_regression_project中的calculateMSE相同
+#返回值：
+#   float；exact=True时返回Decimal
+def calculateMSE(X, Y, m, b, exact=False):
+    if exact:
+        m = Decimal(float(m))
+        b = Decimal(float(b))
+        with localcontext() as context:
+            context.prec = EXACT_PRECISION
+            y_pred = [m * Decimal(float(x)) + b for x in X]
+        return RegressionMetrics(True).update(Y, y_pred).mse()
+    if np is not None:
+        y_pred = float(m) * np.asarray(X, dtype=np.float64) + float(b)
+    else:
+        y_pred = [float(m) * float(x) + float(b) for x in X]
+    return mean_squared_error(Y, y_pred)
@@ -0,0 +1,220 @@
+# -- coding: utf-8 --
+#多元线性回归 y = Xw + b：X为n×k的设计矩阵（二维列表），可选截距项b。
+#
+#求解器：
+#   'cholesky' 对XᵀX做Cholesky分解求正规方程，计算量O(nk²+k³)，k较小时最快；
+#   'qr'       对X做Householder QR分解，不需要构造XᵀX，条件数只有正规方程的平方根，适合病态问题；
+#   'auto'     （默认）先用Cholesky，XᵀX不正定或估计的条件数超过MAX_CHOLESKY_CONDITION时改用QR。
+#XᵀX用matrix_backend.matxMultiply计算，有NumPy时使用BLAS。
+#
+#用法：
+#   model = MultivariateLinearRegression().fit(X, y)
+#   model.coefficients, model.intercept
+#   model.predict(X_new)
+#   m, b = linearRegression(X, Y)                 #X为一维列表时与原来的linearRegression相同
+from math import sqrt
+
+from matrix_backend import transpose, matxMultiply
+
+CHOLESKY_SOLVER = 'cholesky'
+QR_SOLVER = 'qr'
+AUTO_SOLVER = 'auto'
+SOLVERS = (CHOLESKY_SOLVER, QR_SOLVER, AUTO_SOLVER)
+
+#Cholesky估计的XᵀX条件数超过该值时，auto改用QR
+MAX_CHOLESKY_CONDITION = 1e10
+
+SINGULAR_MATRIX_MSG = 'this is a singular matrix'
+NOT_POSITIVE_DEFINITE_MSG = 'The matrix is not positive definite'
+UNKNOWN_SOLVER_MSG = 'Unknown solver: {}'
+NOT_FITTED_MSG = 'The model has not been fitted'
+SHAPE_MISMATCH_MSG = 'X and y must have the same number of rows'
+
+
+#功能：构造设计矩阵（float的二维列表）
+#参数：
+#   [in]X 二维列表（n×k）或一维列表（视为k=1），也可以是NumPy数组或pandas.DataFrame/Series
+#   [in]intercept True 在最后加一列1
+def design_matrix(X, intercept=True):
+    rows = []
+    for row in as_rows(X):
+        if is_row(row):
+            row = [float(x) for x in row]
+        else:
+            row = [float(row)]
+        if intercept:
+            row.append(1.0)
+        rows.append(row)
+    return rows
+
+
+#功能：pandas的DataFrame/Series取出其NumPy数组（按行迭代），其他类型原样返回
+def as_rows(X):
+    return getattr(X, 'values', X)
+
+
+#功能：X的一个元素是否为一行（列表、元组、NumPy数组的行），而不是一个数值
+def is_row(row):
+    return hasattr(row, '__len__')
+
+
+#功能：Cholesky分解 A = LLᵀ
+#返回值：
+#   下三角矩阵L（二维列表）；A不正定时raise Exception(NOT_POSITIVE_DEFINITE_MSG)
+def cholesky(A):
+    n = len(A)
+    L = [[0.0] * n for _ in range(n)]
+    for j in range(n):
+        Lj = L[j]
+        d = A[j][j] - sum([x * x for x in Lj[:j]])
+        if d <= 0:
+            raise Exception(NOT_POSITIVE_DEFINITE_MSG)
+        Lj[j] = sqrt(d)
+        for i in range(j + 1, n):
+            Li = L[i]
+            Li[j] = (A[i][j] - sum([a * b for a, b in zip(Li[:j], Lj[:j])])) / Lj[j]
+    return L
+
+
+#功能：由Cholesky分解求解 LLᵀx = b（先前代再回代）
+def cholesky_solve(L, b):
+    n = len(L)
+    z = [0.0] * n
+    for i in range(n):
+        z[i] = (b[i] - sum([L[i][k] * z[k] for k in range(i)])) / L[i][i]
+    x = [0.0] * n
+    for i in range(n - 1, -1, -1):
+        x[i] = (z[i] - sum([L[k][i] * x[k] for k in range(i + 1, n)])) / L[i][i]
+    return x
+
+
+#功能：用Householder QR求最小二乘解 min |Ax - y|
+#参数：
+#   [in]A 设计矩阵（n×k，n >= k），不会被修改
+#   [in]y 长度为n的列表
+#   [in]epsilon 判断R的对角元是否为0的相对阈值
+#返回值：
+#   长度为k的列表；A列不满秩时raise Exception(SINGULAR_MATRIX_MSG)
+def householder_lstsq(A, y, epsilon=1e-12):
+    n = len(A)
+    k = len(A[0])
+    if n < k:
+        raise Exception(SINGULAR_MATRIX_MSG)
+    #按列保存，每次反射只修改剩余的列
+    columns = [list(column) for column in transpose(A)]
+    y = [float(v) for v in y]
+    scale = max([sqrt(sum([x * x for x in column])) for column in columns])
+
+    for j in range(k):
+        column = columns[j]
+        norm = sqrt(sum([x * x for x in column[j:]]))
+        if norm <= epsilon * scale:
+            raise Exception(SINGULAR_MATRIX_MSG)
+        #v = x - alpha*e1，alpha与x[0]异号以避免相减抵消
+        alpha = -norm if column[j] > 0 else norm
+        v = column[j:]
+        v[0] -= alpha
+        vv = sum([x * x for x in v])
+        #对剩余的列和y做反射 H = I - 2vvᵀ/(vᵀv)
+        for target in columns[j + 1:] + [y]:
+            f = 2 * sum([a * b for a, b in zip(v, target[j:])]) / vv
+            for i in range(j, n):
+                target[i] -= f * v[i - j]
+        column[j] = alpha
+        for i in range(j + 1, n):
+            column[i] = 0.0
+
+    #回代求解 Rx = (Qᵀy)[:k]，R[i][j] = columns[j][i]
+    x = [0.0] * k
+    for i in range(k - 1, -1, -1):
+        x[i] = (y[i] - sum([columns[j][i] * x[j] for j in range(i + 1, k)])) / columns[i][i]
+    return x
+
+
+#功能：求解正规方程 XᵀXw = Xᵀy
+#参数：
+#   [in]A 设计矩阵
+#   [in]y 长度为n的列表
+#   [in]solver SOLVERS之一
+#返回值：
+#   (w, 实际使用的求解器)
+def least_squares(A, y, solver=AUTO_SOLVER):
+    if solver not in SOLVERS:
+        raise ValueError(UNKNOWN_SOLVER_MSG.format(solver))
+    if len(A) != len(y):
+        raise ValueError(SHAPE_MISMATCH_MSG)
+    if solver == QR_SOLVER:
+        return householder_lstsq(A, y), QR_SOLVER
+
+    At = transpose(A)
+    AtA = matxMultiply(At, A)
+    Aty = [row[0] for row in matxMultiply(At, [[float(v)] for v in y])]
+    try:
+        L = cholesky(AtA)
+    except Exception as e:
+        if solver == AUTO_SOLVER and str(e) == NOT_POSITIVE_DEFINITE_MSG:
+            return householder_lstsq(A, y), QR_SOLVER
+        raise e
+
+    if solver == AUTO_SOLVER:
+        #cond(XᵀX) >= (max L_ii / min L_ii)²
+        diagonal = [abs(L[i][i]) for i in range(len(L))]
+        if (max(diagonal) / min(diagonal)) ** 2 > MAX_CHOLESKY_CONDITION:
+            return householder_lstsq(A, y), QR_SOLVER
+    return cholesky_solve(L, Aty), CHOLESKY_SOLVER
+
+
+class MultivariateLinearRegression(object):
+
+    #参数：
+    #   [in]intercept True 拟合截距项
+    #   [in]solver SOLVERS之一
+    def __init__(self, intercept=True, solver=AUTO_SOLVER):
+        if solver not in SOLVERS:
+            raise ValueError(UNKNOWN_SOLVER_MSG.format(solver))
+        self.intercept_enabled = intercept
+        self.solver = solver
+        #拟合结果：各特征的系数、截距项、实际使用的求解器
+        self.coefficients = None
+        self.intercept = 0.0
+        self.solver_used = None
+
+    #功能：拟合
+    #参数：
+    #   [in]X n×k二维列表或长度为n的一维列表（或对应的NumPy数组、pandas对象）
+    #   [in]y 长度为n的列表
+    #返回值：
+    #   self
+    def fit(self, X, y):
+        A = design_matrix(X, self.intercept_enabled)
+        w, self.solver_used = least_squares(A, y, self.solver)
+        if self.intercept_enabled:
+            self.coefficients, self.intercept = w[:-1], w[-1]
+        else:
+            self.coefficients, self.intercept = w, 0.0
+        return self
+
+    #功能：批量预测
+    #参数：
+    #   [in]X m×k二维列表或长度为m的一维列表（或对应的NumPy数组、pandas对象）
+    #返回值：
+    #   长度为m的float列表
+    def predict(self, X):
+        if self.coefficients is None:
+            raise Exception(NOT_FITTED_MSG)
+        w = self.coefficients
+        b = self.intercept
+        return [sum([a * c for a, c in zip(row, w)]) + b for row in design_matrix(X, False)]
+
+
+'''
+参数：X 一维列表（一元回归）或n×k二维列表（也可以是NumPy数组），Y 一维列表
+返回：X为一维列表时返回m，b 浮点数；否则返回（系数列表，截距）
+'''
+def linearRegression(X, Y, intercept=True, solver=AUTO_SOLVER):
+    X = as_rows(X)
+    model = MultivariateLinearRegression(intercept, solver).fit(X, Y)
+    #NumPy数组不能直接用作条件判断，用len判断是否为空
+    if len(X) and not is_row(X[0]):
+        return model.coefficients[0], model.intercept
+    return model.coefficients, model.intercept
@@ -0,0 +1,99 @@
+# -- coding: utf-8 --
+#流式一元线性回归 y = mx + b：逐个读取(x, y)，只保存充分统计量，内存占用O(1)，
+#可以拟合比内存大得多的文件，也可以分块拟合后合并。
+#
+#统计量用样本数、均值和离差积和（Welford算法）保存，而不是直接累加Σx、Σx²、Σxy：
+#两者等价，但数据量很大或x远离0时，直接累加后相减会损失有效数字。
+#
+#用法：
+#   m, b = linearRegression(X, Y)                          #与linear_regression_project中的同名函数相同
+#   m, b = fit_pairs(zip(X, Y))                            #任意(x, y)可迭代对象
+#   m, b = fit_csv('data.csv', 'x', 'y')                   #逐行读取CSV文件
+#   model = OnlineLinearRegression(); model.update_chunk(chunk['x'], chunk['y']); model.fit()
+import csv
+
+SINGULAR_MATRIX_MSG = 'this is a singular matrix'
+
+
+class OnlineLinearRegression(object):
+
+    def __init__(self):
+        #样本数
+        self.n = 0
+        #x、y的均值
+        self.mean_x = 0.0
+        self.mean_y = 0.0
+        #Σ(x-mean_x)²、Σ(x-mean_x)(y-mean_y)
+        self.sxx = 0.0
+        self.sxy = 0.0
+
+    #功能：加入一个样本点
+    def update(self, x, y):
+        x = float(x)
+        y = float(y)
+        self.n += 1
+        dx = x - self.mean_x
+        self.mean_x += dx / self.n
+        self.mean_y += (y - self.mean_y) / self.n
+        #dx用更新前的均值，(y - mean_y)用更新后的均值，乘积即离差积和的增量
+        self.sxx += dx * (x - self.mean_x)
+        self.sxy += dx * (y - self.mean_y)
+
+    #功能：加入(x, y)可迭代对象中的所有样本点
+    def update_many(self, pairs):
+        for x, y in pairs:
+            self.update(x, y)
+        return self
+
+    #功能：加入一个数据块，xs、ys为等长的序列（如pandas.read_csv(chunksize=...)每块的两列）
+    def update_chunk(self, xs, ys):
+        chunk = OnlineLinearRegression().update_many(zip(xs, ys))
+        return self.merge(chunk)
+
+    #功能：合并另一份统计量（如另一个数据块或另一个进程的结果），合并后相当于拟合了两份数据
+    def merge(self, other):
+        n = self.n + other.n
+        if other.n == 0:
+            return self
+        dx = other.mean_x - self.mean_x
+        dy = other.mean_y - self.mean_y
+        weight = float(self.n) * other.n / n
+        self.sxx += other.sxx + dx * dx * weight
+        self.sxy += other.sxy + dx * dy * weight
+        self.mean_x += dx * other.n / n
+        self.mean_y += dy * other.n / n
+        self.n = n
+        return self
+
+    #功能：由充分统计量求最小二乘解
+    #返回值：
+    #   m，b 浮点数；样本点少于2个或x全部相同时raise Exception(SINGULAR_MATRIX_MSG)
+    def fit(self):
+        if self.n < 2 or self.sxx == 0:
+            raise Exception(SINGULAR_MATRIX_MSG)
+        m = self.sxy / self.sxx
+        b = self.mean_y - m * self.mean_x
+        return m, b
+
+
+#功能：拟合(x, y)可迭代对象（可以是生成器，只遍历一次）
+def fit_pairs(pairs):
+    return OnlineLinearRegression().update_many(pairs).fit()
+
+
+#功能：逐行读取CSV文件中的两列并拟合，不把文件读入内存
+#参数：
+#   [in]path CSV文件路径，第一行为列名
+#   [in]x_column, y_column 列名
+def fit_csv(path, x_column, y_column):
+    with open(path) as f:
+        reader = csv.DictReader(f)
+        return fit_pairs((row[x_column], row[y_column]) for row in reader)
+
+
+'''
+参数：X, Y 存储着一一对应的横坐标与纵坐标的两个一维数组
+返回：m，b 浮点数
+'''
+def linearRegression(X, Y):
+    return fit_pairs(zip(X, Y))
@@ -0,0 +1,158 @@
+# -- coding: utf-8 --
+#linear_regression_project中函数的检查（与NumPy的结果比较）
+#linear_regression_project.py是notebook导出的脚本，含有绘图和get_ipython()，不能直接import，
+#这里只执行其中的函数定义、import、sys.path.append和大写的常量。
+#用法：python -m pytest test_linear_regression_project.py 或 python test_linear_regression_project.py
+import ast
+import io
+import os
+import sys
+import tempfile
+import unittest
+from decimal import getcontext
+from fractions import Fraction
+
+import numpy as np
+
+import matrix_backend
+
+PROJECT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'linear_regression_project.py')
+#依赖NumPy生成题目或绘图的模块，函数定义用不到
+SKIPPED_MODULES = ('helper', 'matplotlib')
+
+
+#功能：执行linear_regression_project.py中的函数定义、import、sys.path.append和大写常量，按在文件中的顺序（后面的定义覆盖前面的）
+#返回值：
+#   名字空间dict
+def load_project():
+    with io.open(PROJECT_PATH, 'rb') as f:
+        tree = ast.parse(f.read(), PROJECT_PATH)
+    body = []
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef):
+            body.append(node)
+        elif isinstance(node, ast.Import):
+            if not any([alias.name.split('.')[0] in SKIPPED_MODULES for alias in node.names]):
+                body.append(node)
+        elif isinstance(node, ast.ImportFrom):
+            if node.module.split('.')[0] not in SKIPPED_MODULES:
+                body.append(node)
+        elif isinstance(node, ast.Expr) and isinstance(node.value, ast.Call) and \
+                isinstance(node.value.func, ast.Attribute) and node.value.func.attr == 'append' and \
+                isinstance(node.value.func.value, ast.Attribute) and node.value.func.value.attr == 'path':
+            #sys.path.append(...)
+            body.append(node)
+        elif isinstance(node, ast.Assign) and all([isinstance(target, ast.Name) and target.id.isupper()
+                                                   and len(target.id) > 1 for target in node.targets]):
+            body.append(node)
+    tree.body = body
+    #脚本按__file__所在目录查找其他目录的模块（如24_hyperplane），与当前工作目录无关
+    namespace = {'__name__': 'linear_regression_project', '__file__': PROJECT_PATH}
+    exec(compile(tree, PROJECT_PATH, 'exec'), namespace)
+    return namespace
+
+
+class MatxMultiplyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.project = load_project()
+        self.calls = []
+        self.numpy_multiply = matrix_backend.numpy_multiply
+        self.array_multiply = matrix_backend.array_multiply
+
+        def numpy_multiply(*args, **kwargs):
+            self.calls.append('numpy')
+            return self.numpy_multiply(*args, **kwargs)
+
+        def array_multiply(*args, **kwargs):
+            self.calls.append('array')
+            return self.array_multiply(*args, **kwargs)
+
+        matrix_backend.numpy_multiply = numpy_multiply
+        matrix_backend.array_multiply = array_multiply
+
+    def tearDown(self):
+        matrix_backend.numpy_multiply = self.numpy_multiply
+        matrix_backend.array_multiply = self.array_multiply
+
+    def test_delegates_to_backend(self):
+        rng = np.random.RandomState(0)
+        matxMultiply = self.project['matxMultiply']
+        for r, d, c in ((3, 4, 5), (40, 30, 50)):
+            A = rng.randint(-10, 10, size=(r, d))
+            B = rng.randint(-5, 5, size=(d, c))
+            C = matxMultiply(A.tolist(), B.tolist())
+            self.assertTrue(isinstance(C, list) and all([isinstance(row, list) for row in C]))
+            self.assertTrue((np.array(C) == np.dot(A, B)).all())
+        #小矩阵用array('d')，大矩阵用NumPy
+        self.assertEqual(self.calls, ['array', 'numpy'])
+        self.assertRaises(ValueError, matxMultiply, [[1, 2]], [[1, 2]])
+
+    def test_linear_regression(self):
+        rng = np.random.RandomState(1)
+        X = rng.uniform(-10, 10, size=100)
+        Y = 3.2 * X + 7.1 + rng.normal(size=100)
+        m, b = self.project['linearRegression'](X.tolist(), Y.tolist())
+        expected_m, expected_b = np.polyfit(X, Y, 1)
+        #gj_Solve的结果保留4位小数
+        self.assertAlmostEqual(m, expected_m, places=4)
+        self.assertAlmostEqual(b, expected_b, places=4)
+        self.assertTrue(isinstance(m, float) and isinstance(b, float))
+        #X^T X和X^T Y都经过matrix_backend
+        self.assertEqual(len(self.calls), 2)
+
+
+class LoadProjectTestCase(unittest.TestCase):
+
+    def test_independent_of_cwd_and_decimal_context(self):
+        #在其他目录中重新导入24_hyperplane的模块：按__file__找到模块，且导入不修改全局Decimal精度
+        names = ('linsys', 'plane', 'vector', 'instrument')
+        saved = dict([(name, sys.modules.pop(name)) for name in names if name in sys.modules])
+        saved_path = list(sys.path)
+        cwd = os.getcwd()
+        prec = getcontext().prec
+        os.chdir(tempfile.gettempdir())
+        try:
+            project = load_project()
+            self.assertEqual(getcontext().prec, prec)
+            self.assertEqual(project['gj_Solve']([[2, 1], [1, 3]], [[3], [5]], exact=True), [[0.8], [1.4]])
+        finally:
+            os.chdir(cwd)
+            sys.path[:] = saved_path
+            sys.modules.update(saved)
+
+
+class GjSolveTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.gj_Solve = load_project()['gj_Solve']
+
+    def test_matches_numpy(self):
+        rng = np.random.RandomState(2)
+        for exact in (False, True):
+            for n in (1, 3, 6):
+                A = rng.randint(-10, 10, size=(n, n))
+                while abs(np.linalg.det(A)) < 1:
+                    A = rng.randint(-10, 10, size=(n, n))
+                b = rng.randint(-10, 10, size=(n, 1))
+                x = self.gj_Solve(A.tolist(), b.tolist(), exact=exact)
+                np.testing.assert_allclose(np.array(x, dtype=float), np.linalg.solve(A, b), atol=1e-4)
+
+    def test_exact(self):
+        #希尔伯特矩阵：精确解为整数，float消元有明显误差
+        n = 8
+        A = [[1.0 / (i + j + 1) for j in range(n)] for i in range(n)]
+        expected = [1, -2, 3, -4, 5, -6, 7, -8]
+        b = [[sum([a * x for a, x in zip(row, expected)])] for row in A]
+        x = self.gj_Solve(A, b, exact=True)
+        #b由float计算，包含舍入误差；精确求解的是这个方程组，与整数解的差别在4位小数以内
+        self.assertEqual([row[0] for row in x], expected)
+        #奇异矩阵返回None
+        self.assertIsNone(self.gj_Solve([[1, 2], [2, 4]], [[1], [2]], exact=True))
+        self.assertIsNone(self.gj_Solve([[1, 2], [2, 4]], [[1], [3]], exact=True))
+        self.assertEqual(self.gj_Solve([[Fraction(1, 3), 1], [1, 0]], [[1], [Fraction(1, 2)]], exact=True),
+                         [[0.5], [0.8333]])
+
+
+if __name__ == '__main__':
+    unittest.main()
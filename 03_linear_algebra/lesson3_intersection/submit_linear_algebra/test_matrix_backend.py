@@ -0,0 +1,96 @@
+# -- coding: utf-8 --
+#matrix_backend的检查：与纯Python实现、NumPy的结果比较，以及没有NumPy时linear_regression_project的matxMultiply
+#是否用到array('d')分块实现和多进程
+#用法：python -m pytest test_matrix_backend.py 或 python test_matrix_backend.py
+import random
+import unittest
+from decimal import Decimal
+from fractions import Fraction
+
+import matrix_backend
+from matrix_backend import array_multiply, augmentMatrix, matxMultiply, matxRound, python_multiply, transpose
+from test_linear_regression_project import load_project
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def random_matrix(rows, columns, seed, integer=False):
+    rng = random.Random(seed)
+    if integer:
+        return [[rng.randint(-10, 10) for _ in range(columns)] for _ in range(rows)]
+    return [[rng.uniform(-1, 1) for _ in range(columns)] for _ in range(rows)]
+
+
+class MatrixBackendTestCase(unittest.TestCase):
+
+    def test_list_functions(self):
+        M = random_matrix(3, 4, 0)
+        self.assertEqual(transpose(M), [[row[j] for row in M] for j in range(4)])
+        self.assertEqual(augmentMatrix([[1, 2], [3, 4]], [[5], [6]]), [[1, 2, 5], [3, 4, 6]])
+        rounded = [list(row) for row in M]
+        matxRound(rounded, 2)
+        self.assertEqual(rounded, [[round(x, 2) for x in row] for row in M])
+
+    def test_exact_types(self):
+        #int结果仍是int；Decimal、Fraction和超过float64精度的整数用纯Python计算
+        A = random_matrix(5, 6, 1, integer=True)
+        B = random_matrix(6, 4, 2, integer=True)
+        C = matxMultiply(A, B)
+        self.assertEqual(C, python_multiply(A, B))
+        self.assertTrue(all([isinstance(x, int) for row in C for x in row]))
+        for convert in (Decimal, Fraction, lambda x: x * 2 ** 60):
+            A2 = [[convert(x) for x in row] for row in A]
+            self.assertEqual(matxMultiply(A2, B), python_multiply(A2, B))
+        self.assertRaises(ValueError, matxMultiply, A, A)
+
+    def test_array_multiply_is_exact(self):
+        #求和顺序与python_multiply相同，float结果完全一致；分块和多进程不改变结果
+        A = random_matrix(23, 70, 3)
+        B = random_matrix(70, 31, 4)
+        expected = python_multiply(A, B)
+        self.assertEqual(array_multiply(A, B), expected)
+        self.assertEqual(array_multiply(A, B, block_size=5), expected)
+        self.assertEqual(array_multiply(A, B, workers=2, block_size=7), expected)
+
+    @unittest.skipIf(np is None, 'NumPy is not installed')
+    def test_numpy_multiply(self):
+        A = random_matrix(40, 50, 5)
+        B = random_matrix(50, 60, 6)
+        np.testing.assert_allclose(matxMultiply(A, B), np.dot(A, B), rtol=1e-12, atol=1e-12)
+
+
+class WithoutNumpyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.saved = (matrix_backend.np, matrix_backend.PROCESS_MIN_OPERATIONS, matrix_backend.WORKERS,
+                      matrix_backend.array_multiply)
+        self.workers = []
+
+        def array_multiply(A, B, kind='float', workers=1, block_size=matrix_backend.BLOCK_SIZE):
+            self.workers.append(workers)
+            return self.saved[3](A, B, kind, workers, block_size)
+
+        matrix_backend.np = None
+        matrix_backend.PROCESS_MIN_OPERATIONS = 10000
+        matrix_backend.WORKERS = 2
+        matrix_backend.array_multiply = array_multiply
+
+    def tearDown(self):
+        (matrix_backend.np, matrix_backend.PROCESS_MIN_OPERATIONS, matrix_backend.WORKERS,
+         matrix_backend.array_multiply) = self.saved
+
+    def test_project_matxMultiply(self):
+        project_multiply = load_project()['matxMultiply']
+        small = random_matrix(4, 5, 7), random_matrix(5, 6, 8)
+        large = random_matrix(30, 30, 9), random_matrix(30, 30, 10)
+        for A, B in (small, large):
+            self.assertEqual(project_multiply(A, B), python_multiply(A, B))
+        #小矩阵在当前进程中分块计算，大矩阵分给多个进程
+        self.assertEqual(self.workers, [1, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+# -- coding: utf-8 --
+#metrics的检查：与sklearn.metrics（没有sklearn时与NumPy）的结果比较，分块、纯Python和exact模式与一次计算相同
+#用法：python -m pytest test_metrics.py 或 python test_metrics.py
+import unittest
+from array import array
+from decimal import Decimal
+
+import numpy as np
+
+import metrics
+from metrics import (RegressionMetrics, calculateMSE, mean_absolute_error, mean_squared_error, r2_score,
+                     root_mean_squared_error, score_chunks)
+
+try:
+    import sklearn.metrics
+except ImportError:
+    sklearn = None
+
+
+def make_data(n=1000, offset=0.0, random_state=0):
+    rng = np.random.RandomState(random_state)
+    y_true = offset + rng.normal(size=n)
+    y_pred = y_true + 0.3 * rng.normal(size=n)
+    return y_true, y_pred
+
+
+#功能：参考值，有sklearn时用sklearn.metrics
+def reference(y_true, y_pred):
+    if sklearn is not None:
+        mse = sklearn.metrics.mean_squared_error(y_true, y_pred)
+        return {'mse': mse, 'rmse': np.sqrt(mse), 'mae': sklearn.metrics.mean_absolute_error(y_true, y_pred),
+                'r2': sklearn.metrics.r2_score(y_true, y_pred)}
+    residual = y_true - y_pred
+    return {'mse': np.mean(residual ** 2), 'rmse': np.sqrt(np.mean(residual ** 2)),
+            'mae': np.mean(np.abs(residual)),
+            'r2': 1 - residual.dot(residual) / np.sum((y_true - y_true.mean()) ** 2)}
+
+
+class MetricsTestCase(unittest.TestCase):
+
+    def assert_matches(self, result, expected, rtol=1e-12):
+        for name, value in expected.items():
+            self.assertAlmostEqual(float(result[name]) / value, 1.0, delta=rtol)
+
+    def test_matches_reference(self):
+        y_true, y_pred = make_data()
+        expected = reference(y_true, y_pred)
+        self.assertAlmostEqual(mean_squared_error(y_true, y_pred), expected['mse'], places=12)
+        self.assertAlmostEqual(root_mean_squared_error(y_true, y_pred), expected['rmse'], places=12)
+        self.assertAlmostEqual(mean_absolute_error(y_true, y_pred), expected['mae'], places=12)
+        self.assertAlmostEqual(r2_score(y_true, y_pred), expected['r2'], places=12)
+        for inputs in ((y_true.tolist(), y_pred.tolist()), (array('d', y_true), array('d', y_pred))):
+            self.assert_matches(RegressionMetrics().update(*inputs).as_dict(), expected)
+        exact = RegressionMetrics(exact=True).update(y_true, y_pred).as_dict()
+        self.assertTrue(all([isinstance(value, Decimal) for value in exact.values()]))
+        self.assert_matches(exact, expected)
+
+    def test_python_fallback(self):
+        y_true, y_pred = make_data(n=200)
+        numpy_module = metrics.np
+        metrics.np = None
+        try:
+            result = RegressionMetrics().update(y_true.tolist(), y_pred.tolist()).as_dict()
+        finally:
+            metrics.np = numpy_module
+        self.assert_matches(result, reference(y_true, y_pred))
+
+    def test_chunks_match_single_pass(self):
+        #exact模式在Python 2中较慢，样本少一些
+        y_true, y_pred = make_data(n=300, offset=1e6)
+        chunks = [(y_true[i:i + 37], y_pred[i:i + 37]) for i in range(0, len(y_true), 37)] + [([], [])]
+        expected = reference(y_true, y_pred)
+        self.assert_matches(score_chunks(iter(chunks)).as_dict(), expected, rtol=1e-9)
+        exact = score_chunks(iter(chunks), True).as_dict()
+        self.assert_matches(exact, expected, rtol=1e-9)
+        #exact模式分块与否结果完全相同
+        self.assertEqual(exact, RegressionMetrics(True).update(y_true, y_pred).as_dict())
+
+    def test_constant_target(self):
+        #与sklearn的r2_score相同：完全预测正确为1，否则为0
+        self.assertEqual(r2_score([2.0, 2.0], [2.0, 2.0]), 1.0)
+        self.assertEqual(r2_score([2.0, 2.0], [1.0, 2.0]), 0.0)
+        if sklearn is not None:
+            self.assertEqual(sklearn.metrics.r2_score([2.0, 2.0], [2.0, 2.0]), 1.0)
+            self.assertEqual(sklearn.metrics.r2_score([2.0, 2.0], [1.0, 2.0]), 0.0)
+
+    def test_calculate_mse(self):
+        rng = np.random.RandomState(1)
+        X = rng.uniform(-10, 10, size=100)
+        Y = 2 * X + 1 + rng.normal(size=100)
+        expected = np.mean((Y - (1.9 * X + 1.2)) ** 2)
+        self.assertAlmostEqual(calculateMSE(X, Y, 1.9, 1.2), expected, places=12)
+        self.assertAlmostEqual(float(calculateMSE(X.tolist(), Y.tolist(), 1.9, 1.2, exact=True)), expected, places=12)
+
+    def test_errors(self):
+        self.assertRaises(ValueError, mean_squared_error, [], [])
+        self.assertRaises(ValueError, mean_squared_error, [1.0, 2.0], [1.0])
+        self.assertRaises(ValueError, mean_squared_error, [1.0, 2.0], [1.0], True)
+
+
+if __name__ == '__main__':
+    unittest.main()
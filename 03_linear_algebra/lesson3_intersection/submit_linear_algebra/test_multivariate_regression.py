@@ -0,0 +1,82 @@
+# -- coding: utf-8 --
+#multivariate_regression的检查：与numpy.linalg的结果比较，输入可以是列表、NumPy数组或pandas对象
+#用法：python -m pytest test_multivariate_regression.py 或 python test_multivariate_regression.py
+import unittest
+
+import numpy as np
+
+from multivariate_regression import (AUTO_SOLVER, CHOLESKY_SOLVER, QR_SOLVER, MultivariateLinearRegression, cholesky,
+                                     design_matrix, householder_lstsq, linearRegression)
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+
+def make_data(n=200, k=3, random_state=0):
+    rng = np.random.RandomState(random_state)
+    X = rng.normal(size=(n, k))
+    y = X.dot(np.arange(1, k + 1)) + 0.5 + 0.1 * rng.normal(size=n)
+    return X, y
+
+
+def numpy_lstsq(X, y):
+    A = np.column_stack([X, np.ones(len(X))])
+    return np.linalg.lstsq(A, y, rcond=None)[0]
+
+
+class MultivariateRegressionTestCase(unittest.TestCase):
+
+    def test_solvers_match_numpy(self):
+        X, y = make_data()
+        expected = numpy_lstsq(X, y)
+        for solver in (CHOLESKY_SOLVER, QR_SOLVER, AUTO_SOLVER):
+            model = MultivariateLinearRegression(solver=solver).fit(X.tolist(), y.tolist())
+            np.testing.assert_allclose(model.coefficients + [model.intercept], expected, rtol=1e-10)
+            np.testing.assert_allclose(model.predict(X[:5].tolist()), np.dot(X[:5], expected[:-1]) + expected[-1],
+                                       rtol=1e-10)
+
+    def test_array_input(self):
+        X, y = make_data()
+        expected = numpy_lstsq(X, y)
+        coefficients, intercept = linearRegression(X, y)
+        np.testing.assert_allclose(coefficients + [intercept], expected, rtol=1e-10)
+        #一维数组为一元回归，返回m，b
+        m, b = linearRegression(X[:, 0], y)
+        np.testing.assert_allclose([m, b], np.polyfit(X[:, 0], y, 1), rtol=1e-10)
+        self.assertEqual(design_matrix(np.array([[1, 2]]), False), [[1.0, 2.0]])
+        self.assertEqual(design_matrix(np.array([1, 2])), [[1.0, 1.0], [2.0, 1.0]])
+
+    @unittest.skipIf(pd is None, 'pandas is not installed')
+    def test_pandas_input(self):
+        X, y = make_data()
+        frame = pd.DataFrame(X, columns=['a', 'b', 'c'])
+        coefficients, intercept = linearRegression(frame, pd.Series(y))
+        np.testing.assert_allclose(coefficients + [intercept], numpy_lstsq(X, y), rtol=1e-10)
+        m, b = linearRegression(frame['a'], pd.Series(y))
+        np.testing.assert_allclose([m, b], np.polyfit(X[:, 0], y, 1), rtol=1e-10)
+
+    def test_cholesky(self):
+        X, _ = make_data(k=5)
+        A = np.dot(X.T, X)
+        np.testing.assert_allclose(cholesky(A.tolist()), np.linalg.cholesky(A), rtol=1e-10, atol=1e-12)
+        self.assertRaises(Exception, cholesky, [[1.0, 2.0], [2.0, 1.0]])
+
+    def test_ill_conditioned(self):
+        #范德蒙德矩阵：XᵀX的条件数超过MAX_CHOLESKY_CONDITION，auto改用QR
+        x = np.linspace(0, 1, 50)
+        X = np.column_stack([x ** p for p in range(1, 10)])
+        y = np.sin(3 * x)
+        model = MultivariateLinearRegression().fit(X, y)
+        self.assertEqual(model.solver_used, QR_SOLVER)
+        np.testing.assert_allclose(model.coefficients + [model.intercept], numpy_lstsq(X, y), rtol=1e-6, atol=1e-6)
+
+    def test_rank_deficient(self):
+        A = [[1.0, 2.0], [2.0, 4.0], [3.0, 6.0]]
+        self.assertRaises(Exception, householder_lstsq, A, [1.0, 2.0, 3.0])
+        self.assertRaises(Exception, MultivariateLinearRegression(solver=CHOLESKY_SOLVER).fit, A, [1, 2, 3])
+
+
+if __name__ == '__main__':
+    unittest.main()
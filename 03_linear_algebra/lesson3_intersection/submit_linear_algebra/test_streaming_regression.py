@@ -0,0 +1,69 @@
+# -- coding: utf-8 --
+#streaming_regression的检查：与np.polyfit相同，分块合并（Welford合并）与一次拟合相同
+#用法：python -m pytest test_streaming_regression.py 或 python test_streaming_regression.py
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from streaming_regression import OnlineLinearRegression, fit_csv, fit_pairs, linearRegression
+
+
+def make_data(n=1000, offset=0.0, random_state=0):
+    rng = np.random.RandomState(random_state)
+    X = offset + rng.uniform(-10, 10, size=n)
+    Y = 3.2 * X + 7.1 + rng.normal(size=n)
+    return X, Y
+
+
+class StreamingRegressionTestCase(unittest.TestCase):
+
+    def test_matches_polyfit(self):
+        X, Y = make_data()
+        np.testing.assert_allclose(linearRegression(X.tolist(), Y.tolist()), np.polyfit(X, Y, 1), rtol=1e-12)
+        #生成器只遍历一次
+        np.testing.assert_allclose(fit_pairs((x, y) for x, y in zip(X, Y)), np.polyfit(X, Y, 1), rtol=1e-12)
+
+    def test_merge_matches_single_pass(self):
+        X, Y = make_data()
+        whole = OnlineLinearRegression().update_many(zip(X, Y))
+        merged = OnlineLinearRegression()
+        for start, stop in ((0, 1), (1, 300), (300, 300), (300, 999), (999, 1000)):
+            merged.update_chunk(X[start:stop], Y[start:stop])
+        self.assertEqual(merged.n, whole.n)
+        for name in ('mean_x', 'mean_y', 'sxx', 'sxy'):
+            self.assertAlmostEqual(getattr(merged, name) / getattr(whole, name), 1.0, places=12)
+        #离差平方和与NumPy相同
+        self.assertAlmostEqual(merged.sxx / (np.var(X) * len(X)), 1.0, places=12)
+        self.assertAlmostEqual(merged.sxy / (np.cov(X, Y, bias=True)[0, 1] * len(X)), 1.0, places=12)
+        #空的一方合并
+        self.assertEqual(OnlineLinearRegression().merge(whole).fit(), whole.fit())
+
+    def test_large_offset(self):
+        #x远离0时直接累加Σx²后相减会损失有效数字
+        X, Y = make_data(offset=1e8)
+        m, b = np.polyfit(X - 1e8, Y, 1)
+        np.testing.assert_allclose(linearRegression(X, Y), [m, b - m * 1e8], rtol=1e-6)
+
+    def test_fit_csv(self):
+        X, Y = make_data(n=200)
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'data.csv')
+            with open(path, 'w') as f:
+                f.write('x,y\n')
+                for x, y in zip(X, Y):
+                    f.write('{!r},{!r}\n'.format(float(x), float(y)))
+            np.testing.assert_allclose(fit_csv(path, 'x', 'y'), np.polyfit(X, Y, 1), rtol=1e-12)
+        finally:
+            shutil.rmtree(directory)
+
+    def test_singular(self):
+        self.assertRaises(Exception, linearRegression, [1.0], [2.0])
+        self.assertRaises(Exception, linearRegression, [1.0, 1.0, 1.0], [2.0, 3.0, 4.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,242 @@
+# -- coding: utf-8 --
+#一次扫描计算多个分组键的多个聚合量（代替对每个键分别groupby(...).Survived.mean()/value_counts()/count()）。
+#
+#每个分组列编码为整数（features.encode_groups），各个分组键的组编号加上各自的偏移后拼接起来，
+#每个聚合量只需要一次np.bincount就得到所有分组键的结果。
+#数据可以分块输入（update可以调用多次），组名在各块之间统一编号，只保存每组的计数和总和。
+#
+#聚合量：
+#   'count'                     每组的行数（分组列缺失的行不属于任何组）
+#   (列名, 'sum') / (列名, 'mean') 每组中该列的总和、均值（该列的缺失值不计入）
+#   (列名, 'value_counts')      每组中该列每个取值的行数，相当于groupby(键)[列名].value_counts().unstack()
+#
+#用法：
+#   tables = aggregate(titanic_df, ['Pclass', 'Sex', 'Age_group', 'With_relate', 'Embarked'],
+#                      ['count', ('Survived', 'mean'), ('Survived', 'value_counts')])
+#   tables['Pclass']['Survived_mean'].plot.bar()
+#   tables['Embarked'][['Survived_0', 'Survived_1']].plot.bar(stacked=True)
+#   aggregate(titanic_df, [('Pclass', 'Sex')], ['count'])      #多列组合的分组键，结果的索引为MultiIndex
+import numpy as np
+
+from features import encode_groups, pd
+
+COUNT = 'count'
+SUM = 'sum'
+MEAN = 'mean'
+VALUE_COUNTS = 'value_counts'
+
+UNKNOWN_AGGREGATE_MSG = 'Unknown aggregate: {}'
+EMPTY_KEYS_MSG = 'At least one grouping key is required'
+
+
+class GroupAggregator(object):
+
+    #参数：
+    #   [in]keys 分组键的列表，每个键为列名或列名的元组（多列组合）
+    #   [in]aggregates 聚合量的列表，见文件开头
+    def __init__(self, keys, aggregates=(COUNT,)):
+        if not keys:
+            raise ValueError(EMPTY_KEYS_MSG)
+        self.keys = list(keys)
+        self.aggregates = [_parse_aggregate(aggregate) for aggregate in aggregates]
+        self._key_columns = _unique([column for key in self.keys for column in _columns(key)])
+        self._sum_columns = _unique([column for column, function in self.aggregates if function in (SUM, MEAN)])
+        self._count_columns = _unique([column for column, function in self.aggregates if function == VALUE_COUNTS])
+        #每个分组列、value_counts列的组名，以及组名到编号的映射；编号按第一次出现的顺序
+        self._labels = dict((column, []) for column in self._key_columns + self._count_columns)
+        self._codes = dict((column, {}) for column in self._key_columns + self._count_columns)
+        self._categorical = set()
+        #每个分组键的累计量：'count'、(列名, 'sum')、(列名, 'n')、(列名, 'value_counts')
+        self._totals = dict((key, {}) for key in self.keys)
+
+    #功能：加入一块数据
+    #参数：
+    #   [in]data pandas.DataFrame或{列名: 数组}
+    #返回值：
+    #   self
+    def update(self, data):
+        codes = dict((column, self._encode(column, data[column])) for column in self._key_columns + self._count_columns)
+        values = {}
+        for column in self._sum_columns:
+            value = np.asarray(data[column], dtype=np.float64)
+            values[column] = (value, ~np.isnan(value))
+
+        #各分组键的组编号加上偏移后拼接：index为拼接后的组编号，rows为对应的行号
+        shapes = [tuple([len(self._labels[column]) for column in _columns(key)]) for key in self.keys]
+        sizes = [int(np.prod(shape)) for shape in shapes]
+        offsets = np.concatenate([[0], np.cumsum(sizes)])
+        index = []
+        rows = []
+        for key, shape, offset in zip(self.keys, shapes, offsets):
+            key_codes = [codes[column] for column in _columns(key)]
+            present = np.logical_and.reduce([code >= 0 for code in key_codes])
+            flat = np.ravel_multi_index([code[present] for code in key_codes], shape) if present.any() \
+                else np.zeros(0, dtype=np.intp)
+            index.append(flat + offset)
+            rows.append(np.flatnonzero(present))
+        index = np.concatenate(index)
+        rows = np.concatenate(rows)
+        total = int(offsets[-1])
+
+        chunk = {COUNT: np.bincount(index, minlength=total)}
+        for column in self._sum_columns:
+            value, valid = values[column]
+            valid = valid[rows]
+            chunk[column, SUM] = np.bincount(index[valid], weights=value[rows][valid], minlength=total)
+            chunk[column, 'n'] = np.bincount(index[valid], minlength=total)
+        for column in self._count_columns:
+            n_values = len(self._labels[column])
+            value_codes = codes[column][rows]
+            valid = value_codes >= 0
+            counts = np.bincount(index[valid] * n_values + value_codes[valid], minlength=total * n_values)
+            chunk[column, VALUE_COUNTS] = counts.reshape(total, n_values)
+
+        for key, shape, start, stop in zip(self.keys, shapes, offsets[:-1], offsets[1:]):
+            totals = self._totals[key]
+            for name, array in chunk.items():
+                part = array[start:stop].reshape(shape + array.shape[1:])
+                if name in totals:
+                    totals[name] = _grow(totals[name], part.shape) + part
+                else:
+                    totals[name] = part
+        return self
+
+    #功能：聚合结果
+    #返回值：
+    #   {分组键: 表}，有pandas时表为DataFrame（索引为组名，按组名排序），否则为{'index': 组名列表, 列名: 数组}；
+    #   表的列为'count'、'<列名>_sum'、'<列名>_mean'、'<列名>_<取值>'（value_counts）；
+    #   Categorical分组列保留所有类别（与groupby相同），其他分组列只保留有数据的组
+    def result(self):
+        tables = {}
+        for key in self.keys:
+            if not self._totals[key]:
+                #还没有输入数据
+                tables[key] = _table(key, [], [(COUNT, np.zeros(0, dtype=np.intp))])
+                continue
+            columns = _columns(key)
+            shape = tuple([len(self._labels[column]) for column in columns])
+            orders = [self._order(column) for column in columns]
+            totals = {}
+            for name, array in self._totals[key].items():
+                array = _grow(array, shape + array.shape[len(shape):])
+                totals[name] = array[np.ix_(*orders)].reshape((-1,) + array.shape[len(shape):])
+            counts = totals[COUNT]
+
+            labels = [[self._labels[column][i] for i in order] for column, order in zip(columns, orders)]
+            if len(columns) == 1:
+                index = labels[0]
+                keep = np.ones(len(index), dtype=bool) if columns[0] in self._categorical else counts > 0
+            else:
+                grid = np.indices(shape).reshape(len(shape), -1)
+                index = [tuple([labels[k][i] for k, i in enumerate(combination)]) for combination in grid.T]
+                keep = counts > 0
+            index = [label for label, kept in zip(index, keep) if kept]
+
+            table = [(COUNT, counts[keep])]
+            for column, function in self.aggregates:
+                if function == SUM:
+                    table.append(('{}_{}'.format(column, SUM), totals[column, SUM][keep]))
+                elif function == MEAN:
+                    with np.errstate(divide='ignore', invalid='ignore'):
+                        mean = totals[column, SUM][keep] / totals[column, 'n'][keep]
+                    table.append(('{}_{}'.format(column, MEAN), mean))
+                elif function == VALUE_COUNTS:
+                    order = self._order(column)
+                    counts_by_value = totals[column, VALUE_COUNTS][keep]
+                    for i in order:
+                        table.append(('{}_{}'.format(column, self._labels[column][i]), counts_by_value[:, i]))
+            tables[key] = _table(key, index, _unique_names(table))
+        return tables
+
+    #功能：把一列编码为全局编号，-1表示缺失
+    def _encode(self, column, values):
+        categorical = getattr(values, 'values', values)
+        if pd is not None and isinstance(categorical, pd.Categorical):
+            self._categorical.add(column)
+        chunk_labels, chunk_codes = encode_groups(values)
+        labels = self._labels[column]
+        codes = self._codes[column]
+        mapping = []
+        for label in chunk_labels:
+            if label not in codes:
+                codes[label] = len(labels)
+                labels.append(label)
+            mapping.append(codes[label])
+        #最后加一个-1，缺失值的编号-1仍然映射到-1
+        mapping = np.array(mapping + [-1], dtype=np.intp)
+        return mapping[chunk_codes]
+
+    #组名排序后的编号顺序；Categorical按类别的顺序
+    def _order(self, column):
+        labels = self._labels[column]
+        if column in self._categorical:
+            return np.arange(len(labels))
+        return np.array(sorted(range(len(labels)), key=labels.__getitem__), dtype=np.intp)
+
+
+#功能：一次扫描计算所有分组键的聚合量
+#参数：
+#   [in]data pandas.DataFrame、{列名: 数组}，或它们的可迭代对象（分块输入）
+#   [in]keys, aggregates 同GroupAggregator
+#返回值：
+#   同GroupAggregator.result
+def aggregate(data, keys, aggregates=(COUNT,)):
+    aggregator = GroupAggregator(keys, aggregates)
+    if isinstance(data, dict) or (pd is not None and isinstance(data, pd.DataFrame)):
+        data = [data]
+    for chunk in data:
+        aggregator.update(chunk)
+    return aggregator.result()
+
+
+def _parse_aggregate(aggregate):
+    if aggregate == COUNT:
+        return None, COUNT
+    if isinstance(aggregate, tuple) and len(aggregate) == 2 and aggregate[1] in (SUM, MEAN, VALUE_COUNTS):
+        return aggregate
+    raise ValueError(UNKNOWN_AGGREGATE_MSG.format(aggregate))
+
+
+def _columns(key):
+    return key if isinstance(key, tuple) else (key,)
+
+
+def _unique(items):
+    result = []
+    for item in items:
+        if item not in result:
+            result.append(item)
+    return result
+
+
+#同名的列只保留第一个（如重复给出的聚合量）
+def _unique_names(table):
+    names = set()
+    result = []
+    for name, column in table:
+        if name not in names:
+            names.add(name)
+            result.append((name, column))
+    return result
+
+
+#用0把数组补齐到shape（前面的块中没有出现过的组）
+def _grow(array, shape):
+    if array.shape == shape:
+        return array
+    grown = np.zeros(shape, dtype=array.dtype)
+    grown[tuple([slice(0, n) for n in array.shape])] = array
+    return grown
+
+
+def _table(key, index, table):
+    if pd is None:
+        result = {'index': index}
+        result.update(table)
+        return result
+    if isinstance(key, tuple):
+        index = pd.MultiIndex.from_tuples(index, names=list(key)) if index else \
+            pd.MultiIndex.from_arrays([[] for _ in key], names=list(key))
+    else:
+        index = pd.Index(index, name=key)
+    return pd.DataFrame(dict(table), index=index, columns=[name for name, _ in table])
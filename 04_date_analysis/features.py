@@ -0,0 +1,169 @@
+# -- coding: utf-8 --
+#泰坦尼克号数据的派生列和缺失值统计，全部为按列的向量化计算（不使用DataFrame.apply逐行调用Python函数）。
+#
+#输入可以是pandas.DataFrame，也可以是{列名: 数组}的dict（如loader.load('titanic').columns()）。
+#每个函数只按元素计算，或者返回可以相加的计数，因此可以对很大的乘客名单分块计算后再合并。
+#
+#用法：
+#   add_features(titanic_df)                        #添加With_relate和Age_group两列
+#   for name, missing, ratio in missing_profile(titanic_df): ...
+#   labels, counts, rates = survival_rates(titanic_df.Survived, titanic_df.Pclass)
+#   survival_rates(columns['Survived'], columns['Age_group'], interval_labels())   #dict中的Age_group为整数编号
+import numpy as np
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+#Age_group的组距，与notebook中的np.arange(0, 90, 10)相同：(0, 10], (10, 20], ..., (70, 80]
+AGE_BINS = np.arange(0, 90, 10)
+
+LENGTH_MISMATCH_MSG = 'survived and groups must have the same length'
+
+
+#功能：是否与亲属同行，SibSp或Parch不为0时为1，否则为0
+#返回值：
+#   int64数组
+def with_relate(sibsp, parch):
+    return ((np.asarray(sibsp) != 0) | (np.asarray(parch) != 0)).astype(np.int64)
+
+
+#功能：年龄所在的组，与pd.cut相同，区间为左开右闭
+#参数：
+#   [in]age 年龄数组，缺失值为NaN
+#   [in]bins 升序的分组边界
+#返回值：
+#   int64数组，第i组为(bins[i], bins[i+1]]；缺失或超出范围时为-1
+def age_group_codes(age, bins=AGE_BINS):
+    age = np.asarray(age, dtype=np.float64)
+    codes = np.searchsorted(bins, age, side='left') - 1
+    #NaN的比较结果为False，也归为-1
+    with np.errstate(invalid='ignore'):
+        valid = (age > bins[0]) & (age <= bins[-1])
+    return np.where(valid, codes, -1)
+
+
+#功能：各组的名称，与pd.cut得到的区间的字符串相同，如'(0, 10]'
+def interval_labels(bins=AGE_BINS):
+    return ['({}, {}]'.format(low, high) for low, high in zip(bins[:-1], bins[1:])]
+
+
+#功能：与pd.cut(age, bins)相同的pandas.Categorical
+def age_group(age, bins=AGE_BINS):
+    return pd.Categorical.from_codes(age_group_codes(age, bins), pd.IntervalIndex.from_breaks(bins), ordered=True)
+
+
+#功能：添加派生列With_relate和Age_group
+#参数：
+#   [in]data pandas.DataFrame或dict，需要有SibSp、Parch、Age三列
+#   [in]bins Age_group的分组边界
+#返回值：
+#   data；dict中的Age_group为age_group_codes的整数编号
+def add_features(data, bins=AGE_BINS):
+    data['With_relate'] = with_relate(data['SibSp'], data['Parch'])
+    if pd is not None and isinstance(data, pd.DataFrame):
+        data['Age_group'] = age_group(data['Age'], bins)
+    else:
+        data['Age_group'] = age_group_codes(data['Age'], bins)
+    return data
+
+
+#功能：一列中缺失值的个数：浮点数为NaN，字符串为空字符串，object为None、NaN或空字符串；整数列没有缺失值
+def count_missing(values):
+    if pd is not None and isinstance(values, (pd.Series, pd.Categorical)):
+        return int(values.isnull().sum())
+    values = np.asarray(values)
+    kind = values.dtype.kind
+    if kind in 'fc':
+        return int(np.count_nonzero(np.isnan(values)))
+    if kind in 'US':
+        return int(np.count_nonzero(values == values.dtype.type()))
+    if kind == 'O':
+        return int(sum([1 for value in values if value is None or value != value or value == '']))
+    return 0
+
+
+#功能：所有列的缺失值统计
+#参数：
+#   [in]data pandas.DataFrame或{列名: 数组}
+#   [in]names 要统计的列，None表示全部
+#返回值：
+#   [(列名, 缺失个数, 缺失比例)]，顺序与列的顺序相同
+def missing_profile(data, names=None):
+    if names is None:
+        names = list(data.columns) if pd is not None and isinstance(data, pd.DataFrame) else list(data)
+    profile = []
+    for name in names:
+        column = data[name]
+        n = len(column)
+        missing = count_missing(column)
+        profile.append((name, missing, float(missing) / n if n else 0.0))
+    return profile
+
+
+#功能：每组的人数和幸存人数，可以对分块计算的结果直接相加
+#参数：
+#   [in]survived 0/1数组
+#   [in]codes 组的编号（0 ~ n_groups-1），负数表示不属于任何组
+#   [in]n_groups 组数
+#返回值：
+#   (每组人数, 每组幸存人数)，长度都为n_groups的int64数组
+def group_counts(survived, codes, n_groups):
+    survived = np.asarray(survived)
+    codes = np.asarray(codes)
+    if len(survived) != len(codes):
+        raise ValueError(LENGTH_MISMATCH_MSG)
+    valid = codes >= 0
+    counts = np.bincount(codes[valid], minlength=n_groups)
+    survivors = np.bincount(codes[valid], weights=survived[valid], minlength=n_groups)
+    return counts, survivors.astype(np.int64)
+
+
+#功能：把分组的列编码为整数
+#参数：
+#   [in]values 数值、字符串或pandas.Categorical
+#返回值：
+#   (组名列表（升序；Categorical为其categories）, int数组编号)；缺失值（NaN、None、空字符串）的编号为-1
+def encode_groups(values):
+    categorical = getattr(values, 'values', values)
+    if pd is not None and isinstance(categorical, pd.Categorical):
+        return list(categorical.categories), np.asarray(categorical.codes, dtype=np.intp)
+    values = np.asarray(values)
+    if values.dtype.kind in 'US':
+        values = values.astype(object)
+    if pd is not None:
+        #哈希编码，比排序快
+        codes, labels = pd.factorize(values, sort=True)
+        labels = list(labels)
+        codes = np.asarray(codes, dtype=np.intp)
+    else:
+        present = np.array([value is not None and value == value for value in values], dtype=bool)
+        labels, codes_present = np.unique(values[present], return_inverse=True)
+        labels = list(labels)
+        codes = np.full(len(values), -1, dtype=np.intp)
+        codes[present] = codes_present
+    if values.dtype.kind == 'O' and '' in labels:
+        #空字符串也是缺失值
+        empty = labels.index('')
+        codes = np.where(codes == empty, -1, codes - (codes > empty))
+        del labels[empty]
+    return labels, codes
+
+
+#功能：按一列分组的幸存率，与groupby(groups).Survived.mean()相同（缺失值不属于任何组）
+#参数：
+#   [in]survived 0/1数组
+#   [in]groups 分组的列：数值、字符串或pandas.Categorical（如Age_group）
+#   [in]labels 给出组名时groups为已编码的整数（如age_group_codes的结果，-1表示缺失）
+#返回值：
+#   (组名列表, 每组人数, 每组幸存率)
+def survival_rates(survived, groups, labels=None):
+    if labels is None:
+        labels, codes = encode_groups(groups)
+    else:
+        codes = np.asarray(groups)
+    counts, survivors = group_counts(survived, codes, len(labels))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rates = survivors / counts.astype(np.float64)
+    return labels, counts, rates
@@ -0,0 +1,271 @@
+# -- coding: utf-8 --
+#可复现的缺失值填充，代替fillna(np.random.randint(0, 80))（每次运行结果不同，且所有缺失值填同一个数）。
+#
+#GroupMedianImputer 按分组（默认Pclass、Sex）的中位数填充，没有该组数据时用全体的中位数；
+#SampledImputer     从已有的值中抽样填充，每一行的随机数只由种子和该行的编号（如PassengerId）决定，
+#                   与数据如何分块、以什么顺序输入无关。
+#fit的结果按数据的哈希和参数缓存在磁盘上（cache_dir），同样的数据和参数不会重新计算；
+#fit之后transform可以逐块调用。
+#aggregate_imputed把填充、features.add_features和aggregate.GroupAggregator串起来，
+#结果同样缓存：填充的参数和数据都没变时直接读取分组统计的结果。
+#
+#用法：
+#   imputer = GroupMedianImputer('Age', by=('Pclass', 'Sex')).fit(titanic_df)
+#   titanic_df['Age'] = imputer.transform(titanic_df)
+#   for chunk in chunks: chunk['Age'] = imputer.transform(chunk)
+#   tables = aggregate_imputed(titanic_df, imputer, ['Pclass', 'Age_group'], ['count', ('Survived', 'mean')])
+import hashlib
+import os
+import pickle
+import tempfile
+
+import numpy as np
+
+from aggregate import GroupAggregator
+from features import AGE_BINS, add_features, age_group, encode_groups, pd
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.impute_cache')
+
+NOT_FITTED_MSG = 'The imputer has not been fitted'
+NO_VALUES_MSG = 'Column {} has no values to impute from'
+
+
+class GroupMedianImputer(object):
+
+    #参数：
+    #   [in]column 要填充的列
+    #   [in]by 分组的列，空元组表示只用全体的中位数
+    def __init__(self, column='Age', by=('Pclass', 'Sex')):
+        self.column = column
+        self.by = tuple(by)
+
+    #功能：计算各组的中位数
+    #参数：
+    #   [in]data pandas.DataFrame或{列名: 数组}
+    #   [in]cache_dir 缓存目录，None表示不使用缓存
+    #返回值：
+    #   self
+    def fit(self, data, cache_dir=CACHE_DIR):
+        key = _digest([self.__class__.__name__, self.column, self.by] +
+                      [column_digest(data[name]) for name in (self.column,) + self.by])
+        fitted = _load_cache(cache_dir, key)
+        if fitted is None:
+            fitted = self._fit(data)
+            _save_cache(cache_dir, key, fitted)
+        self.medians_, self.overall_median_ = fitted
+        return self
+
+    #功能：填充一块数据
+    #返回值：
+    #   填充后的列（float64数组），不修改data
+    def transform(self, data):
+        if not hasattr(self, 'medians_'):
+            raise Exception(NOT_FITTED_MSG)
+        values = np.array(data[self.column], dtype=np.float64)
+        missing = np.isnan(values)
+        if not missing.any():
+            return values
+        if not self.by:
+            values[missing] = self.overall_median_
+            return values
+        labels, codes = _combined_codes(data, self.by, missing)
+        fills = np.array([self.medians_.get(label, self.overall_median_) for label in labels] +
+                         [self.overall_median_])
+        #分组列缺失的行编号为-1，对应最后的全体中位数
+        values[missing] = fills[codes]
+        return values
+
+    def fit_transform(self, data, cache_dir=CACHE_DIR):
+        return self.fit(data, cache_dir).transform(data)
+
+    #功能：填充的参数和拟合结果的哈希，下游的缓存用它判断填充是否改变
+    def fingerprint(self):
+        if not hasattr(self, 'medians_'):
+            raise Exception(NOT_FITTED_MSG)
+        return _digest([self.__class__.__name__, self.column, self.by,
+                        sorted(self.medians_.items()), self.overall_median_])
+
+    def _fit(self, data):
+        values = np.asarray(data[self.column], dtype=np.float64)
+        present = ~np.isnan(values)
+        if not present.any():
+            raise ValueError(NO_VALUES_MSG.format(self.column))
+        overall = float(np.median(values[present]))
+        if not self.by:
+            return {}, overall
+        labels, codes = _combined_codes(data, self.by, present)
+        values = values[present]
+        keep = codes >= 0
+        codes = codes[keep]
+        values = values[keep]
+        #按(组, 值)排序后，每组的中位数在该组所在区间的中间
+        order = np.lexsort((values, codes))
+        values = values[order]
+        counts = np.bincount(codes, minlength=len(labels))
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        medians = {}
+        for label, start, count in zip(labels, starts, counts):
+            if count:
+                medians[label] = float((values[start + (count - 1) // 2] + values[start + count // 2]) / 2)
+        return medians, overall
+
+
+class SampledImputer(object):
+
+    #参数：
+    #   [in]column 要填充的列
+    #   [in]random_state 随机种子
+    #   [in]id_column 每行的编号所在的列（整数），决定该行的随机数；None时用输入的行序号（需要每次按同样的顺序输入）
+    def __init__(self, column='Age', random_state=0, id_column='PassengerId'):
+        self.column = column
+        self.random_state = random_state
+        self.id_column = id_column
+
+    #功能：保存已有的值（排序后），抽样时按均匀分布取其中一个
+    def fit(self, data, cache_dir=CACHE_DIR):
+        key = _digest([self.__class__.__name__, self.column, column_digest(data[self.column])])
+        fitted = _load_cache(cache_dir, key)
+        if fitted is None:
+            values = np.asarray(data[self.column], dtype=np.float64)
+            fitted = np.sort(values[~np.isnan(values)])
+            if len(fitted) == 0:
+                raise ValueError(NO_VALUES_MSG.format(self.column))
+            _save_cache(cache_dir, key, fitted)
+        self.values_ = fitted
+        self._rows_seen = 0
+        return self
+
+    def transform(self, data):
+        if not hasattr(self, 'values_'):
+            raise Exception(NOT_FITTED_MSG)
+        values = np.array(data[self.column], dtype=np.float64)
+        n = len(values)
+        if self.id_column is None:
+            ids = np.arange(self._rows_seen, self._rows_seen + n)
+            self._rows_seen += n
+        else:
+            ids = np.asarray(data[self.id_column])
+        missing = np.isnan(values)
+        u = uniform_hash(ids[missing], self.random_state)
+        values[missing] = self.values_[(u * len(self.values_)).astype(np.intp)]
+        return values
+
+    def fit_transform(self, data, cache_dir=CACHE_DIR):
+        return self.fit(data, cache_dir).transform(data)
+
+    def fingerprint(self):
+        if not hasattr(self, 'values_'):
+            raise Exception(NOT_FITTED_MSG)
+        return _digest([self.__class__.__name__, self.column, self.random_state, self.id_column,
+                        hashlib.sha1(self.values_.tobytes()).hexdigest()])
+
+
+#功能：由种子和整数编号得到[0, 1)中的均匀随机数（splitmix64），同样的编号总是得到同样的数
+def uniform_hash(ids, seed):
+    with np.errstate(over='ignore'):
+        x = np.asarray(ids).astype(np.uint64) + np.uint64(seed) * np.uint64(0x9E3779B97F4A7C15)
+        x = x + np.uint64(0x9E3779B97F4A7C15)
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        x = x ^ (x >> np.uint64(31))
+    #取高53位，恰好是float64的精度
+    return (x >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+
+
+#功能：填充后计算分组统计，填充的参数和数据都没有改变时直接读取缓存
+#参数：
+#   [in]data pandas.DataFrame、{列名: 数组}，或它们的列表（分块输入）
+#   [in]imputer 已fit的GroupMedianImputer或SampledImputer
+#   [in]keys, aggregates 同aggregate.GroupAggregator
+#   [in]bins Age_group的分组边界
+#   [in]cache_dir 缓存目录，None表示不使用缓存
+#   [in]data_key 数据的标识（如loader.load(...).sha1），None时由各块的数据计算
+#返回值：
+#   同GroupAggregator.result
+def aggregate_imputed(data, imputer, keys, aggregates, bins=AGE_BINS, cache_dir=CACHE_DIR, data_key=None):
+    if isinstance(data, dict) or (pd is not None and isinstance(data, pd.DataFrame)):
+        data = [data]
+    if data_key is None:
+        data_key = _digest([[column_digest(chunk[name]) for name in _names(chunk)] for chunk in data])
+    key = _digest(['aggregate_imputed', data_key, imputer.fingerprint(), keys, aggregates, list(bins)])
+    tables = _load_cache(cache_dir, key)
+    if tables is None:
+        aggregator = GroupAggregator(keys, aggregates)
+        for chunk in data:
+            #只复制列的引用，不修改调用者的数据
+            chunk = dict((name, chunk[name]) for name in _names(chunk))
+            chunk[imputer.column] = imputer.transform(chunk)
+            add_features(chunk, bins)
+            if pd is not None:
+                #dict中的Age_group为整数编号，换成与pd.cut相同的Categorical，组名为区间
+                chunk['Age_group'] = age_group(chunk['Age'], bins)
+            aggregator.update(chunk)
+        tables = aggregator.result()
+        _save_cache(cache_dir, key, tables)
+    return tables
+
+
+#功能：一列数据的哈希
+def column_digest(values):
+    array = np.asarray(values)
+    if array.dtype.kind in 'biuf':
+        return hashlib.sha1(np.ascontiguousarray(array).tobytes()).hexdigest()
+    if pd is not None:
+        return hashlib.sha1(pd.util.hash_array(np.asarray(values, dtype=object)).tobytes()).hexdigest()
+    return hashlib.sha1(array.astype('U').tobytes()).hexdigest()
+
+
+#多个分组列组合后的编号；组名为各列组名的元组，只对mask为True的行编码，某列缺失时为-1
+def _combined_codes(data, by, mask):
+    per_column = [encode_groups(np.asarray(data[name])[mask]) for name in by]
+    shape = tuple([len(labels) for labels, _ in per_column])
+    codes = [column_codes for _, column_codes in per_column]
+    present = np.logical_and.reduce([code >= 0 for code in codes])
+    combined = np.full(len(present), -1, dtype=np.intp)
+    if present.any():
+        combined[present] = np.ravel_multi_index([code[present] for code in codes], shape)
+    grid = np.indices(shape).reshape(len(shape), -1).T
+    labels = [tuple([_plain(per_column[k][0][i]) for k, i in enumerate(combination)]) for combination in grid]
+    return labels, combined
+
+
+#numpy的标量转换为Python的数值，缓存和fingerprint中的组名不依赖numpy的类型
+def _plain(label):
+    return label.item() if isinstance(label, np.generic) else label
+
+
+def _names(chunk):
+    return list(chunk.columns) if pd is not None and isinstance(chunk, pd.DataFrame) else list(chunk)
+
+
+def _digest(parts):
+    return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+
+
+#功能：读取缓存文件<cache_dir>/<key>.pkl
+#参数：
+#   [in]cache_dir 缓存目录，None表示不使用缓存
+#   [in]key 键（SHA-1）
+#返回值：
+#   缓存的值；不存在、不完整或不使用缓存时返回None
+def _load_cache(cache_dir, key):
+    if cache_dir is None:
+        return None
+    try:
+        with open(os.path.join(cache_dir, key + '.pkl'), 'rb') as f:
+            return pickle.load(f)
+    except Exception:
+        #文件不存在（IOError），或者不完整、损坏：pickle可能raise UnpicklingError、EOFError，也可能是TypeError等
+        return None
+
+
+#功能：写入缓存；先写临时文件再改名，中断时不会留下不完整的缓存文件
+def _save_cache(cache_dir, key, value):
+    if cache_dir is None:
+        return
+    if not os.path.isdir(cache_dir):
+        os.makedirs(cache_dir)
+    fd, temp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+    with os.fdopen(fd, 'wb') as f:
+        pickle.dump(value, f, pickle.HIGHEST_PROTOCOL)
+    os.rename(temp_path, os.path.join(cache_dir, key + '.pkl'))
@@ -0,0 +1,264 @@
+# -- coding: utf-8 --
+#项目自带CSV数据的列式缓存。
+#
+#第一次读取某个CSV时解析一次，每一列按推断的类型保存为一个.npy文件（缓存目录为CSV所在目录下的.columnar_cache）；
+#之后用np.load(mmap_mode='r')打开，不再解析文本，取一列时也不复制数据。
+#列的类型：全部为整数且没有缺失值时为int64；全部为数值（可以有缺失值）时为float64，缺失值为NaN；
+#否则为定长的unicode字符串，缺失值为空字符串。
+#
+#缓存失效：manifest.json中记录了CSV的修改时间、大小和SHA-1。修改时间和大小都没变时直接使用缓存；
+#否则重新计算SHA-1，内容没变时只更新记录的修改时间，内容变了才重新解析。
+#
+#用法：
+#   data = load('titanic')              #DATASETS中的名字，或CSV文件的路径
+#   data['Age']                         #只读的numpy.memmap
+#   data.names, len(data)
+#   titanic_df = read_csv('titanic-data.csv')   #与pd.read_csv相同的DataFrame
+import csv
+import hashlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+import numpy as np
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+#项目自带的数据：名字 -> (相对于仓库根目录的路径, 解析选项)
+#   encoding 文件编码
+#   first_table_only True 遇到第一个空行就结束（stroopdata.csv在数据下方有手工计算的统计结果）
+#   drop_empty_columns True 去掉没有列名且没有任何值的列
+DATASETS = {
+    'stroop': ('01_Statistic_Basics/stroopdata.csv',
+               {'encoding': 'gbk', 'first_table_only': True, 'drop_empty_columns': True}),
+    'titanic': ('04_date_analysis/titanic-data.csv', {}),
+    'housing': ('05_modle_assess_verify/housing.csv', {}),
+    'bj_housing': ('05_modle_assess_verify/bj_housing.csv', {}),
+}
+
+CACHE_DIR_NAME = '.columnar_cache'
+MANIFEST_NAME = 'manifest.json'
+#缓存格式改变时加1，旧的缓存会被重新生成
+FORMAT_VERSION = 1
+HASH_CHUNK_SIZE = 1 << 20
+
+UNKNOWN_COLUMN_MSG = 'Unknown column: {}'
+EMPTY_CSV_MSG = 'The CSV file has no header: {}'
+
+
+class ColumnarDataset(object):
+
+    #参数：
+    #   [in]directory 缓存目录
+    #   [in]manifest 缓存目录中的manifest.json的内容
+    def __init__(self, directory, manifest):
+        self.directory = directory
+        self.names = [column['name'] for column in manifest['columns']]
+        self.n_rows = manifest['n_rows']
+        #CSV内容的SHA-1，可以作为下游缓存的键
+        self.sha1 = manifest['sha1']
+        self._files = dict((column['name'], column['file']) for column in manifest['columns'])
+        self._arrays = {}
+
+    def __len__(self):
+        return self.n_rows
+
+    def __contains__(self, name):
+        return name in self._files
+
+    #功能：取一列
+    #返回值：
+    #   只读的numpy.memmap（空表时为普通的空数组）
+    def __getitem__(self, name):
+        if name not in self._files:
+            raise KeyError(UNKNOWN_COLUMN_MSG.format(name))
+        if name not in self._arrays:
+            path = os.path.join(self.directory, self._files[name])
+            #长度为0的文件不能映射到内存
+            self._arrays[name] = np.load(path, mmap_mode='r' if self.n_rows else None)
+        return self._arrays[name]
+
+    #功能：多列组成的dict
+    def columns(self, names=None):
+        return dict((name, self[name]) for name in (self.names if names is None else names))
+
+    #功能：转换为pandas.DataFrame（复制数据），字符串列的空字符串转换为NaN，与pd.read_csv的结果相同
+    def to_frame(self, names=None):
+        import pandas as pd
+        names = self.names if names is None else names
+        data = {}
+        for name in names:
+            column = np.asarray(self[name])
+            if column.dtype.kind == 'U':
+                column = pd.Series(column, dtype=object).replace(u'', np.nan)
+            data[name] = column
+        return pd.DataFrame(data, columns=names)
+
+
+#功能：打开CSV的列式缓存，缓存不存在或已失效时先生成
+#参数：
+#   [in]source DATASETS中的名字或CSV文件的路径
+#   [in]cache_dir 缓存目录，None表示CSV所在目录下的.columnar_cache/<文件名>
+#   [in]options 解析选项，见DATASETS；使用DATASETS中的名字时不需要
+#返回值：
+#   ColumnarDataset
+def load(source, cache_dir=None, **options):
+    path, options = _resolve(source, options)
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(path), CACHE_DIR_NAME,
+                                 os.path.splitext(os.path.basename(path))[0])
+
+    manifest = _read_manifest(cache_dir)
+    stat = os.stat(path)
+    if not _is_valid(manifest, options, stat):
+        digest = file_hash(path)
+        if manifest is not None and manifest['format'] == FORMAT_VERSION and \
+                manifest['options'] == options and manifest['sha1'] == digest:
+            #只是修改时间变了
+            manifest['mtime'] = stat.st_mtime
+            manifest['size'] = stat.st_size
+            _write_manifest(cache_dir, manifest)
+        else:
+            manifest = build_cache(path, cache_dir, digest, **options)
+    return ColumnarDataset(cache_dir, manifest)
+
+
+#功能：与pd.read_csv相同，但经过列式缓存
+def read_csv(source, cache_dir=None, **options):
+    return load(source, cache_dir, **options).to_frame()
+
+
+#功能：解析CSV并生成缓存目录（先写到临时目录，完成后再替换原来的缓存）
+#参数：
+#   [in]path CSV文件的路径
+#   [in]cache_dir 缓存目录
+#   [in]digest CSV的SHA-1，None时计算
+#   [in]options 解析选项
+#返回值：
+#   manifest
+def build_cache(path, cache_dir, digest=None, **options):
+    stat = os.stat(path)
+    if digest is None:
+        digest = file_hash(path)
+    names, columns = parse_csv(path, **options)
+
+    parent = os.path.dirname(os.path.abspath(cache_dir))
+    if not os.path.isdir(parent):
+        os.makedirs(parent)
+    temp_dir = tempfile.mkdtemp(dir=parent)
+    manifest_columns = []
+    for i, (name, array) in enumerate(zip(names, columns)):
+        filename = 'c{:03d}.npy'.format(i)
+        np.save(os.path.join(temp_dir, filename), array)
+        manifest_columns.append({'name': name, 'file': filename, 'dtype': array.dtype.str})
+    manifest = {'format': FORMAT_VERSION, 'source': os.path.abspath(path), 'options': options,
+                'mtime': stat.st_mtime, 'size': stat.st_size, 'sha1': digest,
+                'n_rows': len(columns[0]) if columns else 0, 'columns': manifest_columns}
+    _write_manifest(temp_dir, manifest)
+
+    if os.path.isdir(cache_dir):
+        shutil.rmtree(cache_dir)
+    os.rename(temp_dir, cache_dir)
+    return manifest
+
+
+#功能：解析CSV
+#返回值：
+#   (列名列表, 每一列的数组)
+def parse_csv(path, encoding='utf-8', first_table_only=False, drop_empty_columns=False):
+    rows = _read_rows(path, encoding)
+    try:
+        header = [_decode(name, encoding) for name in next(rows)]
+    except StopIteration:
+        raise ValueError(EMPTY_CSV_MSG.format(path))
+    columns = [[] for _ in header]
+    for row in rows:
+        if first_table_only and not any(row):
+            break
+        #与pd.read_csv一样，缺少的字段视为缺失值
+        row = row + [''] * (len(header) - len(row))
+        for column, value in zip(columns, row):
+            column.append(value)
+
+    names = []
+    kept = []
+    for i, (name, column) in enumerate(zip(header, columns)):
+        if drop_empty_columns and not name and not any(column):
+            continue
+        #没有列名的列与pandas一样命名为'Unnamed: i'
+        names.append(name if name else u'Unnamed: {}'.format(i))
+        kept.append(column_array(column, encoding))
+    return names, kept
+
+
+#功能：把一列字符串转换为有类型的数组：int64、float64（缺失值为NaN）或unicode字符串（缺失值为''）
+#参数：
+#   [in]values 字符串列表，Python 2中为未解码的字节
+#   [in]encoding 文件编码，只有字符串列需要解码
+def column_array(values, encoding='utf-8'):
+    if all(values):
+        try:
+            return np.array([int(value) for value in values], dtype=np.int64)
+        except ValueError:
+            pass
+    try:
+        return np.array([float(value) if value else np.nan for value in values], dtype=np.float64)
+    except ValueError:
+        return np.array([_decode(value, encoding) for value in values], dtype='U')
+
+
+#功能：文件内容的SHA-1，分块读取
+def file_hash(path):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _resolve(source, options):
+    if source in DATASETS:
+        relative_path, dataset_options = DATASETS[source]
+        merged = dict(dataset_options)
+        merged.update(options)
+        return os.path.join(REPO_DIR, relative_path), merged
+    return os.path.abspath(source), options
+
+
+def _is_valid(manifest, options, stat):
+    return (manifest is not None and manifest['format'] == FORMAT_VERSION and manifest['options'] == options
+            and manifest['mtime'] == stat.st_mtime and manifest['size'] == stat.st_size)
+
+
+def _read_manifest(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except (IOError, OSError, ValueError):
+        return None
+
+
+def _write_manifest(directory, manifest):
+    with open(os.path.join(directory, MANIFEST_NAME), 'w') as f:
+        json.dump(manifest, f)
+
+
+#逐行产生字段的列表；Python 2的csv模块只能读取字节，字段在确定是字符串列之后才解码
+def _read_rows(path, encoding):
+    if sys.version_info[0] >= 3:
+        with io.open(path, newline='', encoding=encoding) as f:
+            for row in csv.reader(f):
+                yield row
+    else:
+        with open(path, 'rb') as f:
+            for row in csv.reader(f):
+                yield row
+
+
+def _decode(value, encoding):
+    if isinstance(value, bytes):
+        return value.decode(encoding)
+    return value
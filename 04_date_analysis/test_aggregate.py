@@ -0,0 +1,83 @@
+# -- coding: utf-8 --
+#aggregate的检查：与pandas的groupby结果比较，分块输入和dict输入的结果与一次输入DataFrame相同
+#用法：python -m pytest test_aggregate.py 或 python test_aggregate.py
+import os
+import unittest
+
+import numpy as np
+import pandas as pd
+
+import aggregate as aggregate_module
+from aggregate import GroupAggregator, aggregate
+from features import add_features
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'titanic-data.csv')
+KEYS = ['Pclass', 'Sex', 'Age_group', 'With_relate', 'Embarked']
+AGGREGATES = ['count', ('Survived', 'mean'), ('Fare', 'sum'), ('Age', 'mean'), ('Survived', 'value_counts')]
+
+
+class AggregateTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.data = add_features(pd.read_csv(DATA_PATH))
+
+    #功能：与groupby的结果比较
+    def assert_matches_groupby(self, tables, data):
+        for key in KEYS:
+            table = tables[key]
+            grouped = data.groupby(key)
+            np.testing.assert_array_equal(table['count'].values, grouped.size().values)
+            self.assertEqual([str(label) for label in table.index], [str(label) for label in grouped.size().index])
+            np.testing.assert_allclose(table['Survived_mean'].values, grouped['Survived'].mean().values, rtol=1e-12)
+            np.testing.assert_allclose(table['Fare_sum'].values, grouped['Fare'].sum().values, rtol=1e-12)
+            #Age的缺失值不计入均值
+            np.testing.assert_allclose(table['Age_mean'].values, grouped['Age'].mean().values, rtol=1e-12)
+            counts = grouped['Survived'].value_counts().unstack(fill_value=0)
+            np.testing.assert_array_equal(table[['Survived_0', 'Survived_1']].values, counts[[0, 1]].values)
+
+    def test_matches_groupby(self):
+        self.assert_matches_groupby(aggregate(self.data, KEYS, AGGREGATES), self.data)
+
+    def test_chunks_match_single_pass(self):
+        #按Embarked排序后分块：后面的块才出现新的组名
+        data = self.data.sort_values(['Embarked', 'Pclass']).reset_index(drop=True)
+        chunks = [data.iloc[i:i + 150] for i in range(0, len(data), 150)]
+        tables = aggregate(iter(chunks), KEYS, AGGREGATES)
+        expected = aggregate(self.data, KEYS, AGGREGATES)
+        for key in KEYS:
+            pd.testing.assert_frame_equal(tables[key], expected[key])
+        self.assert_matches_groupby(tables, self.data)
+
+    def test_multi_column_key(self):
+        tables = aggregate(self.data, [('Pclass', 'Sex')], ['count', ('Survived', 'mean')])
+        table = tables[('Pclass', 'Sex')]
+        grouped = self.data.groupby(['Pclass', 'Sex'])
+        self.assertEqual(list(table.index), list(grouped.size().index))
+        np.testing.assert_array_equal(table['count'].values, grouped.size().values)
+        np.testing.assert_allclose(table['Survived_mean'].values, grouped['Survived'].mean().values, rtol=1e-12)
+
+    def test_dict_input(self):
+        columns = dict((name, self.data[name].values) for name in ('Pclass', 'Embarked', 'Survived'))
+        columns['Embarked'] = self.data['Embarked'].fillna('').values.astype('U')
+        expected = aggregate(self.data, ['Pclass', 'Embarked'], ['count', ('Survived', 'mean')])
+        #没有pandas时结果为dict
+        pandas_module = aggregate_module.pd
+        aggregate_module.pd = None
+        try:
+            tables = aggregate(columns, ['Pclass', 'Embarked'], ['count', ('Survived', 'mean')])
+        finally:
+            aggregate_module.pd = pandas_module
+        for key in ('Pclass', 'Embarked'):
+            self.assertEqual([str(label) for label in tables[key]['index']],
+                             [str(label) for label in expected[key].index])
+            np.testing.assert_array_equal(tables[key]['count'], expected[key]['count'].values)
+            np.testing.assert_allclose(tables[key]['Survived_mean'], expected[key]['Survived_mean'].values)
+
+    def test_errors(self):
+        self.assertRaises(ValueError, GroupAggregator, [])
+        self.assertRaises(ValueError, GroupAggregator, ['Pclass'], [('Survived', 'median')])
+        self.assertEqual(len(GroupAggregator(['Pclass']).result()['Pclass']), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
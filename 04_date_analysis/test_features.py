@@ -0,0 +1,98 @@
+# -- coding: utf-8 --
+#features的检查：与pd.cut、groupby、isnull的结果比较，dict输入（loader的列）与DataFrame结果相同
+#用法：python -m pytest test_features.py 或 python test_features.py
+import os
+import unittest
+
+import numpy as np
+import pandas as pd
+
+import features
+from features import (AGE_BINS, add_features, age_group, age_group_codes, encode_groups, group_counts,
+                      interval_labels, missing_profile, survival_rates, with_relate)
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'titanic-data.csv')
+
+
+class FeaturesTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.data = pd.read_csv(DATA_PATH)
+
+    def test_age_group_matches_pd_cut(self):
+        #边界值、超出范围和缺失值
+        age = np.concatenate([self.data['Age'].values, [0.0, 10.0, 80.0, 80.5, -1.0, np.nan]])
+        expected = pd.cut(age, AGE_BINS)
+        self.assertTrue(age_group(age).equals(expected))
+        np.testing.assert_array_equal(age_group_codes(age), expected.codes)
+        self.assertEqual(interval_labels(), [str(interval) for interval in expected.categories])
+
+    def test_add_features(self):
+        frame = add_features(self.data.copy())
+        expected = ((self.data['SibSp'] != 0) | (self.data['Parch'] != 0)).astype(int)
+        np.testing.assert_array_equal(frame['With_relate'].values, expected.values)
+        np.testing.assert_array_equal(with_relate(self.data['SibSp'], self.data['Parch']), expected.values)
+        #dict输入时Age_group为整数编号
+        columns = dict((name, self.data[name].values) for name in ('SibSp', 'Parch', 'Age'))
+        add_features(columns)
+        np.testing.assert_array_equal(columns['Age_group'], frame['Age_group'].cat.codes.values)
+
+    def test_missing_profile_matches_pandas(self):
+        expected = self.data.isnull().sum()
+        profile = missing_profile(self.data)
+        self.assertEqual([name for name, _, _ in profile], list(self.data.columns))
+        for name, missing, ratio in profile:
+            self.assertEqual(missing, expected[name])
+            self.assertAlmostEqual(ratio, expected[name] / float(len(self.data)))
+        #numpy数组：字符串列的缺失值为空字符串
+        columns = {'Cabin': self.data['Cabin'].fillna('').values.astype('U'), 'Age': self.data['Age'].values,
+                   'Pclass': self.data['Pclass'].values}
+        self.assertEqual(dict((name, missing) for name, missing, _ in missing_profile(columns)),
+                         dict((name, expected[name]) for name in columns))
+
+    def test_survival_rates_match_groupby(self):
+        frame = add_features(self.data.copy())
+        for key in ('Pclass', 'Sex', 'Embarked', 'Age_group', 'With_relate'):
+            grouped = frame.groupby(key)['Survived']
+            expected_mean = grouped.mean().dropna()
+            expected_count = grouped.count()
+            expected_count = expected_count[expected_count > 0]
+            labels, counts, rates = survival_rates(frame['Survived'], frame[key])
+            present = counts > 0
+            self.assertEqual([str(label) for label, keep in zip(labels, present) if keep],
+                             [str(label) for label in expected_mean.index])
+            np.testing.assert_array_equal(counts[present], expected_count.values)
+            np.testing.assert_allclose(rates[present], expected_mean.values, rtol=1e-12)
+        #已编码的Age_group
+        codes = age_group_codes(frame['Age'])
+        _, counts, rates = survival_rates(frame['Survived'].values, codes, interval_labels())
+        np.testing.assert_allclose(rates, frame.groupby('Age_group')['Survived'].mean().values, rtol=1e-12)
+
+    def test_chunks_add_up(self):
+        codes = age_group_codes(self.data['Age'])
+        survived = self.data['Survived'].values
+        whole = group_counts(survived, codes, 8)
+        parts = [group_counts(survived[i:i + 100], codes[i:i + 100], 8) for i in range(0, len(codes), 100)]
+        np.testing.assert_array_equal(sum([counts for counts, _ in parts]), whole[0])
+        np.testing.assert_array_equal(sum([survivors for _, survivors in parts]), whole[1])
+        self.assertRaises(ValueError, group_counts, survived[:5], codes, 8)
+
+    def test_encode_groups(self):
+        labels, codes = encode_groups(np.array(['b', '', 'a', 'b'], dtype='U'))
+        self.assertEqual((labels, codes.tolist()), (['a', 'b'], [1, -1, 0, 1]))
+        labels, codes = encode_groups([3.0, np.nan, 1.0])
+        self.assertEqual((labels, codes.tolist()), ([1.0, 3.0], [1, -1, 0]))
+        #没有pandas时用np.unique，结果与pd.factorize(sort=True)相同
+        embarked = self.data['Embarked'].values
+        expected = encode_groups(embarked)
+        features.pd = None
+        try:
+            labels, codes = encode_groups(embarked)
+        finally:
+            features.pd = pd
+        self.assertEqual(labels, expected[0])
+        np.testing.assert_array_equal(codes, expected[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
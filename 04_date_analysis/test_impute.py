@@ -0,0 +1,85 @@
+# -- coding: utf-8 --
+#impute的检查：与pandas的groupby结果比较，以及分块、缓存不改变结果
+#用法：python -m pytest test_impute.py 或 python test_impute.py
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from features import add_features
+from impute import GroupMedianImputer, SampledImputer, _load_cache, _save_cache, aggregate_imputed
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'titanic-data.csv')
+
+
+class ImputeTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.data = pd.read_csv(DATA_PATH)
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def test_group_median_matches_pandas(self):
+        expected = self.data['Age'].fillna(self.data.groupby(['Pclass', 'Sex'])['Age'].transform('median'))
+        filled = GroupMedianImputer('Age', by=('Pclass', 'Sex')).fit(self.data, None).transform(self.data)
+        np.testing.assert_array_equal(filled, expected.values)
+        overall = GroupMedianImputer('Age', by=()).fit(self.data, None).transform(self.data)
+        np.testing.assert_array_equal(overall, self.data['Age'].fillna(self.data['Age'].median()).values)
+
+    def test_chunks_and_cache(self):
+        imputer = GroupMedianImputer().fit(self.data, self.cache_dir)
+        whole = imputer.transform(self.data)
+        chunks = [imputer.transform(self.data.iloc[i:i + 100]) for i in range(0, len(self.data), 100)]
+        np.testing.assert_array_equal(np.concatenate(chunks), whole)
+        #第二次fit读取缓存，结果相同
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+        cached = GroupMedianImputer().fit(self.data, self.cache_dir)
+        self.assertEqual(cached.fingerprint(), imputer.fingerprint())
+        #缓存文件损坏时重新计算
+        path = os.path.join(self.cache_dir, os.listdir(self.cache_dir)[0])
+        with open(path, 'wb') as f:
+            f.write(b'\x80')
+        self.assertEqual(GroupMedianImputer().fit(self.data, self.cache_dir).fingerprint(), imputer.fingerprint())
+
+    def test_sampled_imputer_is_order_invariant(self):
+        imputer = SampledImputer(random_state=3).fit(self.data, None)
+        filled = pd.Series(imputer.transform(self.data), index=self.data.index)
+        shuffled = self.data.sample(frac=1, random_state=0)
+        np.testing.assert_array_equal(imputer.transform(shuffled), filled[shuffled.index].values)
+        self.assertFalse(np.isnan(filled).any())
+        #只从已有的值中抽样
+        self.assertTrue(filled.isin(self.data['Age'].dropna()).all())
+        other = SampledImputer(random_state=4).fit(self.data, None).transform(self.data)
+        self.assertFalse(np.array_equal(other, filled.values))
+
+    def test_aggregate_imputed_matches_pandas(self):
+        imputer = GroupMedianImputer().fit(self.data, None)
+        tables = aggregate_imputed([self.data.iloc[:400], self.data.iloc[400:]], imputer,
+                                   ['Pclass', 'Age_group'], ['count', ('Survived', 'mean')], cache_dir=self.cache_dir)
+        expected = self.data.copy()
+        expected['Age'] = imputer.transform(expected)
+        add_features(expected)
+        for key in ('Pclass', 'Age_group'):
+            grouped = expected.groupby(key)['Survived']
+            np.testing.assert_array_equal(tables[key]['count'].values, grouped.count().values)
+            np.testing.assert_allclose(tables[key]['Survived_mean'].values, grouped.mean().values, rtol=1e-12)
+        cached = aggregate_imputed([self.data.iloc[:400], self.data.iloc[400:]], imputer,
+                                   ['Pclass', 'Age_group'], ['count', ('Survived', 'mean')], cache_dir=self.cache_dir)
+        pd.testing.assert_frame_equal(cached['Pclass'], tables['Pclass'])
+
+    def test_cache_files(self):
+        self.assertEqual(_load_cache(self.cache_dir, 'missing'), None)
+        self.assertEqual(_load_cache(None, 'missing'), None)
+        _save_cache(self.cache_dir, 'key', {'a': 1})
+        self.assertEqual(_load_cache(self.cache_dir, 'key'), {'a': 1})
+        #没有留下临时文件
+        self.assertEqual(os.listdir(self.cache_dir), ['key.pkl'])
+
+
+if __name__ == '__main__':
+    unittest.main()
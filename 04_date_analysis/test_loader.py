@@ -0,0 +1,71 @@
+# -- coding: utf-8 --
+#loader的检查：经过列式缓存读出的DataFrame与pd.read_csv相同，CSV修改后缓存失效
+#用法：python -m pytest test_loader.py 或 python test_loader.py
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from loader import DATASETS, REPO_DIR, load, read_csv
+
+
+class LoaderTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def cache(self, name):
+        return os.path.join(self.cache_dir, name)
+
+    def test_datasets_match_pandas(self):
+        for name in ('titanic', 'housing', 'bj_housing'):
+            expected = pd.read_csv(os.path.join(REPO_DIR, DATASETS[name][0]))
+            #第二次读取使用缓存；pandas 3的字符串列是StringDtype，不比较dtype
+            for _ in range(2):
+                pd.testing.assert_frame_equal(read_csv(name, self.cache(name)), expected, check_dtype=False)
+            data = load(name, self.cache(name))
+            self.assertEqual(data.names, list(expected.columns))
+            self.assertEqual(len(data), len(expected))
+            for column in expected.columns:
+                if expected[column].dtype.kind in 'if':
+                    self.assertEqual(data[column].dtype, expected[column].dtype)
+                    self.assertTrue(isinstance(data[column], np.memmap))
+
+    def test_stroop_first_table(self):
+        #stroopdata.csv在数据下方有手工计算的统计结果，只取第一个表
+        path = os.path.join(REPO_DIR, DATASETS['stroop'][0])
+        expected = pd.read_csv(path, encoding='gbk', usecols=[0, 1, 2], nrows=24)
+        pd.testing.assert_frame_equal(read_csv('stroop', self.cache('stroop')), expected)
+
+    def test_cache_invalidation(self):
+        path = os.path.join(self.cache_dir, 'data.csv')
+        with open(path, 'w') as f:
+            f.write('a,b,c\n1,2.5,x\n3,,y\n')
+        cache = self.cache('data')
+        data = load(path, cache)
+        self.assertEqual(data['a'].dtype, np.int64)
+        self.assertTrue(np.isnan(data['b'][1]))
+        pd.testing.assert_frame_equal(data.to_frame(), pd.read_csv(path), check_dtype=False)
+        sha1 = data.sha1
+        #只改修改时间：不重新解析
+        stat = os.stat(path)
+        os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+        self.assertEqual(load(path, cache).sha1, sha1)
+        #内容改变：重新解析
+        with open(path, 'w') as f:
+            f.write('a,b,c\n1,2.5,x\n3,4,y\n5,6,z\n')
+        os.utime(path, (stat.st_atime, stat.st_mtime + 20))
+        data = load(path, cache)
+        self.assertNotEqual(data.sha1, sha1)
+        pd.testing.assert_frame_equal(data.to_frame(), pd.read_csv(path), check_dtype=False)
+        self.assertRaises(KeyError, data.__getitem__, 'd')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+# -- coding: utf-8 --
+#在housing.csv和bj_housing.csv上比较tree.HistogramTreeRegressor与sklearn的DecisionTreeRegressor
+#用法：python benchmark_tree.py
+#fit ms：max_depth=10时在全部数据上训练一次的耗时
+#grid ms：max_depth 1~10、10折交叉验证的网格搜索耗时（sklearn的GridSearchCV或model_selection.GridSearch）
+#best depth、cv r2：网格搜索选出的最大深度及其平均R²
+#HistogramTree使用默认的max_bins（MAX_BINS），两个数据集上与sklearn选出相同的深度；max_bins=256时bj_housing的Area（267个取值）按分位数分区间，结果不同
+import os
+import warnings
+from timeit import default_timer
+
+import pandas as pd
+
+from model_selection import GridSearch, KFold
+from tree import HistogramTreeRegressor
+
+try:
+    from sklearn.model_selection import GridSearchCV, KFold as SklearnKFold
+    from sklearn.tree import DecisionTreeRegressor
+except ImportError:
+    DecisionTreeRegressor = None
+
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+#(文件名, 特征列, 目标列)
+DATASETS = [('housing.csv', ['RM', 'LSTAT', 'PTRATIO'], 'MEDV'),
+            ('bj_housing.csv', ['Area', 'Room', 'Living', 'School', 'Year', 'Floor'], 'Value')]
+PARAMS = {'max_depth': range(1, 11)}
+REPEAT = 3
+
+
+def load(filename, features, target):
+    data = pd.read_csv(os.path.join(DATA_DIR, filename))
+    return data[features].values, data[target].values
+
+
+def best_time(function):
+    times = []
+    for _ in range(REPEAT):
+        start = default_timer()
+        result = function()
+        times.append(default_timer() - start)
+    return min(times) * 1000, result
+
+
+def sklearn_grid(X, y):
+    cv = SklearnKFold(n_splits=10, shuffle=True, random_state=1)
+    grid = GridSearchCV(DecisionTreeRegressor(random_state=0), PARAMS, scoring='r2', cv=cv).fit(X, y)
+    return grid.best_params_['max_depth'], grid.best_score_
+
+
+def native_grid(estimator, X, y):
+    grid = GridSearch(estimator, PARAMS, cv=KFold(n_splits=10, shuffle=True, random_state=1)).fit(X, y)
+    return grid.best_params_['max_depth'], grid.best_score_
+
+
+def main():
+    #sklearn 0.20的GridSearchCV关于iid参数的DeprecationWarning
+    warnings.simplefilter('ignore', DeprecationWarning)
+    print('{:<16}{:<32}{:>10}{:>10}{:>12}{:>10}'.format('data', 'model', 'fit ms', 'grid ms', 'best depth', 'cv r2'))
+    for filename, features, target in DATASETS:
+        X, y = load(filename, features, target)
+        rows = []
+        if DecisionTreeRegressor is not None:
+            rows.append(('sklearn GridSearchCV',
+                         lambda: DecisionTreeRegressor(max_depth=10, random_state=0).fit(X, y),
+                         lambda: sklearn_grid(X, y)))
+            rows.append(('sklearn tree + GridSearch',
+                         lambda: DecisionTreeRegressor(max_depth=10, random_state=0).fit(X, y),
+                         lambda: native_grid(DecisionTreeRegressor(random_state=0), X, y)))
+        rows.append(('HistogramTree + GridSearch',
+                     lambda: HistogramTreeRegressor(max_depth=10).fit(X, y),
+                     lambda: native_grid(HistogramTreeRegressor(), X, y)))
+
+        for name, fit, grid in rows:
+            fit_time, _ = best_time(fit)
+            grid_time, (depth, score) = best_time(grid)
+            print('{:<16}{:<32}{:>10.2f}{:>10.2f}{:>12}{:>10.4f}'.format(
+                filename, name, fit_time, grid_time, depth, score))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,254 @@
+# -- coding: utf-8 --
+#学习曲线（分数随训练集大小的变化）和复杂度曲线（分数随某个参数的变化），不依赖sklearn.model_selection。
+#
+#所有点共用同一组划分；每个训练好的模型同时给出训练集分数和验证集分数。
+#复杂度曲线的参数为max_depth、且估计器是决策树时，每一折只训练最深的一棵树，较浅的深度用这棵树截断到该深度的预测。
+#tree.HistogramTreeRegressor截断后与用该max_depth训练的树完全相同；sklearn的决策树节点的值就是其样本的均值，
+#也与用该max_depth训练的树相同，只有多个特征的分裂增益完全相等时，两者选的特征可能不同
+#（max_leaf_nodes、splitter='random'或max_features不是默认值时截断的结果不同，这时每个点分别训练，见supports_depth_prefix）。
+#reuse_models=False时每个点分别训练。
+#
+#结果按点保存在磁盘上（cache_dir），键由数据的哈希、估计器类名和参数、评分函数、各折下标共同决定，
+#任何一项改变都会使用新的缓存；已经算过的点直接读取，只计算新增的点。
+#估计器的random_state为None时，缓存的是第一次计算的结果。
+#
+#用法：
+#   cv = ShuffleSplit(n_splits=10, test_size=0.2, random_state=0)
+#   sizes, train_scores, test_scores = learning_curve(DecisionTreeRegressor(max_depth=3), X, y, [10, 50, 100], cv)
+#   train_scores, test_scores = validation_curve(DecisionTreeRegressor(), X, y, 'max_depth', range(1, 11), cv, n_jobs=4)
+#   #返回的分数矩阵为点数×折数，与sklearn相同
+import hashlib
+import os
+import pickle
+import tempfile
+
+import numpy as np
+
+try:
+    from sklearn.base import is_regressor
+except ImportError:
+    is_regressor = None
+
+from model_selection import DEPTH_PARAM, as_arrays, clone, run_tasks, split_folds
+from scoring import performance_metric2
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.curve_cache')
+
+INVALID_TRAIN_SIZES_MSG = 'train_sizes must be between 1 and the smallest training set ({}), got {}'
+
+
+#功能：学习曲线
+#参数：
+#   [in]estimator 估计器，不会被修改
+#   [in]X, y 数据
+#   [in]train_sizes 训练集大小：整数为样本数；小数为最小训练集的比例
+#   [in]cv 同cross_val_score
+#   [in]scoring 评分函数 scoring(y_true, y_predict)
+#   [in]n_jobs 进程数，None表示CPU核数
+#   [in]cache_dir 缓存目录，None表示不使用缓存
+#返回值：
+#   (训练集大小数组, 训练集分数, 验证集分数)，分数为训练集大小数×折数的矩阵
+def learning_curve(estimator, X, y, train_sizes, cv=3, scoring=performance_metric2, n_jobs=1, cache_dir=CACHE_DIR):
+    X, y = as_arrays(X, y)
+    folds = split_folds(cv, X, y)
+    sizes = _absolute_sizes(train_sizes, min([len(train) for train, _ in folds]))
+
+    key = _curve_key('learning_curve', X, y, estimator, None, scoring, folds)
+    points = _load(cache_dir, key)
+    missing = [size for size in sizes if size not in points]
+    if missing:
+        #每个点的训练集是同一折训练集下标的前size个
+        tasks = [(size, f) for size in missing for f in range(len(folds))]
+        results = run_tasks(_fit_and_score, tasks, X, y, n_jobs,
+                            folds=folds, estimator=estimator, scoring=scoring, param_name=None)
+        _collect(points, results, len(folds))
+        _save(cache_dir, key, points)
+
+    train_scores, test_scores = _stack(points, sizes)
+    return np.array(sizes), train_scores, test_scores
+
+
+#功能：复杂度曲线
+#参数：
+#   [in]param_name 参数名，如'max_depth'
+#   [in]param_range 参数值的列表
+#   [in]reuse_models True 参数为max_depth时每一折只训练一棵最深的树
+#   其余同learning_curve
+#返回值：
+#   (训练集分数, 验证集分数)，为参数值个数×折数的矩阵
+def validation_curve(estimator, X, y, param_name, param_range, cv=3, scoring=performance_metric2, n_jobs=1,
+                     cache_dir=CACHE_DIR, reuse_models=True):
+    X, y = as_arrays(X, y)
+    folds = split_folds(cv, X, y)
+    values = list(param_range)
+
+    key = _curve_key('validation_curve', X, y, estimator, param_name, scoring, folds)
+    points = _load(cache_dir, key)
+    missing = [value for value in values if value not in points]
+    if missing:
+        if reuse_models and param_name == DEPTH_PARAM and supports_depth_prefix(estimator):
+            tasks = [(tuple(missing), f) for f in range(len(folds))]
+            function = _fit_deepest_and_score
+        else:
+            tasks = [(value, f) for value in missing for f in range(len(folds))]
+            function = _fit_and_score
+        results = run_tasks(function, tasks, X, y, n_jobs,
+                            folds=folds, estimator=estimator, scoring=scoring, param_name=param_name)
+        if function is _fit_deepest_and_score:
+            results = [result for fold_results in results for result in fold_results]
+        _collect(points, results, len(folds))
+        _save(cache_dir, key, points)
+
+    return _stack(points, values)
+
+
+#功能：最深的树截断到某个深度后，是否与用该max_depth训练的树相同
+#   有predict_depths(X, depths)方法，或者是按深度优先生长、每个节点的分裂只由该节点的样本决定的sklearn单输出决策树回归器：
+#   max_leaf_nodes不为None时按增益最大优先生长，splitter='random'和max_features不为None时分裂依赖随机数的消耗顺序，
+#   这些情况截断的结果与重新训练的不同，每个点分别训练
+def supports_depth_prefix(estimator):
+    if hasattr(estimator, 'predict_depths'):
+        return True
+    if is_regressor is None or not (hasattr(estimator, 'decision_path') and is_regressor(estimator)
+                                    and not hasattr(estimator, 'estimators_') and not hasattr(estimator, 'n_estimators')):
+        return False
+    params = estimator.get_params()
+    return (params.get('splitter', 'best') == 'best' and params.get('max_leaf_nodes') is None
+            and params.get('max_features') is None)
+
+
+#功能：训练好的树截断到各个深度时的预测
+#返回值：
+#   列表，每个深度一个预测值数组；深度为None表示不截断
+def predict_depths(model, X, depths):
+    if hasattr(model, 'predict_depths'):
+        return model.predict_depths(X, depths)
+    values = model.tree_.value[:, 0, 0]
+    #decision_path的每一行是从根到叶的节点编号，按深度顺序排列
+    paths = model.decision_path(X)
+    starts = paths.indptr[:-1]
+    leaf_depths = np.diff(paths.indptr) - 1
+    predictions = []
+    for depth in depths:
+        if depth is None:
+            offsets = starts + leaf_depths
+        else:
+            offsets = starts + np.minimum(depth, leaf_depths)
+        predictions.append(values[paths.indices[offsets]])
+    return predictions
+
+
+#功能：数据的哈希，由形状和全部字节决定
+def dataset_hash(X, y):
+    digest = hashlib.sha1()
+    for array in (X, y):
+        digest.update(repr(array.shape).encode('utf-8'))
+        digest.update(np.ascontiguousarray(array).tobytes())
+    return digest.hexdigest()
+
+
+def _curve_key(kind, X, y, estimator, param_name, scoring, folds):
+    params = estimator.get_params()
+    #复杂度曲线中变化的参数不属于键
+    params.pop(param_name, None)
+    digest = hashlib.sha1()
+    digest.update(repr((kind, dataset_hash(X, y), _qualified_name(estimator.__class__),
+                        sorted(params.items()), _qualified_name(scoring), param_name)).encode('utf-8'))
+    for train, test in folds:
+        digest.update(np.asarray(train, dtype=np.int64).tobytes())
+        digest.update(b'|')
+        digest.update(np.asarray(test, dtype=np.int64).tobytes())
+        digest.update(b'#')
+    return digest.hexdigest()
+
+
+def _qualified_name(obj):
+    return '{}.{}'.format(getattr(obj, '__module__', ''), getattr(obj, '__name__', repr(obj)))
+
+
+def _absolute_sizes(train_sizes, max_size):
+    sizes = []
+    for size in train_sizes:
+        if isinstance(size, (float, np.floating)):
+            size = int(size * max_size)
+        size = int(size)
+        if not 1 <= size <= max_size:
+            raise ValueError(INVALID_TRAIN_SIZES_MSG.format(max_size, size))
+        sizes.append(size)
+    return sizes
+
+
+#缓存文件：{点: (各折训练集分数, 各折验证集分数)}
+def _cache_path(cache_dir, key):
+    return os.path.join(cache_dir, key + '.pkl')
+
+
+def _load(cache_dir, key):
+    if cache_dir is None:
+        return {}
+    try:
+        with open(_cache_path(cache_dir, key), 'rb') as f:
+            return pickle.load(f)
+    except (IOError, OSError, EOFError, pickle.UnpicklingError):
+        return {}
+
+
+#先写临时文件再改名，中断时不会留下不完整的缓存文件
+def _save(cache_dir, key, points):
+    if cache_dir is None:
+        return
+    if not os.path.isdir(cache_dir):
+        os.makedirs(cache_dir)
+    fd, temp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+    with os.fdopen(fd, 'wb') as f:
+        pickle.dump(points, f, pickle.HIGHEST_PROTOCOL)
+    os.rename(temp_path, _cache_path(cache_dir, key))
+
+
+def _collect(points, results, n_folds):
+    new_points = {}
+    for point, f, train_score, test_score in results:
+        if point not in new_points:
+            new_points[point] = (np.empty(n_folds), np.empty(n_folds))
+        new_points[point][0][f] = train_score
+        new_points[point][1][f] = test_score
+    points.update(new_points)
+
+
+def _stack(points, keys):
+    train_scores = np.array([points[key][0] for key in keys])
+    test_scores = np.array([points[key][1] for key in keys])
+    return train_scores, test_scores
+
+
+#学习曲线的任务为(训练集大小, 折序号)，复杂度曲线的任务为(参数值, 折序号)
+def _fit_and_score(data, task):
+    point, f = task
+    train, test = data['folds'][f]
+    X = data['X']
+    y = data['y']
+    if data['param_name'] is None:
+        train = train[:point]
+        model = clone(data['estimator'])
+    else:
+        model = clone(data['estimator'], **{data['param_name']: point})
+    model.fit(X[train], y[train])
+    scoring = data['scoring']
+    return (point, f, scoring(y[train], model.predict(X[train])),
+            scoring(y[test], model.predict(X[test])))
+
+
+#任务为(全部深度, 折序号)：训练最深的一棵树，返回每个深度的结果
+def _fit_deepest_and_score(data, task):
+    depths, f = task
+    train, test = data['folds'][f]
+    X = data['X']
+    y = data['y']
+    deepest = None if None in depths else max(depths)
+    model = clone(data['estimator'], **{DEPTH_PARAM: deepest})
+    model.fit(X[train], y[train])
+    scoring = data['scoring']
+    train_predictions = predict_depths(model, X[train], depths)
+    test_predictions = predict_depths(model, X[test], depths)
+    return [(depth, f, scoring(y[train], train_prediction), scoring(y[test], test_prediction))
+            for depth, train_prediction, test_prediction in zip(depths, train_predictions, test_predictions)]
@@ -0,0 +1,291 @@
+# -- coding: utf-8 --
+#K折交叉验证和网格搜索，不依赖sklearn.model_selection。
+#
+#KFold.split、ShuffleSplit.split只产生下标数组，不复制DataFrame；每一折的数据在用到时才按下标取出。
+#并行时（n_jobs > 1）X、y只复制一次到共享内存（multiprocessing.RawArray），
+#各子进程在启动时取得它，任务本身只传(候选参数组序号, 折序号)两个整数，不会每个任务都pickle一次数据。
+#
+#估计器需要有fit(X, y)、predict(X)、get_params()，以及接收同名参数的构造函数
+#（如sklearn的DecisionTreeRegressor）。
+#估计器还有predict_depths(X, depths)时（如tree.HistogramTreeRegressor），只有max_depth不同的候选参数
+#每一折只训练最深的一个模型，较浅的深度用它截断后的预测评分。
+#
+#用法：
+#   cv = KFold(n_splits=10, shuffle=True, random_state=1)
+#   scores = cross_val_score(regressor, X, y, scoring=performance_metric2, cv=cv)
+#   grid = GridSearch(regressor, {'max_depth': range(1, 11)}, cv=cv, n_jobs=4).fit(X, y)
+#   grid.best_estimator_
+import multiprocessing
+from itertools import product
+
+import numpy as np
+
+from scoring import performance_metric2
+
+#可以用一棵深树截断得到的参数
+DEPTH_PARAM = 'max_depth'
+
+INVALID_SPLITS_MSG = 'n_splits must be at least 2 and at most the number of samples, got {}'
+INVALID_TEST_SIZE_MSG = 'test_size must leave at least one sample in each set, got {}'
+
+
+class KFold(object):
+
+    #参数与sklearn.model_selection.KFold相同，同样的参数得到同样的划分
+    #   [in]n_splits 折数
+    #   [in]shuffle 划分前是否打乱顺序
+    #   [in]random_state 打乱顺序的随机种子
+    def __init__(self, n_splits=3, shuffle=False, random_state=None):
+        self.n_splits = n_splits
+        self.shuffle = shuffle
+        self.random_state = random_state
+
+    #功能：划分数据
+    #返回值：
+    #   生成器，每一折产生(训练集下标, 验证集下标)两个整数数组
+    def split(self, X, y=None):
+        n = len(X)
+        if not 2 <= self.n_splits <= n:
+            raise ValueError(INVALID_SPLITS_MSG.format(self.n_splits))
+        indices = np.arange(n)
+        if self.shuffle:
+            np.random.RandomState(self.random_state).shuffle(indices)
+
+        #前 n % n_splits 折各多一个样本
+        fold_sizes = np.full(self.n_splits, n // self.n_splits, dtype=np.int64)
+        fold_sizes[:n % self.n_splits] += 1
+        start = 0
+        for size in fold_sizes:
+            stop = start + size
+            #与sklearn一样，两组下标都按从小到大的顺序
+            is_test = np.zeros(n, dtype=bool)
+            is_test[indices[start:stop]] = True
+            yield np.flatnonzero(~is_test), np.flatnonzero(is_test)
+            start = stop
+
+    def get_n_splits(self, X=None, y=None):
+        return self.n_splits
+
+
+class ShuffleSplit(object):
+
+    #参数与sklearn.model_selection.ShuffleSplit相同，同样的参数得到同样的划分
+    #   [in]n_splits 划分次数
+    #   [in]test_size 验证集所占的比例
+    #   [in]random_state 随机种子
+    def __init__(self, n_splits=10, test_size=0.1, random_state=None):
+        self.n_splits = n_splits
+        self.test_size = test_size
+        self.random_state = random_state
+
+    #功能：划分数据
+    #返回值：
+    #   生成器，每次产生(训练集下标, 验证集下标)两个整数数组，下标是打乱的顺序
+    def split(self, X, y=None):
+        n = len(X)
+        n_test = int(np.ceil(self.test_size * n))
+        if not 0 < n_test < n:
+            raise ValueError(INVALID_TEST_SIZE_MSG.format(self.test_size))
+        rng = np.random.RandomState(self.random_state)
+        for _ in range(self.n_splits):
+            permutation = rng.permutation(n)
+            yield permutation[n_test:], permutation[:n_test]
+
+    def get_n_splits(self, X=None, y=None):
+        return self.n_splits
+
+
+#功能：复制一个未训练的估计器（相同的参数）
+def clone(estimator, **params):
+    all_params = estimator.get_params()
+    all_params.update(params)
+    return estimator.__class__(**all_params)
+
+
+#功能：返回每一折的模型分数
+#参数：
+#   [in]estimator 估计器，不会被修改
+#   [in]X, y 数据，NumPy数组、pandas对象或列表
+#   [in]scoring 评分函数 scoring(y_true, y_predict)
+#   [in]cv 折数、KFold或ShuffleSplit对象，或(训练集下标, 验证集下标)的列表
+#   [in]n_jobs 进程数，None表示CPU核数
+#返回值：
+#   长度为折数的NumPy数组
+def cross_val_score(estimator, X, y, scoring=performance_metric2, cv=3, n_jobs=1):
+    scores = evaluate_candidates(estimator, [{}], X, y, scoring, cv, n_jobs)
+    return scores[0]
+
+
+#功能：网格搜索，用交叉验证的平均分数选出最优参数，属性名与sklearn的GridSearchCV相同
+class GridSearch(object):
+
+    #参数：
+    #   [in]estimator 估计器
+    #   [in]param_grid {参数名: 候选值列表}，取所有组合
+    #   [in]scoring, cv, n_jobs 同cross_val_score
+    #   [in]refit True 用最优参数在全部数据上重新训练，结果为best_estimator_
+    def __init__(self, estimator, param_grid, scoring=performance_metric2, cv=3, n_jobs=1, refit=True):
+        self.estimator = estimator
+        self.param_grid = param_grid
+        self.scoring = scoring
+        self.cv = cv
+        self.n_jobs = n_jobs
+        self.refit = refit
+
+    def fit(self, X, y):
+        names = sorted(self.param_grid)
+        candidates = [dict(zip(names, values)) for values in product(*[self.param_grid[name] for name in names])]
+        scores = evaluate_candidates(self.estimator, candidates, X, y, self.scoring, self.cv, self.n_jobs)
+
+        mean_scores = scores.mean(axis=1)
+        #分数相同时取靠前的候选参数
+        best = int(np.argmax(mean_scores))
+        self.cv_results_ = {'params': candidates,
+                            'split_test_scores': scores,
+                            'mean_test_score': mean_scores,
+                            'std_test_score': scores.std(axis=1)}
+        self.best_index_ = best
+        self.best_params_ = candidates[best]
+        self.best_score_ = float(mean_scores[best])
+        if self.refit:
+            X, y = as_arrays(X, y)
+            self.best_estimator_ = clone(self.estimator, **self.best_params_).fit(X, y)
+        return self
+
+
+#功能：把X、y转换为连续的float64数组
+def as_arrays(X, y):
+    X = np.ascontiguousarray(X, dtype=np.float64)
+    y = np.ascontiguousarray(y, dtype=np.float64).ravel()
+    if X.ndim == 1:
+        X = X.reshape(-1, 1)
+    return X, y
+
+
+#功能：对每组候选参数和每一折训练并评分
+#返回值：
+#   候选参数数×折数的分数矩阵
+def evaluate_candidates(estimator, candidates, X, y, scoring, cv, n_jobs):
+    X, y = as_arrays(X, y)
+    folds = split_folds(cv, X, y)
+    groups = depth_groups(estimator, candidates)
+    tasks = [(g, f) for g in range(len(groups)) for f in range(len(folds))]
+    results = run_tasks(_evaluate, tasks, X, y, n_jobs,
+                        folds=folds, estimator=estimator, candidates=candidates, groups=groups, scoring=scoring)
+    scores = np.empty((len(candidates), len(folds)))
+    for group_results in results:
+        for c, f, score in group_results:
+            scores[c, f] = score
+    return scores
+
+
+#功能：把只有max_depth不同的候选参数分为一组
+#估计器有predict_depths方法（如tree.HistogramTreeRegressor）时，每组每一折只训练最深的一个模型；
+#否则每个候选参数单独一组
+#返回值：
+#   候选参数序号列表的列表
+def depth_groups(estimator, candidates):
+    if not hasattr(estimator, 'predict_depths'):
+        return [[c] for c in range(len(candidates))]
+    groups = []
+    keys = []
+    for c, params in enumerate(candidates):
+        others = dict(params)
+        others.pop(DEPTH_PARAM, None)
+        key = sorted(others.items())
+        if key in keys:
+            groups[keys.index(key)].append(c)
+        else:
+            keys.append(key)
+            groups.append([c])
+    return groups
+
+
+#功能：得到各折的下标
+#参数：
+#   [in]cv 折数、有split方法的对象（KFold、ShuffleSplit），或(训练集下标, 验证集下标)的列表
+def split_folds(cv, X, y):
+    if isinstance(cv, (list, tuple)):
+        return list(cv)
+    if not hasattr(cv, 'split'):
+        cv = KFold(n_splits=cv)
+    return list(cv.split(X, y))
+
+
+#功能：串行或多进程执行一组任务
+#参数：
+#   [in]function 模块级函数 function(data, task)，data为包含X、y和context各项的dict
+#   [in]tasks 任务列表，每个任务应当很小（如几个整数），多进程时会逐个pickle
+#   [in]X, y as_arrays转换后的数据，多进程时放在共享内存中，只复制一次
+#   [in]n_jobs 进程数，None表示CPU核数
+#   [in]context 其他只读数据（各折下标、估计器等），每个子进程启动时传入一次
+#返回值：
+#   与tasks顺序相同的结果列表
+def run_tasks(function, tasks, X, y, n_jobs, **context):
+    if n_jobs is None:
+        n_jobs = multiprocessing.cpu_count()
+    n_jobs = min(n_jobs, len(tasks))
+
+    if n_jobs <= 1:
+        _init_worker(X, y, context)
+        try:
+            return [function(_worker, task) for task in tasks]
+        finally:
+            _worker.clear()
+
+    #共享内存只复制一次数据；子进程中用np.frombuffer直接读取，不再复制
+    X_shared = multiprocessing.RawArray('d', X.size)
+    y_shared = multiprocessing.RawArray('d', y.size)
+    np.frombuffer(X_shared)[:] = X.ravel()
+    np.frombuffer(y_shared)[:] = y
+    pool = multiprocessing.Pool(n_jobs, initializer=_init_shared_worker,
+                                initargs=(X_shared, X.shape, y_shared, context))
+    try:
+        return pool.map(_call, [(function, task) for task in tasks])
+    finally:
+        pool.close()
+        pool.join()
+
+
+#子进程（或串行计算时本进程）中的数据：X、y，以及run_tasks的context
+_worker = {}
+
+
+def _init_worker(X, y, context):
+    _worker.update(context)
+    _worker.update(X=X, y=y)
+
+
+def _init_shared_worker(X_shared, X_shape, y_shared, context):
+    X = np.frombuffer(X_shared).reshape(X_shape)
+    y = np.frombuffer(y_shared)
+    _init_worker(X, y, context)
+
+
+def _call(item):
+    function, task = item
+    return function(_worker, task)
+
+
+#任务为(组序号, 折序号)，返回组内每个候选参数的(候选参数序号, 折序号, 分数)
+def _evaluate(data, task):
+    g, f = task
+    group = data['groups'][g]
+    candidates = data['candidates']
+    train, test = data['folds'][f]
+    X = data['X']
+    y = data['y']
+    scoring = data['scoring']
+    if len(group) == 1:
+        model = clone(data['estimator'], **candidates[group[0]])
+        model.fit(X[train], y[train])
+        return [(group[0], f, scoring(y[test], model.predict(X[test])))]
+
+    estimator = data['estimator']
+    depths = [candidates[c].get(DEPTH_PARAM, estimator.max_depth) for c in group]
+    params = dict(candidates[group[0]])
+    params[DEPTH_PARAM] = None if None in depths else max(depths)
+    model = clone(estimator, **params)
+    model.fit(X[train], y[train])
+    predictions = model.predict_depths(X[test], depths)
+    return [(c, f, scoring(y[test], prediction)) for c, prediction in zip(group, predictions)]
@@ -0,0 +1,68 @@
+# -- coding: utf-8 --
+#决定系数R²的计算，O(n)，不依赖sklearn。
+#
+#同一个y_true常常要和很多组预测值比较（交叉验证、网格搜索的每个候选模型），
+#R2Scorer预先计算y_true的均值和总离差平方和，之后每组预测只需要一次残差平方和；
+#score_many把多组预测放在一个矩阵中一次算完。
+#
+#用法：
+#   performance_metric2(y_true, y_predict)          #与notebook中的同名函数相同
+#   scorer = R2Scorer(y_true)
+#   scorer.score(y_predict)
+#   scorer.score_many([y_predict1, y_predict2, ...])  #返回每组预测的R²
+import numpy as np
+
+LENGTH_MISMATCH_MSG = 'y_true and y_predict must have the same length'
+EMPTY_INPUT_MSG = 'No samples to score'
+
+
+class R2Scorer(object):
+
+    #参数：
+    #   [in]y_true 真实值，列表、NumPy数组或pandas.Series
+    def __init__(self, y_true):
+        self.y_true = np.asarray(y_true, dtype=np.float64).ravel()
+        if len(self.y_true) == 0:
+            raise ValueError(EMPTY_INPUT_MSG)
+        self.mean = self.y_true.mean()
+        centered = self.y_true - self.mean
+        #总离差平方和 Σ(y - mean)²
+        self.sst = centered.dot(centered)
+
+    #功能：一组预测值的R²
+    def score(self, y_predict):
+        return float(self.score_many([y_predict])[0])
+
+    #功能：多组预测值的R²
+    #参数：
+    #   [in]predictions m组预测值：m×n的矩阵，或长度都为n的序列组成的列表
+    #返回值：
+    #   长度为m的NumPy数组
+    def score_many(self, predictions):
+        P = np.asarray(predictions, dtype=np.float64)
+        if P.ndim == 1:
+            P = P.reshape(1, -1)
+        if P.shape[1] != len(self.y_true):
+            raise ValueError(LENGTH_MISMATCH_MSG)
+        residuals = P - self.y_true
+        #每一行的残差平方和
+        sse = np.einsum('ij,ij->i', residuals, residuals)
+        return r2_from_sums(sse, self.sst)
+
+
+#功能：由残差平方和与总离差平方和计算R²
+#y_true全部相同时R²没有定义，与sklearn的r2_score一样：完全预测正确为1，否则为0
+def r2_from_sums(sse, sst):
+    sse = np.asarray(sse, dtype=np.float64)
+    if sst == 0:
+        return np.where(sse == 0, 1.0, 0.0)
+    return 1 - sse / sst
+
+
+def r2_score(y_true, y_predict):
+    return R2Scorer(y_true).score(y_predict)
+
+
+def performance_metric2(y_true, y_predict):
+    """计算并返回预测值相比于预测值的分数"""
+    return r2_score(y_true, y_predict)
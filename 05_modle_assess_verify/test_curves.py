@@ -0,0 +1,104 @@
+# -- coding: utf-8 --
+#curves的检查：学习曲线与逐点训练的结果相同、已算过的点从缓存读取；
+#截断最深的树得到的复杂度曲线与每个深度分别训练的结果相同，不能截断的估计器不走截断
+#用法：python -m pytest test_curves.py 或 python test_curves.py
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from curves import learning_curve, supports_depth_prefix, validation_curve
+from model_selection import KFold
+from scoring import performance_metric2
+from tree import HistogramTreeRegressor
+
+try:
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.tree import DecisionTreeClassifier, DecisionTreeRegressor
+except ImportError:
+    DecisionTreeRegressor = None
+
+DEPTHS = range(1, 8)
+
+
+def make_data(n=300, n_features=4, random_state=0):
+    rng = np.random.RandomState(random_state)
+    X = rng.uniform(size=(n, n_features))
+    y = np.sin(6 * X[:, 0]) + X[:, 1] * X[:, 2] + 0.1 * rng.normal(size=n)
+    return X, y
+
+
+#一元线性回归，用于不依赖sklearn的检查；定义在模块中，子进程可以pickle
+class LinearRegressor(object):
+
+    def get_params(self):
+        return {}
+
+    def fit(self, X, y):
+        self.coef_ = np.polyfit(X[:, 0], y, 1)
+        return self
+
+    def predict(self, X):
+        return np.polyval(self.coef_, X[:, 0])
+
+
+class LearningCurveTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def test_matches_refit_and_cache(self):
+        X, y = make_data(n=120)
+        cv = KFold(n_splits=3, shuffle=True, random_state=0)
+        sizes, train_scores, test_scores = learning_curve(LinearRegressor(), X, y, [10, 40, 80], cv,
+                                                          cache_dir=self.cache_dir)
+        self.assertEqual(sizes.tolist(), [10, 40, 80])
+        for i, size in enumerate(sizes):
+            for f, (train, test) in enumerate(cv.split(X)):
+                train = train[:size]
+                model = LinearRegressor().fit(X[train], y[train])
+                self.assertAlmostEqual(train_scores[i, f], performance_metric2(y[train], model.predict(X[train])), places=12)
+                self.assertAlmostEqual(test_scores[i, f], performance_metric2(y[test], model.predict(X[test])), places=12)
+        #已经算过的点从缓存读取，并行计算新增的点
+        _, cached_train, cached_test = learning_curve(LinearRegressor(), X, y, [80, 60, 10], cv, n_jobs=2,
+                                                      cache_dir=self.cache_dir)
+        np.testing.assert_array_equal(cached_test[[0, 2]], test_scores[[2, 0]])
+        np.testing.assert_array_equal(cached_train[[0, 2]], train_scores[[2, 0]])
+
+
+class ValidationCurveTestCase(unittest.TestCase):
+
+    def assert_reuse_matches_refit(self, estimator):
+        X, y = make_data()
+        cv = KFold(n_splits=3, shuffle=True, random_state=0)
+        reused = validation_curve(estimator, X, y, 'max_depth', DEPTHS, cv, cache_dir=None)
+        refit = validation_curve(estimator, X, y, 'max_depth', DEPTHS, cv, cache_dir=None, reuse_models=False)
+        for reused_scores, refit_scores in zip(reused, refit):
+            np.testing.assert_allclose(reused_scores, refit_scores, atol=1e-12)
+
+    def test_histogram_tree(self):
+        self.assert_reuse_matches_refit(HistogramTreeRegressor())
+
+    @unittest.skipIf(DecisionTreeRegressor is None, 'sklearn is not installed')
+    def test_sklearn_tree(self):
+        #样本很少的节点上不同特征可能分出同样的两组（增益完全相等），用min_samples_leaf避免这种情况
+        self.assert_reuse_matches_refit(DecisionTreeRegressor(min_samples_leaf=10, random_state=0))
+
+    @unittest.skipIf(DecisionTreeRegressor is None, 'sklearn is not installed')
+    def test_unsupported_sklearn_trees(self):
+        self.assertTrue(supports_depth_prefix(DecisionTreeRegressor()))
+        self.assertFalse(supports_depth_prefix(DecisionTreeClassifier()))
+        self.assertFalse(supports_depth_prefix(RandomForestRegressor(max_depth=3)))
+        for estimator in (DecisionTreeRegressor(max_leaf_nodes=8, random_state=0),
+                          DecisionTreeRegressor(splitter='random', random_state=0),
+                          DecisionTreeRegressor(max_features=2, random_state=0)):
+            self.assertFalse(supports_depth_prefix(estimator))
+            self.assert_reuse_matches_refit(estimator)
+
+
+if __name__ == '__main__':
+    unittest.main()
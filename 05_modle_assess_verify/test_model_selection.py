@@ -0,0 +1,142 @@
+# -- coding: utf-8 --
+#model_selection的检查：划分、交叉验证和网格搜索的结果与sklearn.model_selection相同，并行与串行的结果相同
+#用法：python -m pytest test_model_selection.py 或 python test_model_selection.py
+import unittest
+import warnings
+
+import numpy as np
+
+from model_selection import GridSearch, KFold, ShuffleSplit, cross_val_score, depth_groups
+from scoring import performance_metric2
+from tree import HistogramTreeRegressor
+
+try:
+    from sklearn import model_selection as sklearn_model_selection
+    from sklearn.tree import DecisionTreeRegressor
+except ImportError:
+    DecisionTreeRegressor = None
+
+PARAMS = {'max_depth': [1, 2, 4, 6], 'min_samples_leaf': [1, 5]}
+
+
+def make_data(n=203, random_state=0):
+    rng = np.random.RandomState(random_state)
+    X = rng.uniform(size=(n, 3))
+    y = np.sin(6 * X[:, 0]) + X[:, 1] + 0.1 * rng.normal(size=n)
+    return X, y
+
+
+def as_lists(splits):
+    return [(train.tolist(), test.tolist()) for train, test in splits]
+
+
+#只有一个特征的多项式回归，用于不依赖sklearn的检查；定义在模块中，子进程可以pickle
+class PolynomialRegressor(object):
+
+    def __init__(self, degree=1):
+        self.degree = degree
+
+    def get_params(self):
+        return {'degree': self.degree}
+
+    def fit(self, X, y):
+        self.coef_ = np.polyfit(X[:, 0], y, self.degree)
+        return self
+
+    def predict(self, X):
+        return np.polyval(self.coef_, X[:, 0])
+
+
+class ModelSelectionTestCase(unittest.TestCase):
+
+    def test_kfold_partitions(self):
+        X, _ = make_data()
+        for shuffle in (False, True):
+            folds = list(KFold(n_splits=5, shuffle=shuffle, random_state=3).split(X))
+            tests = np.concatenate([test for _, test in folds])
+            self.assertEqual(sorted(tests.tolist()), list(range(len(X))))
+            self.assertEqual([len(test) for _, test in folds], [41, 41, 41, 40, 40])
+            for train, test in folds:
+                self.assertEqual(len(np.intersect1d(train, test)), 0)
+        self.assertRaises(ValueError, list, KFold(n_splits=1).split(X))
+        self.assertRaises(ValueError, list, ShuffleSplit(test_size=0.0).split(X))
+
+    @unittest.skipIf(DecisionTreeRegressor is None, 'sklearn is not installed')
+    def test_splits_match_sklearn(self):
+        X, _ = make_data()
+        for shuffle in (False, True):
+            expected = sklearn_model_selection.KFold(n_splits=5, shuffle=shuffle, random_state=3 if shuffle else None)
+            self.assertEqual(as_lists(KFold(n_splits=5, shuffle=shuffle, random_state=3).split(X)),
+                             as_lists(expected.split(X)))
+        expected = sklearn_model_selection.ShuffleSplit(n_splits=4, test_size=0.2, random_state=5)
+        self.assertEqual(as_lists(ShuffleSplit(n_splits=4, test_size=0.2, random_state=5).split(X)),
+                         as_lists(expected.split(X)))
+
+    @unittest.skipIf(DecisionTreeRegressor is None, 'sklearn is not installed')
+    def test_cross_val_score_matches_sklearn(self):
+        X, y = make_data()
+        estimator = DecisionTreeRegressor(max_depth=3, random_state=0)
+        cv = KFold(n_splits=5, shuffle=True, random_state=1)
+        expected = sklearn_model_selection.cross_val_score(estimator, X, y, scoring='r2', cv=list(cv.split(X)))
+        np.testing.assert_allclose(cross_val_score(estimator, X, y, cv=cv), expected, rtol=1e-12)
+        #并行与串行的结果相同
+        np.testing.assert_allclose(cross_val_score(estimator, X.tolist(), y.tolist(), cv=cv, n_jobs=2), expected,
+                                   rtol=1e-12)
+
+    @unittest.skipIf(DecisionTreeRegressor is None, 'sklearn is not installed')
+    def test_grid_search_matches_sklearn(self):
+        #各折大小相同：sklearn 0.20默认的iid=True按折的大小加权平均，与GridSearch的简单平均相同；
+        #新版本的sklearn没有iid参数，总是简单平均
+        X, y = make_data(n=200)
+        cv = KFold(n_splits=4, shuffle=True, random_state=2)
+        folds = list(cv.split(X))
+        estimator = DecisionTreeRegressor(random_state=0)
+        with warnings.catch_warnings():
+            #sklearn 0.20的GridSearchCV关于iid参数的DeprecationWarning
+            warnings.simplefilter('ignore', DeprecationWarning)
+            expected = sklearn_model_selection.GridSearchCV(estimator, PARAMS, scoring='r2', cv=folds).fit(X, y)
+        grid = GridSearch(estimator, PARAMS, cv=cv).fit(X, y)
+        self.assertEqual(grid.best_params_, expected.best_params_)
+        self.assertAlmostEqual(grid.best_score_, expected.best_score_, places=12)
+        params = [dict(p) for p in expected.cv_results_['params']]
+        order = [params.index(p) for p in grid.cv_results_['params']]
+        np.testing.assert_allclose(grid.cv_results_['mean_test_score'], expected.cv_results_['mean_test_score'][order],
+                                   rtol=1e-12)
+        np.testing.assert_allclose(grid.best_estimator_.predict(X), expected.best_estimator_.predict(X))
+
+    def test_grid_search_scores(self):
+        #每个候选参数每一折的分数与分别训练相同，并行与串行的结果相同
+        X, y = make_data()
+        cv = KFold(n_splits=4, shuffle=True, random_state=2)
+        folds = list(cv.split(X))
+        param_grid = {'degree': [1, 3, 5]}
+        grid = GridSearch(PolynomialRegressor(), param_grid, cv=cv).fit(X, y)
+        for params, scores in zip(grid.cv_results_['params'], grid.cv_results_['split_test_scores']):
+            expected = []
+            for train, test in folds:
+                model = PolynomialRegressor(**params).fit(X[train], y[train])
+                expected.append(performance_metric2(y[test], model.predict(X[test])))
+            np.testing.assert_allclose(scores, expected, rtol=1e-12)
+        self.assertEqual(grid.best_params_, grid.cv_results_['params'][int(np.argmax(grid.cv_results_['mean_test_score']))])
+        parallel = GridSearch(PolynomialRegressor(), param_grid, cv=cv, n_jobs=2).fit(X.tolist(), y.tolist())
+        np.testing.assert_allclose(parallel.cv_results_['split_test_scores'], grid.cv_results_['split_test_scores'],
+                                   rtol=1e-12)
+
+    def test_depth_groups_match_refit(self):
+        #HistogramTreeRegressor每组每一折只训练一次，分数与每个候选参数分别训练相同
+        X, y = make_data()
+        estimator = HistogramTreeRegressor()
+        grid = GridSearch(estimator, PARAMS, cv=KFold(n_splits=4, shuffle=True, random_state=2), n_jobs=2).fit(X, y)
+        candidates = grid.cv_results_['params']
+        self.assertEqual(len(depth_groups(estimator, candidates)), 2)
+        folds = list(KFold(n_splits=4, shuffle=True, random_state=2).split(X))
+        for params, scores in zip(candidates, grid.cv_results_['split_test_scores']):
+            expected = []
+            for train, test in folds:
+                model = HistogramTreeRegressor(**params).fit(X[train], y[train])
+                expected.append(performance_metric2(y[test], model.predict(X[test])))
+            np.testing.assert_allclose(scores, expected, rtol=1e-12)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+# -- coding: utf-8 --
+#scoring的检查：与sklearn.metrics.r2_score（没有sklearn时与NumPy）的结果比较
+#用法：python -m pytest test_scoring.py 或 python test_scoring.py
+import unittest
+
+import numpy as np
+
+from scoring import R2Scorer, performance_metric2, r2_score
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+try:
+    from sklearn.metrics import r2_score as sklearn_r2_score
+except ImportError:
+    sklearn_r2_score = None
+
+
+#功能：参考值，有sklearn时用sklearn.metrics.r2_score
+def reference(y_true, y_predict):
+    if sklearn_r2_score is not None:
+        return sklearn_r2_score(y_true, y_predict)
+    y_true = np.asarray(y_true, dtype=np.float64)
+    return 1 - np.sum((y_true - y_predict) ** 2) / np.sum((y_true - y_true.mean()) ** 2)
+
+
+def make_data(n=500, random_state=0):
+    rng = np.random.RandomState(random_state)
+    y_true = rng.normal(size=n)
+    predictions = [y_true + scale * rng.normal(size=n) for scale in (0.1, 0.5, 2.0)]
+    return y_true, predictions
+
+
+class ScoringTestCase(unittest.TestCase):
+
+    def test_matches_reference(self):
+        y_true, predictions = make_data()
+        scorer = R2Scorer(y_true.tolist())
+        expected = [reference(y_true, p) for p in predictions]
+        np.testing.assert_allclose(scorer.score_many(predictions), expected, rtol=1e-12)
+        np.testing.assert_allclose(scorer.score_many(np.array(predictions)), expected, rtol=1e-12)
+        for p, value in zip(predictions, expected):
+            self.assertAlmostEqual(scorer.score(p), value, places=12)
+            self.assertAlmostEqual(r2_score(y_true, p.tolist()), value, places=12)
+            self.assertAlmostEqual(performance_metric2(y_true, p), value, places=12)
+        #比均值还差时为负数
+        self.assertTrue(expected[-1] < 0)
+
+    @unittest.skipIf(pd is None, 'pandas is not installed')
+    def test_pandas_input(self):
+        y_true, predictions = make_data()
+        series = pd.Series(y_true, index=np.arange(len(y_true))[::-1])
+        self.assertAlmostEqual(r2_score(series, predictions[0]), reference(y_true, predictions[0]), places=12)
+
+    def test_constant_target(self):
+        #与sklearn的r2_score相同：完全预测正确为1，否则为0
+        self.assertEqual(r2_score([3.0, 3.0, 3.0], [3.0, 3.0, 3.0]), 1.0)
+        self.assertEqual(r2_score([3.0, 3.0, 3.0], [3.0, 2.0, 3.0]), 0.0)
+        if sklearn_r2_score is not None:
+            self.assertEqual(sklearn_r2_score([3.0, 3.0, 3.0], [3.0, 3.0, 3.0]), 1.0)
+            self.assertEqual(sklearn_r2_score([3.0, 3.0, 3.0], [3.0, 2.0, 3.0]), 0.0)
+
+    def test_errors(self):
+        self.assertRaises(ValueError, R2Scorer, [])
+        self.assertRaises(ValueError, r2_score, [1.0, 2.0], [1.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+# -- coding: utf-8 --
+#tree的检查：特征的不同取值不超过max_bins时与sklearn的DecisionTreeRegressor结果相同，predict_depths与分别训练的结果相同
+#用法：python -m pytest test_tree.py 或 python test_tree.py
+import unittest
+
+import numpy as np
+
+from tree import HistogramTreeRegressor, bin_thresholds
+
+try:
+    from sklearn.tree import DecisionTreeRegressor
+except ImportError:
+    DecisionTreeRegressor = None
+
+
+#功能：取值为整数的特征，不同取值个数分别为levels中的值
+def make_data(levels=(300, 40, 7), n=1000, random_state=0):
+    rng = np.random.RandomState(random_state)
+    X = np.column_stack([rng.randint(0, m, size=n) for m in levels]).astype(np.float64)
+    y = np.sin(X[:, 0] / 50.0) + X[:, 1] / 20.0 * X[:, 2] + 0.1 * rng.normal(size=n)
+    return X, y
+
+
+class HistogramTreeTestCase(unittest.TestCase):
+
+    @unittest.skipIf(DecisionTreeRegressor is None, 'sklearn is not installed')
+    def test_matches_sklearn(self):
+        X, y = make_data()
+        #训练集中没有的取值（小数）检查阈值是否在节点内取中点
+        X_new = make_data(random_state=1)[0] + 0.25
+        for params in ({'max_depth': 3}, {'max_depth': 6, 'min_samples_leaf': 5}, {'min_samples_split': 20}):
+            expected = DecisionTreeRegressor(random_state=0, **params).fit(X, y)
+            tree = HistogramTreeRegressor(**params).fit(X, y)
+            np.testing.assert_allclose(tree.predict(X), expected.predict(X), rtol=1e-10)
+            np.testing.assert_allclose(tree.predict(X_new), expected.predict(X_new), rtol=1e-10)
+
+    @unittest.skipIf(DecisionTreeRegressor is None, 'sklearn is not installed')
+    def test_few_bins_differs_from_sklearn(self):
+        #第一个特征有300个取值，max_bins=16时只在分位数处分裂
+        X, y = make_data()
+        expected = DecisionTreeRegressor(max_depth=6, random_state=0).fit(X, y).predict(X)
+        predicted = HistogramTreeRegressor(max_depth=6, max_bins=16).fit(X, y).predict(X)
+        self.assertFalse(np.allclose(predicted, expected))
+        self.assertEqual(len(bin_thresholds(X[:, 0], 16)), 15)
+        np.testing.assert_array_equal(bin_thresholds(X[:, 2], 16), np.arange(6) + 0.5)
+
+    def test_predict_depths_matches_refit(self):
+        X, y = make_data()
+        tree = HistogramTreeRegressor(min_samples_leaf=3).fit(X, y)
+        depths = [1, 2, 5, 8, None, 100]
+        for depth, predicted in zip(depths, tree.predict_depths(X, depths)):
+            refit = HistogramTreeRegressor(max_depth=depth, min_samples_leaf=3).fit(X, y)
+            np.testing.assert_array_equal(predicted, refit.predict(X))
+
+    def test_params(self):
+        X, y = make_data(n=50)
+        self.assertRaises(ValueError, HistogramTreeRegressor(max_depth=0).fit, X, y)
+        self.assertRaises(ValueError, HistogramTreeRegressor(max_bins=1).fit, X, y)
+        self.assertRaises(ValueError, HistogramTreeRegressor().set_params, depth=3)
+        self.assertRaises(Exception, HistogramTreeRegressor().predict, X)
+        self.assertRaises(ValueError, HistogramTreeRegressor().fit(X, y).predict, X[:, :2])
+        #y为常数时不分裂
+        self.assertEqual(len(HistogramTreeRegressor().fit(X, np.ones(50)).value_), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+# -- coding: utf-8 --
+#boston_housing.ipynb中使用的绘图函数：ModelLearning、ModelComplexity、PredictTrials。
+#
+#曲线由curves计算，结果缓存在磁盘上；只修改图的样式后重新运行时直接读取缓存，不再训练模型。
+import matplotlib.pyplot as pl
+import numpy as np
+from sklearn.tree import DecisionTreeRegressor
+
+from curves import CACHE_DIR, learning_curve, validation_curve
+from model_selection import ShuffleSplit
+
+#学习曲线中比较的最大深度
+LEARNING_DEPTHS = [1, 3, 6, 10]
+#复杂度曲线的最大深度范围
+COMPLEXITY_DEPTHS = np.arange(1, 11)
+
+
+#功能：不同最大深度的决策树在不同训练集大小下的学习曲线
+#参数：
+#   [in]X, y 训练数据
+#   [in]n_jobs 进程数，None表示CPU核数
+#   [in]cache_dir 缓存目录，None表示不使用缓存
+def ModelLearning(X, y, n_jobs=None, cache_dir=CACHE_DIR):
+    cv = ShuffleSplit(n_splits=10, test_size=0.2, random_state=0)
+    #训练集大小：1到训练集的全部样本，共9个点
+    train_sizes = np.rint(np.linspace(1, len(X) * 0.8 - 1, 9)).astype(int)
+
+    fig = pl.figure(figsize=(10, 7))
+    for k, depth in enumerate(LEARNING_DEPTHS):
+        regressor = DecisionTreeRegressor(max_depth=depth)
+        sizes, train_scores, test_scores = learning_curve(regressor, X, y, train_sizes, cv,
+                                                          n_jobs=n_jobs, cache_dir=cache_dir)
+        train_mean = np.mean(train_scores, axis=1)
+        train_std = np.std(train_scores, axis=1)
+        test_mean = np.mean(test_scores, axis=1)
+        test_std = np.std(test_scores, axis=1)
+
+        ax = fig.add_subplot(2, 2, k + 1)
+        ax.plot(sizes, train_mean, 'o-', color='r', label='Training Score')
+        ax.plot(sizes, test_mean, 'o-', color='g', label='Testing Score')
+        ax.fill_between(sizes, train_mean - train_std, train_mean + train_std, alpha=0.15, color='r')
+        ax.fill_between(sizes, test_mean - test_std, test_mean + test_std, alpha=0.15, color='g')
+        ax.set_title('max_depth = %s' % depth)
+        ax.set_xlabel('Number of Training Points')
+        ax.set_ylabel('Score')
+        ax.set_xlim([0, len(X) * 0.8])
+        ax.set_ylim([-0.05, 1.05])
+
+    ax.legend(bbox_to_anchor=(1.05, 2.05), loc='lower left', borderaxespad=0.)
+    fig.suptitle('Decision Tree Regressor Learning Performances', fontsize=16, y=1.03)
+    fig.tight_layout()
+    fig.show()
+
+
+#功能：决策树的训练集分数和验证集分数随最大深度的变化
+#参数同ModelLearning
+def ModelComplexity(X, y, n_jobs=None, cache_dir=CACHE_DIR):
+    cv = ShuffleSplit(n_splits=10, test_size=0.2, random_state=0)
+    train_scores, test_scores = validation_curve(DecisionTreeRegressor(), X, y, 'max_depth', COMPLEXITY_DEPTHS, cv,
+                                                 n_jobs=n_jobs, cache_dir=cache_dir)
+    train_mean = np.mean(train_scores, axis=1)
+    train_std = np.std(train_scores, axis=1)
+    test_mean = np.mean(test_scores, axis=1)
+    test_std = np.std(test_scores, axis=1)
+
+    pl.figure(figsize=(7, 5))
+    pl.title('Decision Tree Regressor Complexity Performance')
+    pl.plot(COMPLEXITY_DEPTHS, train_mean, 'o-', color='r', label='Training Score')
+    pl.plot(COMPLEXITY_DEPTHS, test_mean, 'o-', color='g', label='Validation Score')
+    pl.fill_between(COMPLEXITY_DEPTHS, train_mean - train_std, train_mean + train_std, alpha=0.15, color='r')
+    pl.fill_between(COMPLEXITY_DEPTHS, test_mean - test_std, test_mean + test_std, alpha=0.15, color='g')
+    pl.legend(loc='lower right')
+    pl.xlabel('Maximum Depth')
+    pl.ylabel('Score')
+    pl.ylim([-0.05, 1.05])
+    pl.show()
+
+
+#功能：用10种不同的训练集划分训练模型并预测同一个样本，观察预测的稳定性
+#参数：
+#   [in]X, y 全部数据
+#   [in]fitter 训练函数 fitter(X_train, y_train)，返回训练好的模型
+#   [in]data 待预测的样本列表，只预测第一个
+def PredictTrials(X, y, fitter, data):
+    X = np.asarray(X)
+    y = np.asarray(y)
+    prices = []
+    for k in range(10):
+        #与train_test_split(X, y, test_size=0.2, random_state=k)的划分相同
+        train, _ = next(ShuffleSplit(n_splits=1, test_size=0.2, random_state=k).split(X))
+        reg = fitter(X[train], y[train])
+        pred = reg.predict([data[0]])[0]
+        prices.append(pred)
+        print("Trial {}: ${:,.2f}".format(k + 1, pred))
+
+    print("\nRange in prices: ${:,.2f}".format(max(prices) - min(prices)))